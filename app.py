@@ -1,19 +1,14 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import time
 import logging
 from typing import List, Tuple, Optional
 
-from utils import resume_data, output_predict
-from utils.parser import extract_skills_from_text
-import nltk
+# pandas, matplotlib, nltk, spacy and sklearn are imported by the stage that
+# needs them, and preloaded by the warm-up thread started below
+from utils.pipeline import analyze_resume, STAGE_LABELS
+from utils.resources import MissingResourceError
+from utils.warmup import start_warmup
 import os
 
-# Set NLTK data path to a known directory
-nltk.download('punkt_tab')
-nltk.download('wordnet')
-
 
 
 
@@ -28,6 +23,16 @@ st.set_page_config(
     page_icon="📄"
 )
 
+# NLTK data is provisioned ahead of time (python -m utils.resources --download).
+# The warm-up checks it first; the page waits for that step only, so missing
+# data is reported on the first render while the other steps keep loading.
+warmup = start_warmup()
+warmup.wait_for('nltk')
+nltk_error = warmup.errors.get('nltk')
+if isinstance(nltk_error, MissingResourceError):
+    st.error(str(nltk_error))
+    st.stop()
+
 # Initialize session state
 if 'go_to_course' not in st.session_state:
     st.session_state['go_to_course'] = False
@@ -119,25 +124,13 @@ def display_file_info(resume) -> None:
         st.metric("🔧 Type", file_type.split('/')[-1].upper())
 
 def create_matplotlib_chart(labels: List[str], scores: List[float]) -> None:
-    """Create a matplotlib chart (fallback for compatibility)"""
-    fig, ax = plt.subplots(figsize=(8, 6))
-    
-    # Create horizontal bar chart
-    bars = ax.barh(labels[::-1], scores[::-1], color=['#2E86C1', '#5DADE2', '#85C1E9', '#AED6F1', '#D6EAF8'])
-    
-    # Customize chart
-    ax.set_xlabel("Confidence (%)")
-    ax.set_xlim(0, 100)
-    ax.set_title("Job Role Predictions", fontsize=16, fontweight='bold')
-    ax.grid(axis='x', alpha=0.3)
-    
-    # Add value labels on bars
-    for i, (bar, score) in enumerate(zip(bars, scores[::-1])):
-        ax.text(score + 1, bar.get_y() + bar.get_height()/2, 
-                f"{score}%", va='center', fontsize=10, fontweight='bold')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
+    """Show the prediction chart, rendered once per (labels, scores) and reused on reruns"""
+    from utils import config
+    from utils.charts import prediction_chart_plotly, prediction_chart_png
+    if config.CHART_BACKEND == 'plotly':
+        st.plotly_chart(prediction_chart_plotly(tuple(labels), tuple(scores)), use_container_width=True)
+    else:
+        st.image(prediction_chart_png(tuple(labels), tuple(scores)), use_container_width=True)
 
 def display_skills_with_badges(skills: List[str]) -> None:
     """Display skills as styled badges"""
@@ -170,6 +163,90 @@ def validate_predictions(predictions: List[Tuple]) -> bool:
     
     return True
 
+def display_bulk_results(job) -> None:
+    """Render the rows a bulk job has finished so far, plus a per-role comparison"""
+    import pandas as pd
+    rows = job.snapshot()
+    st.progress(job.completed / job.total if job.total else 1.0,
+                text=f"{job.completed}/{job.total} resumes analyzed in {job.elapsed:.1f}s")
+    if not rows:
+        return
+    
+    df_rows = pd.DataFrame([{
+        "Resume": row['name'],
+        "Top Role": row['role'] or ('Unreadable PDF' if row['status'] == 'invalid' else 'Error'),
+        "Confidence (%)": row['confidence'],
+        "Skills": row['skill_count'],
+        "Time (s)": round(row['seconds'], 2),
+    } for row in rows])
+    st.dataframe(df_rows.sort_values("Confidence (%)", ascending=False, na_position='last'),
+                 use_container_width=True, hide_index=True)
+    
+    analyzed = [row for row in rows if row['status'] == 'done']
+    failed = [row for row in rows if row['error']]
+    if failed:
+        with st.expander(f"⚠️ {len(failed)} resumes failed"):
+            for row in failed:
+                st.write(f"• {row['name']}: {row['error']}")
+    if not analyzed:
+        return
+    
+    st.markdown("#### ⚖️ Compare Candidates")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Top predicted role per resume")
+        st.bar_chart(pd.Series([row['role'] for row in analyzed]).value_counts())
+    with col2:
+        roles = sorted({role for row in analyzed for role, _ in row['predictions']})
+        role = st.selectbox("Rank candidates for role", roles, key='bulk_compare_role')
+        # predictions hold each resume's top 5 roles; absent means a lower score
+        ranked = sorted(((dict(row['predictions']).get(role, 0.0), row) for row in analyzed),
+                        key=lambda item: -item[0])
+        st.dataframe(pd.DataFrame([{
+            "Resume": row['name'],
+            f"{role} (%)": round(score * 100, 2),
+            "Skills": row['skill_count'],
+        } for score, row in ranked if score > 0]), use_container_width=True, hide_index=True)
+    
+    st.download_button("⬇️ Download results (CSV)", df_rows.to_csv(index=False),
+                       file_name="resume_screening.csv", mime="text/csv")
+
+def display_bulk_screening(files) -> None:
+    """Queue uploaded resumes on the background workers and show results as they arrive"""
+    from utils.bulk import BulkJob
+    from utils import config
+    
+    st.markdown("### 🗂️ Bulk Screening")
+    if len(files) > config.BULK_MAX_FILES:
+        st.warning(f"Only the first {config.BULK_MAX_FILES} of {len(files)} files will be analyzed.")
+        files = files[:config.BULK_MAX_FILES]
+    
+    job = st.session_state.get('bulk_job')
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button(f"🚀 Analyze {len(files)} resumes", disabled=not files, key="bulk_start_btn"):
+            if job is not None:
+                job.cancel()
+            # read the uploads here; workers only get bytes, never Streamlit objects
+            job = st.session_state['bulk_job'] = BulkJob((f.name, f.getvalue()) for f in files)
+    with col2:
+        if job is not None and not job.done and st.button("⏹️ Stop", key="bulk_stop_btn"):
+            job.cancel()
+    
+    if job is None:
+        return
+    
+    # the fragment reruns on its own while workers are busy; the rest of the page stays put
+    @st.fragment(run_every=None if job.done else 1.0)
+    def live_results():
+        display_bulk_results(job)
+        if job.done and st.session_state.get('bulk_polling'):
+            st.session_state['bulk_polling'] = False
+            st.rerun()
+    
+    st.session_state['bulk_polling'] = not job.done
+    live_results()
+
 # Header
 st.markdown('<h1 class="main-header">📄 Resume Gap Detector</h1>', 
             unsafe_allow_html=True)
@@ -178,18 +255,28 @@ st.markdown('<h1 class="main-header">📄 Resume Gap Detector</h1>',
 with st.sidebar:
     st.markdown('<div class="upload-section">', unsafe_allow_html=True)
     st.subheader("📁 Upload Resume")
-    st.caption("Upload your PDF resume for analysis")
+    mode = st.radio("Mode", ["Single resume", "Bulk screening"], horizontal=True,
+                    label_visibility="collapsed")
+    bulk_mode = mode == "Bulk screening"
+    st.caption("Upload many PDF resumes to screen them side by side" if bulk_mode
+               else "Upload your PDF resume for analysis")
     
-    resume = st.file_uploader(
-        label='Choose a PDF file',
-        accept_multiple_files=False,
+    uploaded = st.file_uploader(
+        label='Choose PDF files' if bulk_mode else 'Choose a PDF file',
+        accept_multiple_files=bulk_mode,
         type=['pdf'],
-        help="Only PDF files are supported"
+        help="Only PDF files are supported",
+        key='bulk_uploader' if bulk_mode else 'single_uploader'
     )
     st.markdown('</div>', unsafe_allow_html=True)
     
-    if resume is None:
-        st.info("📌 Waiting for a PDF resume to be uploaded.")
+    resume = None if bulk_mode else uploaded
+    if not uploaded:
+        st.info("📌 Waiting for PDF resumes to be uploaded." if bulk_mode
+                else "📌 Waiting for a PDF resume to be uploaded.")
+
+if bulk_mode:
+    display_bulk_screening(uploaded or [])
 
 # Main content area
 if resume is not None:
@@ -209,44 +296,36 @@ if resume is not None:
         
         # Only run processing if not already completed for this resume
         if not st.session_state.get('processing_complete', False):
-            # Extract text from resume
-            with st.spinner("Extracting text from resume..."):
-                extracted_text, is_valid = resume_data(resume)
-            
-            if not is_valid:
-                st.error("❌ Failed to extract text from the PDF. Please ensure the file is not corrupted.")
-                st.stop()
-            
-            # Show preview of extracted text
-            with st.expander("📝 Preview Extracted Text"):
-                st.text_area("Extracted Content", 
-                            extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text, 
-                            height=150, disabled=True)
-            
-            # Process resume with animated status
+            # Process resume; every status line is written when its stage finishes
             status_placeholder = st.empty()
             with status_placeholder.status("Processing resume...", expanded=True) as status:
-                st.write("• Extracting text from the uploaded document.")
-                time.sleep(1.2)
-
-                st.write("• Preprocessing the content for analysis.")
-                time.sleep(1.2)
-
-                st.write("• Running model inference to determine job role.")
-                predictions = output_predict([[extracted_text]])
-                time.sleep(1)
+                def report_stage(stage, seconds):
+                    st.write(f"• {STAGE_LABELS[stage]} ({seconds:.2f}s)")
 
-                st.write("• Finalizing results.")
-                time.sleep(1.5)
+                result = analyze_resume(resume, on_stage=report_stage)
 
                 status.update(
-                    label="Resume analysis completed successfully.",
-                    state="complete",
+                    label=f"Resume analysis completed in {result.total_seconds:.2f}s.",
+                    state="complete" if result.is_valid else "error",
                     expanded=False
                 )
             
             status_placeholder.empty()
             
+            if not result.is_valid:
+                st.error("❌ Failed to extract text from the PDF. Please ensure the file is not corrupted.")
+                st.stop()
+            
+            extracted_text = result.text
+            predictions = result.predictions
+            skills = result.skills
+            
+            # Show preview of extracted text
+            with st.expander("📝 Preview Extracted Text"):
+                st.text_area("Extracted Content", 
+                            extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text, 
+                            height=150, disabled=True)
+            
             # Validate predictions
             if not validate_predictions(predictions):
                 st.error("❌ Invalid prediction results. Please try again.")
@@ -255,11 +334,10 @@ if resume is not None:
             # Store results in session state
             st.session_state['extracted_text'] = extracted_text
             st.session_state['predictions'] = predictions
-            st.session_state['processing_complete'] = True
-            
-            # Extract and store skills
-            skills = extract_skills_from_text(resume)
             st.session_state['extracted_skills'] = skills
+            st.session_state['stage_timings'] = result.timings
+            st.session_state['analysis_seconds'] = result.total_seconds
+            st.session_state['processing_complete'] = True
             
         else:
             # Use stored results from session state
@@ -292,6 +370,7 @@ if resume is not None:
         
         with col1:
             st.markdown("#### 📋 Prediction Table")
+            import pandas as pd
             df_result = pd.DataFrame({
                 "Job Role": labels,
                 "Confidence (%)": scores
@@ -321,9 +400,6 @@ if resume is not None:
                 st.session_state["confidence_score"] = scores[0] if scores else 0
                 st.session_state["go_to_course"] = True
                 
-                with st.spinner("Preparing your personalized course plan..."):
-                    time.sleep(2)
-                
                 st.success("🎉 Processing Complete!")
                 st.balloons()
                 
@@ -355,13 +431,16 @@ if resume is not None:
         
         with col1:
             processing_status = "✅ Completed" if st.session_state.get('processing_complete', False) else "⏳ In Progress"
+            timings = st.session_state.get('stage_timings', {})
+            stage_lines = "\n".join(
+                f"            - ✅ {stage.capitalize()}: {seconds * 1000:.0f} ms"
+                for stage, seconds in timings.items()
+            )
             st.markdown(f"""
             **Analysis Details:**
             - **Status:** {processing_status}
-            - ✅ Text extraction completed
-            - ✅ Skill matching performed
-            - ✅ Job role prediction generated
-            - ✅ Confidence scores calculated
+{stage_lines}
+            - **Total:** {st.session_state.get('analysis_seconds', 0) * 1000:.0f} ms
             """)
         
         with col2:
@@ -395,4 +474,4 @@ st.markdown("""
     <div class="scroll-indicator" onclick="window.scrollTo(0, 0);" title="Scroll to top">
         ↑
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
@@ -0,0 +1,110 @@
+"""
+Recall@k against latency of the approximate course index (IVFRetriever)
+compared with exact search (CourseRetriever) as the catalog grows.
+
+    python benchmarks/bench_ann.py --sizes 3678 30000 --nprobe 4 16 64 128 --queries 200
+
+Queries are generated as in bench_course_retrieval.py. The default
+--catalog topical grows the catalog with variants of real titles (words
+swapped for others of the same subject), so it keeps the topic clusters a
+multi-provider catalog has; --catalog mixed uses bench_course_retrieval's
+random word mixes, which have no low-rank structure for the SVD or the
+k-means lists to exploit. A returned course counts as a hit when its exact
+score reaches the k-th exact score, so ties at the cut-off are not counted
+as misses. Exits with status 1 when a score returned by the ANN index is
+not the course's exact cosine.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.preprocessing import normalize  # noqa: E402
+
+from benchmarks.bench_course_retrieval import make_catalog, make_queries, timed  # noqa: E402
+from utils.retrieval import CourseRetriever, IVFRetriever  # noqa: E402
+
+
+def make_topical_catalog(frame, size, seed=0):
+    rng = random.Random(seed)
+    titles = [title.lower() for title in frame['course_title'].astype(str)]
+    words = {subject: ' '.join(group).lower().split()
+             for subject, group in frame.groupby('subject')['course_title']}
+    subjects = list(frame['subject'])
+    catalog = titles[:size]
+    while len(catalog) < size:
+        i = rng.randrange(len(titles))
+        pool = words[subjects[i]]
+        variant = [rng.choice(pool) if rng.random() < 0.3 else word for word in titles[i].split()]
+        catalog.append(' '.join(variant + [rng.choice(pool) for _ in range(rng.randint(0, 5))]))
+    return catalog
+
+
+def recall(expected, actual, k):
+    hits = 0
+    for (_, want), (_, got) in zip(expected, actual):
+        kth = want[min(k, len(want)) - 1]
+        hits += int(np.sum(got >= kth - 1e-12))
+    return hits / (k * len(expected))
+
+
+def score_errors(vectors, query_vectors, actual):
+    docs, queries = normalize(vectors), normalize(query_vectors)
+    errors = 0
+    for row, (indices, scores) in enumerate(actual):
+        exact = (docs[indices] @ queries[row].T).toarray().ravel()
+        errors += int(not np.allclose(exact, scores, rtol=0, atol=1e-12))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='udemy_courses.csv')
+    parser.add_argument('--catalog', choices=('topical', 'mixed'), default='topical')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3678, 30000])
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 16, 64, 128])
+    parser.add_argument('--refine', type=int, default=0, help="0 scores every probed course exactly")
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    frame = pd.read_csv(args.csv)
+    titles = list(frame['course_title'].astype(str))
+    queries = make_queries(args.queries)
+    errors = 0
+
+    for size in args.sizes:
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+        catalog = make_topical_catalog(frame, size) if args.catalog == 'topical' else make_catalog(titles, size)
+        vectors = vectorizer.fit_transform(catalog)
+        query_vectors = vectorizer.transform(queries)
+
+        exact = CourseRetriever(vectors)
+        exact_seconds, expected = timed(lambda: [exact.search(query_vectors[row], k=args.k)[0]
+                                                 for row in range(len(queries))])
+        build_seconds, ann = timed(lambda: IVFRetriever.build(exact, dim=args.dim, refine=args.refine))
+        ann_mb = sum(array.nbytes for array in ann.arrays().values()) / 1e6
+
+        print(f"\n{size} courses x {vectors.shape[1]} features: exact {1000 * exact_seconds / len(queries):.3f} ms/q; "
+              f"ANN {ann.dense.shape[1]} dims, {len(ann.centroids)} lists, {ann_mb:.1f} MB, built in {build_seconds:.1f}s")
+        print(f"{'nprobe':>7} {'recall@' + str(args.k):>9} {'ms/q':>8} {'speedup':>8}")
+        for nprobe in args.nprobe:
+            seconds, actual = timed(lambda: [ann.search(query_vectors[row], k=args.k, nprobe=nprobe)[0]
+                                             for row in range(len(queries))])
+            errors += score_errors(vectors, query_vectors, actual)
+            print(f"{nprobe:>7} {recall(expected, actual, args.k):>9.3f} {1000 * seconds / len(queries):>8.3f} "
+                  f"{exact_seconds / seconds:>7.1f}x")
+
+    print(f"\nscores: {errors} ANN results differ from the exact cosine")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Compares the course catalog as two pandas DataFrames (the course page and
+the recommender each read the CSV) with the shared memory-mapped Arrow
+catalog of utils.catalog.
+
+    python benchmarks/bench_catalog.py --csv processed_courses.csv --scale 10 --workers 4
+
+--scale repeats the CSV rows to simulate a bigger catalog. For each mode,
+--workers processes load the catalog and stay alive together; the private
+memory and PSS the catalog adds per worker are read from
+/proc/<pid>/smaps_rollup, next to the load time and the time to build the
+five course cards of one role.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_compact import smaps_kb  # noqa: E402
+
+
+def worker(mode, csv_path, catalog_path, manifest_path):
+    import pandas as pd
+    import pyarrow  # noqa: F401
+
+    before = smaps_kb()
+    start = time.perf_counter()
+    if mode == 'pandas':
+        page = pd.read_csv(csv_path)
+        recommender = pd.read_csv(csv_path).drop(columns=['Unnamed: 0.1', 'Unnamed: 0'])
+        n = len(recommender)
+
+        def cards(indices):
+            return [page.iloc[i].to_dict() for i in indices]
+    else:
+        from utils.catalog import load_catalog
+        catalog = load_catalog(csv_path, catalog_path, manifest_path, rebuild=False)
+        n = len(catalog)
+        cards = catalog.rows
+    load_seconds = time.perf_counter() - start
+
+    random.seed(0)
+    queries = [random.sample(range(n), 5) for _ in range(500)]
+    start = time.perf_counter()
+    for indices in queries:
+        cards(indices)
+    cards_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(json.dumps({'before': before, 'load_seconds': load_seconds, 'cards_ms': cards_ms}), flush=True)
+    sys.stdin.read()
+
+
+def run(mode, workers, csv_path, catalog_path, manifest_path):
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--worker', mode, '--csv', csv_path,
+                               '--catalog', catalog_path, '--manifest', manifest_path],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for _ in range(workers)]
+    reports = [json.loads(proc.stdout.readline()) for proc in procs]
+    after = [smaps_kb(proc.pid) for proc in procs]
+    for proc in procs:
+        proc.stdin.close()
+        proc.wait()
+
+    n = len(procs)
+    return {
+        'load_ms': sum(r['load_seconds'] for r in reports) / n * 1000,
+        'cards_ms': sum(r['cards_ms'] for r in reports) / n,
+        'private_mb': sum(a['private'] - r['before']['private'] for a, r in zip(after, reports)) / n / 1024,
+        'pss_mb': sum(a['pss'] - r['before']['pss'] for a, r in zip(after, reports)) / n / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='processed_courses.csv')
+    parser.add_argument('--scale', type=int, default=1, help="copies of the catalog rows")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--worker', choices=('pandas', 'arrow'), help=argparse.SUPPRESS)
+    parser.add_argument('--catalog', help=argparse.SUPPRESS)
+    parser.add_argument('--manifest', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.csv, args.catalog, args.manifest)
+        return
+
+    import pandas as pd
+    from utils.catalog import build_catalog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'courses.csv')
+        pd.concat([pd.read_csv(args.csv)] * args.scale).to_csv(csv_path, index=False)
+        catalog_path, manifest_path = os.path.join(tmp, 'catalog.arrow'), os.path.join(tmp, 'catalog.json')
+        catalog = build_catalog(csv_path, catalog_path, manifest_path)
+
+        print(f"{len(catalog)} courses, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"Arrow {os.path.getsize(catalog_path) / 1e6:.1f} MB, {args.workers} workers")
+        print(f"{'mode':<7} {'load ms':>9} {'5 cards ms':>11} {'private MB/worker':>18} {'PSS MB/worker':>14}")
+        for mode in ('pandas', 'arrow'):
+            result = run(mode, args.workers, csv_path, catalog_path, manifest_path)
+            print(f"{mode:<7} {result['load_ms']:>9.1f} {result['cards_ms']:>11.3f} "
+                  f"{result['private_mb']:>18.1f} {result['pss_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
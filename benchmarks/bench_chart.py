@@ -0,0 +1,79 @@
+"""
+Compares the prediction chart as app.py used to draw it (a new pyplot figure
+per rerun, never closed, saved to PNG by st.pyplot) with utils.charts.
+
+    python benchmarks/bench_chart.py --reruns 300 --sessions 20
+
+Each session has its own predictions and reruns the page the same number of
+times. Reports latency per rerun, resident memory growth and the number of
+figures left in pyplot's registry.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from utils.charts import COLORS, prediction_chart_png  # noqa: E402
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+
+
+def pyplot_chart(labels, scores):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    bars = ax.barh(labels[::-1], scores[::-1], color=COLORS)
+    ax.set_xlabel("Confidence (%)")
+    ax.set_xlim(0, 100)
+    ax.set_title("Job Role Predictions", fontsize=16, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    for bar, score in zip(bars, scores[::-1]):
+        ax.text(score + 1, bar.get_y() + bar.get_height() / 2,
+                f"{score}%", va='center', fontsize=10, fontweight='bold')
+    plt.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def cached_chart(labels, scores):
+    return prediction_chart_png(tuple(labels), tuple(scores))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reruns', type=int, default=300, help="reruns in total")
+    parser.add_argument('--sessions', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    roles = ['Data Science', 'HR', 'Advocate', 'Java Developer', 'Testing', 'DevOps Engineer', 'Web Designing']
+    sessions = []
+    for _ in range(args.sessions):
+        labels = random.sample(roles, 5)
+        scores = sorted((round(random.uniform(0, 100), 2) for _ in labels), reverse=True)
+        sessions.append((labels, scores))
+    calls = [sessions[i % len(sessions)] for i in range(args.reruns)]
+
+    for name, func in (('cached', cached_chart), ('pyplot', pyplot_chart)):
+        func(*calls[0])  # fonts and backends loaded
+        before = rss_mb()
+        start = time.perf_counter()
+        for labels, scores in calls:
+            func(labels, scores)
+        per_rerun = (time.perf_counter() - start) / len(calls)
+        print(f"{name:<7} {per_rerun * 1000:>8.2f} ms/rerun   RSS +{rss_mb() - before:>7.1f} MB   "
+              f"open pyplot figures {len(plt.get_fignums())}")
+
+
+if __name__ == '__main__':
+    main()
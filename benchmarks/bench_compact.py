@@ -0,0 +1,100 @@
+"""
+Compares the pickled classifier artifacts with the compact memory-mapped ones.
+
+    python -m utils.compact export
+    python benchmarks/bench_compact.py --csv UpdatedResumeDataSet.csv --workers 4
+
+For each format, --workers processes load the artifacts through the model
+registry (as Streamlit workers would) and stay alive together. Reports the
+load time, per-resume predict latency and, read from /proc/<pid>/smaps_rollup
+while every worker is loaded, the memory the artifacts add per worker:
+private memory (never shared) and PSS (shared pages split between the
+workers). Run from the directory holding Artifacts/.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def smaps_kb(pid='self'):
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {'pss': fields['Pss'], 'private': fields['Private_Clean'] + fields['Private_Dirty']}
+
+
+def worker(csv_path, rows):
+    # imported in both modes, so the numbers below are the artifacts alone
+    import sklearn.feature_extraction.text  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+    from utils import registry
+    from utils.train import load_corpus
+
+    texts = load_corpus(csv_path)[0][:rows]
+    before = smaps_kb()
+    start = time.perf_counter()
+    vec, model, decoder, _ = registry.snapshot()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        probs = model.predict_proba(vec.transform([text]))[0]
+        decoder.inverse_transform(probs.argsort()[-5:][::-1])
+    predict_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    print(json.dumps({'before': before, 'load_seconds': load_seconds, 'predict_ms': predict_ms}), flush=True)
+    sys.stdin.read()
+
+
+def run(model_format, workers, csv_path, rows):
+    env = dict(os.environ, RESUME_MODEL_FORMAT=model_format)
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--worker', '--csv', csv_path,
+                               '--rows', str(rows)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, text=True)
+             for _ in range(workers)]
+    reports = [json.loads(proc.stdout.readline()) for proc in procs]
+    # every worker is loaded now, so shared pages are split between all of them
+    after = [smaps_kb(proc.pid) for proc in procs]
+    for proc in procs:
+        proc.stdin.close()
+        proc.wait()
+
+    n = len(procs)
+    return {
+        'load_ms': sum(r['load_seconds'] for r in reports) / n * 1000,
+        'predict_ms': sum(r['predict_ms'] for r in reports) / n,
+        'private_mb': sum(a['private'] - r['before']['private'] for a, r in zip(after, reports)) / n / 1024,
+        'pss_mb': sum(a['pss'] - r['before']['pss'] for a, r in zip(after, reports)) / n / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=200, help="resumes scored one by one per worker")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.csv, args.rows)
+        return
+
+    print(f"{args.workers} workers, {args.rows} single-resume predictions each")
+    print(f"{'format':<8} {'load ms':>9} {'predict ms':>11} {'private MB/worker':>18} {'PSS MB/worker':>14}")
+    for model_format in ('pickle', 'compact'):
+        result = run(model_format, args.workers, args.csv, args.rows)
+        print(f"{model_format:<8} {result['load_ms']:>9.1f} {result['predict_ms']:>11.3f} "
+              f"{result['private_mb']:>18.1f} {result['pss_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Compares full cosine + argsort course ranking with CourseRetriever as the
+catalog grows.
+
+    python benchmarks/bench_course_retrieval.py --sizes 3678 30000 300000 --queries 200
+
+Catalogs are grown from the course titles of udemy_courses.csv by mixing
+their words, so they keep a realistic vocabulary. Exits with status 1 when
+the top-k scores of the two rankings differ.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.metrics.pairwise import cosine_similarity  # noqa: E402
+
+from utils.parser import job_title_skills  # noqa: E402
+from utils.retrieval import CourseRetriever  # noqa: E402
+
+
+def make_catalog(titles, size, seed=0):
+    rng = random.Random(seed)
+    words = ' '.join(titles).lower().split()
+    catalog = [title.lower() for title in titles[:size]]
+    while len(catalog) < size:
+        catalog.append(' '.join(rng.choice(words) for _ in range(rng.randint(4, 30))))
+    return catalog
+
+
+def make_queries(count, seed=0):
+    rng = random.Random(seed)
+    skills = [skill.lower() for skills in job_title_skills.values() for skill in skills]
+    return [', '.join(rng.sample(skills, rng.randint(1, 12))) for _ in range(count)]
+
+
+def baseline(vectors, query_vectors, k):
+    results = []
+    for row in range(query_vectors.shape[0]):
+        similar = cosine_similarity(vectors, query_vectors[row]).flatten()
+        top = similar.argsort()[::-1][:k]
+        results.append((top, similar[top]))
+    return results
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='udemy_courses.csv')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3678, 30000, 300000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    titles = list(pd.read_csv(args.csv)['course_title'].astype(str))
+    queries = make_queries(args.queries)
+    mismatches = 0
+
+    print(f"{'courses':>8} {'features':>9} {'argsort ms/q':>13} {'retriever ms/q':>15} {'batched ms/q':>13}")
+    for size in args.sizes:
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+        vectors = vectorizer.fit_transform(make_catalog(titles, size))
+        query_vectors = vectorizer.transform(queries)
+        retriever = CourseRetriever(vectors)
+
+        full, expected = timed(lambda: baseline(vectors, query_vectors, args.k))
+        single, _ = timed(lambda: [retriever.search(query_vectors[row], k=args.k)[0]
+                                   for row in range(len(queries))])
+        batched, actual = timed(lambda: retriever.search(query_vectors, k=args.k))
+
+        for (_, want), (_, got) in zip(expected, actual):
+            if not np.allclose(want, got, rtol=0, atol=1e-12):
+                mismatches += 1
+        print(f"{size:>8} {vectors.shape[1]:>9} {1000 * full / len(queries):>13.3f} "
+              f"{1000 * single / len(queries):>15.3f} {1000 * batched / len(queries):>13.3f}")
+
+    print(f"parity: {mismatches} queries with different top-{args.k} scores")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compares the PDF text-extraction backends on a synthetic corpus.
+
+    python benchmarks/bench_pdf_backends.py --docs 20 --pages 1 5 20 --workers 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf import BACKENDS, extract_pages  # noqa: E402
+
+WORDS = ("python java sql docker kubernetes aws spark hadoop tableau excel machine learning "
+         "project managed team developed designed implemented pipeline data analysis rest apis "
+         "git linux jenkins selenium testing html css javascript react django flask").split()
+
+
+def make_pdf(pages, lines_per_page=45, seed=0):
+    """Builds an uncompressed PDF with Helvetica text, no third-party dependency."""
+    rng = random.Random(seed)
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for _ in range(pages):
+        lines = [' '.join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+        ops = [b'BT /F1 10 Tf 40 800 Td 14 TL']
+        ops += [b'(' + line.encode('latin-1') + b") '" for line in lines]
+        ops.append(b'ET')
+        stream = b'\n'.join(ops)
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id)
+        kids.append(len(objects))
+    objects[1] = (b'<< /Type /Pages /Count %d /Kids [' % pages
+                  + b' '.join(b'%d 0 R' % k for k in kids) + b'] >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % off for off in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def run(corpus, **kwargs):
+    start = time.perf_counter()
+    chars = 0
+    for data in corpus:
+        chars += sum(len(text or '') for text in extract_pages(data, **kwargs))
+    return time.perf_counter() - start, chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    backends = [name for name, backend in BACKENDS.items() if backend.available()]
+    modes = [('serial', dict(workers=0)),
+             ('thread', dict(workers=args.workers, executor='thread')),
+             ('process', dict(workers=args.workers, executor='process'))]
+
+    print(f"{'pages':>5}  {'backend':<8} {'mode':<8} {'docs/s':>9} {'ms/doc':>9} {'chars':>9}")
+    for pages in args.pages:
+        corpus = [make_pdf(pages, seed=i) for i in range(args.docs)]
+        for name in backends:
+            for mode, kwargs in modes:
+                if name == 'text' and mode != 'serial':
+                    continue
+                run(corpus[:1], backend=name, **kwargs)  # warm-up (imports, pool start)
+                elapsed, chars = run(corpus, backend=name, **kwargs)
+                print(f"{pages:>5}  {name:<8} {mode:<8} {args.docs / elapsed:>9.1f} "
+                      f"{1000 * elapsed / args.docs:>9.2f} {chars:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compares the end-to-end latency of analyze_resume with the stages run one
+after another against the concurrent stage graph.
+
+    python benchmarks/bench_pipeline.py resume.pdf --repeat 20
+    python benchmarks/bench_pipeline.py resume.pdf --nlp process
+
+Extraction is cached after the first run, so the numbers show the
+preprocess / classify / skills part of an upload. Concurrent latency should
+approach the slowest branch (preprocess + classify, or skills) rather than
+their sum; on a single core the thread variant can only overlap the parts
+that release the GIL.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import get_processed_corpus, predict_processed  # noqa: E402
+from utils.extract_cache import cached_resume_data  # noqa: E402
+from utils.parser import extract_skills  # noqa: E402
+from utils.pipeline import build_dag, get_pool, warm_pools  # noqa: E402
+
+
+def sequential(text):
+    timings = {}
+    start = time.perf_counter()
+    processed = get_processed_corpus([[text]])
+    timings['preprocess'] = time.perf_counter() - start
+    mark = time.perf_counter()
+    predictions = predict_processed(processed)
+    timings['classify'] = time.perf_counter() - mark
+    mark = time.perf_counter()
+    skills = extract_skills(text)
+    timings['skills'] = time.perf_counter() - mark
+    return (predictions, skills), timings
+
+
+def concurrent(text, nlp):
+    dag = build_dag(nlp=nlp)
+    executors = {kind: get_pool(kind) for kind in ('thread', 'process') if kind in (nlp, 'thread')}
+    outputs, timings = dag.run({'text': text, 'corpus': [[text]]}, executors=executors)
+    return (outputs['classify'], outputs['skills']), timings
+
+
+def measure(func, repeat):
+    walls, stages = [], {}
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output, timings = func()
+        walls.append(time.perf_counter() - start)
+        for stage, seconds in timings.items():
+            stages.setdefault(stage, []).append(seconds)
+    return output, statistics.median(walls), {stage: statistics.median(s) for stage, s in stages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdf')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--nlp', choices=('thread', 'process'), default='thread',
+                        help="executor of the preprocess stage")
+    args = parser.parse_args()
+
+    text, is_valid = cached_resume_data(args.pdf)
+    if not is_valid:
+        sys.exit(f"{args.pdf}: no valid text")
+    warm_pools()
+    sequential(text)  # loads models, NLTK and the skill matcher
+
+    expected, seq_wall, seq_stages = measure(lambda: sequential(text), args.repeat)
+    output, dag_wall, dag_stages = measure(lambda: concurrent(text, args.nlp), args.repeat)
+
+    for name, wall, stages in (('sequential', seq_wall, seq_stages), (f'dag ({args.nlp})', dag_wall, dag_stages)):
+        detail = '  '.join(f"{stage} {seconds * 1000:.1f}" for stage, seconds in stages.items())
+        print(f"{name:<16} {wall * 1000:>8.1f} ms   [{detail}] ms, sum {sum(stages.values()) * 1000:.1f} ms")
+    longest = max(dag_stages['preprocess'] + dag_stages['classify'], dag_stages['skills'])
+    print(f"longest branch {longest * 1000:.1f} ms, speedup {seq_wall / dag_wall:.2f}x")
+
+    same = [list(map(tuple, expected[0])) == list(map(tuple, output[0])), expected[1] == output[1]]
+    print(f"parity: {'ok' if all(same) else 'MISMATCH'}")
+    sys.exit(0 if all(same) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Checks that utils.preprocess gives exactly the output of the original
+get_processed_corpus loop (re.sub, word_tokenize, list stopwords, one
+lemmatize call per token), then compares their throughput.
+
+    python benchmarks/bench_preprocess.py --csv UpdatedResumeDataSet.csv --workers 4
+
+Exits with status 1 when any text is processed differently.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from nltk.corpus import stopwords  # noqa: E402
+from nltk.stem.wordnet import WordNetLemmatizer  # noqa: E402
+from nltk.tokenize import word_tokenize  # noqa: E402
+
+from utils.preprocess import lemma_cache_info, preprocess_corpus  # noqa: E402
+
+stop = stopwords.words('english')
+lematizer = WordNetLemmatizer()
+
+
+def reference_cleantext(txt):
+    cleanText = re.sub(r'http\S+\s', ' ', txt)
+    cleanText = re.sub('RT|cc', ' ', cleanText)
+    cleanText = re.sub(r'#\S+\s', ' ', cleanText)
+    cleanText = re.sub(r'@\S+', '  ', cleanText)
+    cleanText = re.sub('[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"""), ' ', cleanText)
+    cleanText = re.sub(r'[^\x00-\x7f]', ' ', cleanText)
+    cleanText = re.sub(r'\s+', ' ', cleanText)
+    return cleanText
+
+
+def reference(texts):
+    corpus = []
+    for text in texts:
+        cleaned_sent = reference_cleantext(text.lower())
+        filtered = [lematizer.lemmatize(word) for word in word_tokenize(cleaned_sent)
+                    if word.isalpha() and word not in stop]
+        corpus.append(' '.join(filtered))
+    return corpus
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv')
+    parser.add_argument('--column', default='Resume')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    texts = list(pd.read_csv(args.csv)[args.column].astype(str))
+    chars = sum(len(text) for text in texts)
+
+    runs = [('reference', reference, {}),
+            ('cold', preprocess_corpus, {}),
+            ('warm', preprocess_corpus, {}),
+            (f'pool x{args.workers}', preprocess_corpus, {'workers': args.workers})]
+    outputs = {}
+    for name, func, kwargs in runs:
+        elapsed, outputs[name] = timed(func, texts, **kwargs)
+        print(f"{name:<10} {len(texts) / elapsed:>9.1f} docs/s  {chars / elapsed / 1e6:>6.2f} MB/s")
+    print(lemma_cache_info())
+
+    expected = outputs.pop('reference')
+    mismatches = sum(any(out[i] != expected[i] for out in outputs.values()) for i in range(len(texts)))
+    print(f"parity: {mismatches} mismatches in {len(texts)} texts")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Compares the per-page-view cost of the old temp_data/session_<id>.json
+scheme (load one file, then json.load every file to expire old ones) with
+the session stores of utils.session_store.
+
+    python benchmarks/bench_session_store.py --sessions 10000 --views 200
+
+Each view reads one session and writes it back, like the course page does.
+A quarter of the sessions are created already expired.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.session_store import MemorySessionStore, SQLiteSessionStore  # noqa: E402
+
+TIMEOUT = 3600
+PAYLOAD = {'predictions': [['Data Science', 0.42], ['Python Developer', 0.21]],
+           'skills': ['python', 'sql', 'machine learning', 'pandas']}
+
+
+def file_view(directory, session_id):
+    # the old load_session_data + save_session_data + cleanup_old_sessions
+    path = os.path.join(directory, f"session_{session_id}.json")
+    with open(path) as f:
+        json.load(f)
+    with open(path, 'w') as f:
+        json.dump(dict(PAYLOAD, timestamp=datetime.now().isoformat()), f)
+    now = datetime.now()
+    for name in os.listdir(directory):
+        if name.startswith('session_') and name.endswith('.json'):
+            with open(os.path.join(directory, name)) as f:
+                data = json.load(f)
+            if now - datetime.fromisoformat(data['timestamp']) > timedelta(seconds=TIMEOUT):
+                os.remove(os.path.join(directory, name))
+
+
+def store_view(store, session_id):
+    store.get(session_id)
+    store.set(session_id, PAYLOAD)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--views', type=int, default=200)
+    args = parser.parse_args()
+
+    ids = [f"{i:08d}" for i in range(args.sessions)]
+    expired = set(ids[:args.sessions // 4])
+    live = ids[args.sessions // 4:]
+    views = [random.choice(live) for _ in range(args.views)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        old = datetime.now() - timedelta(seconds=2 * TIMEOUT)
+        for session_id in ids:
+            stamp = old if session_id in expired else datetime.now()
+            with open(os.path.join(directory, f"session_{session_id}.json"), 'w') as f:
+                json.dump(dict(PAYLOAD, timestamp=stamp.isoformat()), f)
+
+        stores = {'files': None,
+                  'sqlite': SQLiteSessionStore(os.path.join(directory, 'sessions.db'), ttl=TIMEOUT),
+                  'memory': MemorySessionStore(ttl=TIMEOUT)}
+        for store in filter(None, stores.values()):
+            for session_id in ids:
+                store.set(session_id, PAYLOAD, ttl=-1 if session_id in expired else None)
+
+        for name, store in stores.items():
+            start = time.perf_counter()
+            for session_id in views:
+                if store is None:
+                    file_view(directory, session_id)
+                else:
+                    store_view(store, session_id)
+            per_view = (time.perf_counter() - start) / len(views)
+            purge = ''
+            if store is not None:
+                start = time.perf_counter()
+                removed = store.purge_expired()
+                purge = f"   background purge: {removed} expired in {(time.perf_counter() - start) * 1000:.1f} ms"
+            print(f"{name:<7} {per_view * 1000:>9.3f} ms/view{purge}")
+        stores['sqlite'].close()
+
+
+if __name__ == '__main__':
+    main()
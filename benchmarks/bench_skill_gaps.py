@@ -0,0 +1,61 @@
+"""
+Checks that the SkillIndex gap computation gives the same missing skills
+as the original per-role set loop, then compares their speed.
+
+    python benchmarks/bench_skill_gaps.py --resumes 2000
+
+Every synthetic resume draws a random subset of the skill vocabulary and is
+compared against all roles. Exits with status 1 on any mismatch.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parser import all_skills, get_skill_index, job_title_skills, missingskills  # noqa: E402
+
+
+def reference(labels, skills):
+    missing = []
+    for label in labels:
+        required_skills = [sk.lower() for sk in job_title_skills[label]]
+        missing.append([label, set(required_skills) - set(skills)])
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    roles = list(job_title_skills)
+    resumes = [set(random.sample(all_skills, random.randint(0, 15))) | {'not a listed skill'}
+               for _ in range(args.resumes)]
+    index = get_skill_index()
+
+    runs = {}
+    for name, func in (('reference', reference), ('index', missingskills)):
+        # results are not kept while timing, so garbage collection does not skew the numbers
+        start = time.perf_counter()
+        for skills in resumes:
+            func(roles, skills)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed / len(resumes) * 1e6:>8.1f} us per resume x {len(roles)} roles")
+        runs[name] = [func(roles, skills) for skills in resumes]
+
+    start = time.perf_counter()
+    for skills in resumes:
+        index.rank_roles(skills)
+    print(f"{'ranking':<10} {(time.perf_counter() - start) / len(resumes) * 1e6:>8.1f} us per resume x {len(roles)} roles")
+
+    mismatches = sum(a != b for a, b in zip(runs['reference'], runs['index']))
+    print(f"parity: {mismatches} mismatches in {len(resumes)} resumes")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
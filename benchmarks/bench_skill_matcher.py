@@ -0,0 +1,109 @@
+"""
+Checks that the compiled skill matcher returns exactly what the spaCy
+PhraseMatcher path returns for the skills and aliases of the taxonomy,
+then compares their throughput.
+
+    python benchmarks/bench_skill_matcher.py --csv UpdatedResumeDataSet.csv --fuzz 20000
+
+Exits with status 1 when any text gives different skills. Without the
+en_core_web_sm package the reference uses spacy.blank('en'), which has the
+same tokenizer.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from utils import parser as skill_parser  # noqa: E402
+from utils.skill_matcher import SkillMatcher  # noqa: E402
+from utils.taxonomy import load_taxonomy  # noqa: E402
+
+SEPARATORS = [' ', ', ', '/', '-', '.', '. ', '(', ')', '), ', '\n', '  ', ':', ';', '&', '#', '+', "'s ",
+              '"', '...', '–', '!', '?', '_', '*', '=', '@', '$', '%', '5', '2.5', '10%', 'r2', '’', '|',
+              'é', 'Ã©', '😀', 'x', 'a.', 'e.g.', 'and/or', '.)', '\t']
+EXTRA_WORDS = ['and', 'the', '2019', 'github.com', 'http://x.io', 'node.js', 'c', 'r', 'ms', 'net', '.net']
+
+
+def reference_matcher(forms):
+    try:
+        nlp = skill_parser.get_nlp()
+    except OSError:
+        import spacy
+        nlp = spacy.blank('en')
+        print("en_core_web_sm not installed, using spacy.blank('en') as reference")
+    matcher = skill_parser.SpacySkillMatcher(nlp)
+    for skill, skill_forms in forms.items():
+        matcher.add(skill, skill_forms)
+    return matcher.match
+
+
+def compiled_matcher(forms):
+    matcher = SkillMatcher()
+    for skill, skill_forms in forms.items():
+        matcher.add(skill, skill_forms)
+    return matcher.match
+
+
+def fuzz_corpus(count, seed=0):
+    rng = random.Random(seed)
+    words = [form for forms in load_taxonomy().forms().values() for form in sorted(forms)] + EXTRA_WORDS
+    texts = []
+    for _ in range(count):
+        parts = [rng.choice(['', '(', '"', '-', '.'])]
+        for _ in range(rng.randint(1, 8)):
+            parts.append(rng.choice(words))
+            parts.append(rng.choice(SEPARATORS))
+        texts.append(''.join(parts))
+    return texts
+
+
+def throughput(func, texts, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv')
+    parser.add_argument('--column', default='Resume')
+    parser.add_argument('--fuzz', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    resumes = list(pd.read_csv(args.csv)[args.column].astype(str))
+    fuzz = fuzz_corpus(args.fuzz, args.seed)
+
+    forms = load_taxonomy().forms()
+    reference = reference_matcher(forms)
+    compiled = compiled_matcher(forms)
+
+    mismatches = 0
+    for text in resumes + fuzz:
+        expected, actual = sorted(reference(text)), sorted(compiled(text))
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH {text[:120]!r}\n  spacy:    {expected}\n  compiled: {actual}")
+    print(f"parity: {mismatches} mismatches in {len(resumes)} resumes + {len(fuzz)} fuzz texts")
+
+    chars = sum(len(text) for text in resumes)
+    for name, func in (('spacy', reference), ('compiled', compiled)):
+        elapsed = throughput(func, resumes)
+        print(f"{name:<9} {len(resumes) / elapsed:>9.1f} docs/s  {chars / elapsed / 1e6:>6.2f} MB/s  "
+              f"{1000 * elapsed / len(resumes):>7.3f} ms/doc")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Measures the import cost of the Streamlit entry points and checks it
+against benchmarks/startup_budget.json.
+
+    python benchmarks/bench_startup.py              # check against the budget
+    python benchmarks/bench_startup.py --top 15     # show the 15 slowest imports
+    python benchmarks/bench_startup.py --write-budget
+
+The module-level imports of each entry point are replayed in a fresh
+interpreter under python -X importtime (the Streamlit page code itself is
+not run). A budget lists the maximum import time and the modules that must
+not be imported at startup; exits with status 1 when either is exceeded.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT, 'benchmarks', 'startup_budget.json')
+WATCHED = ('nltk', 'spacy', 'sklearn', 'scipy', 'matplotlib', 'pandas', 'numpy', 'fitz', 'pypdf')
+
+
+def module_imports(path):
+    """Returns the source of the imports an entry point runs at module level, try blocks included."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    lines = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                lines.append(ast.unparse(node))
+            elif isinstance(node, ast.Try):
+                visit(node.body)
+    visit(tree.body)
+    return '\n'.join(lines)
+
+
+def _importtime(probe):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe],
+                            capture_output=True, text=True, cwd=ROOT)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, total_us, name = line[len('import time:'):].split('|')
+        if len(name) - len(name.lstrip()) == 1:  # imported by the probe itself
+            cumulative[name.strip()] = int(total_us) / 1000
+    return result, cumulative
+
+
+def measure(path, interpreter_modules=()):
+    probe = (f"import sys, time\nstart = time.perf_counter()\n{module_imports(path)}\n"
+             f"elapsed = time.perf_counter() - start\n"
+             f"print(repr((elapsed, [m for m in {WATCHED!r} if m in sys.modules])))")
+    result, cumulative = _importtime(probe)
+    if result.returncode:
+        raise RuntimeError(f"importing {path} failed:\n{result.stderr[-2000:]}")
+    elapsed, loaded = ast.literal_eval(result.stdout.strip().splitlines()[-1])
+    for name in interpreter_modules:
+        cumulative.pop(name, None)
+    return elapsed * 1000, loaded, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry', nargs='+', default=['app.py', 'pages/Course.py'])
+    parser.add_argument('--repeat', type=int, default=3, help="fresh interpreters per entry point, best is kept")
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--budget', default=BUDGET_PATH)
+    parser.add_argument('--write-budget', action='store_true',
+                        help="set each max_import_ms to 1.5x the current measurement")
+    args = parser.parse_args()
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+
+    # what the interpreter imports before any entry point code runs
+    _, interpreter_modules = _importtime('pass')
+
+    failures = []
+    for entry in args.entry:
+        runs = [measure(os.path.join(ROOT, entry), interpreter_modules) for _ in range(args.repeat)]
+        elapsed, loaded, cumulative = min(runs, key=lambda run: run[0])
+        print(f"{entry}: {elapsed:.0f} ms, heavy modules loaded: {', '.join(loaded) or 'none'}")
+        for name, ms in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {ms:>8.1f} ms  {name}")
+
+        limits = budget.setdefault(entry, {})
+        if args.write_budget:
+            limits['max_import_ms'] = int(elapsed * 1.5)
+            continue
+        if elapsed > limits.get('max_import_ms', float('inf')):
+            failures.append(f"{entry}: {elapsed:.0f} ms over the {limits['max_import_ms']} ms budget")
+        for module in set(loaded) & set(limits.get('forbidden', ())):
+            failures.append(f"{entry}: imports {module} at startup")
+
+    if args.write_budget:
+        with open(args.budget, 'w') as f:
+            json.dump(budget, f, indent=2)
+            f.write('\n')
+    for failure in failures:
+        print(f"BUDGET EXCEEDED {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
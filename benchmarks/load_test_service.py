@@ -0,0 +1,92 @@
+"""
+Load-tests the inference service with concurrent clients.
+
+    python benchmarks/load_test_service.py --spawn --clients 16 --requests 2000
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8000 --clients 32
+
+--spawn starts the service in this process on a free port, so
+--max-batch/--max-wait-ms can be compared directly (use --max-batch 1 for
+no batching). Resume texts come from UpdatedResumeDataSet.csv.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from utils.client import ServiceClient  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round((len(values) - 1) * q / 100)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url')
+    parser.add_argument('--spawn', action='store_true')
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        from utils.service import ResumeService
+        server = ResumeService(('127.0.0.1', 0), max_batch_size=args.max_batch, max_wait=args.max_wait_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        args.url = f"http://127.0.0.1:{server.server_port}"
+    if not args.url:
+        parser.error("pass --url or --spawn")
+
+    client = ServiceClient(args.url, timeout=120)
+    while not client.ready():
+        time.sleep(0.2)
+
+    texts = list(pd.read_csv(args.csv)['Resume'].astype(str))
+    counter = iter(range(args.requests))
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            try:
+                client.score_text(texts[index % len(texts)])
+            except Exception as e:
+                errors.append(e)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    batching = client.health()['batching']
+    print(f"{len(latencies)} requests, {len(errors)} errors, {args.clients} clients in {elapsed:.1f}s: "
+          f"{len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50 {1000 * percentile(latencies, 50):.1f} ms  p95 {1000 * percentile(latencies, 95):.1f} ms  "
+          f"p99 {1000 * percentile(latencies, 99):.1f} ms")
+    print(f"batches {batching['batches']}, mean batch size {batching['mean_batch_size']:.2f}")
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,19 @@
 # Course.py
 import streamlit as st
 import pandas as pd
-import os
-import json
-import pickle
-from pathlib import Path
-from datetime import datetime, timedelta
 
 # Assuming utils.parser and utils.course are correctly in your project structure
 try:
     from utils.parser import missingskills
-    from utils.course import get_course_recomend
+    from utils.catalog import get_catalog
+    from utils.course import get_course_recomend_batch
+    from utils import config
+    from utils.session_store import get_session_store
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error("Please ensure utils.parser and utils.course modules are available")
     st.stop()
 
-# Configuration for persistence
-TEMP_DIR = "temp_data"
-SESSION_TIMEOUT = 3600  # 1 hour in seconds
-
 # Page config
 st.set_page_config(page_title="🚀 Course Recommendations", layout="wide")
 st.title('Course Predictions')
@@ -150,11 +144,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Persistence Functions ---
-def ensure_temp_directory():
-    """Create temp directory if it doesn't exist."""
-    if not os.path.exists(TEMP_DIR):
-        os.makedirs(TEMP_DIR)
-
 def get_session_id():
     """Generate or retrieve a session ID for the current user."""
     if 'session_id' not in st.session_state:
@@ -163,72 +152,22 @@ def get_session_id():
     return st.session_state['session_id']
 
 def save_session_data(predictions, skills):
-    """Save session data to a temporary file."""
+    """Save session data to the session store."""
     try:
-        ensure_temp_directory()
-        session_id = get_session_id()
-        
-        data = {
-            'predictions': predictions,
-            'skills': skills,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        filepath = os.path.join(TEMP_DIR, f"session_{session_id}.json")
-        with open(filepath, 'w') as f:
-            json.dump(data, f)
-        
+        get_session_store().set(get_session_id(), {'predictions': predictions, 'skills': skills})
         return True
     except Exception as e:
         st.error(f"Error saving session data: {e}")
         return False
 
 def load_session_data():
-    """Load session data from temporary file."""
+    """Load session data from the session store; expired sessions read as missing."""
     try:
-        session_id = get_session_id()
-        filepath = os.path.join(TEMP_DIR, f"session_{session_id}.json")
-        
-        if not os.path.exists(filepath):
-            return None
-        
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        # Check if data is not too old
-        timestamp = datetime.fromisoformat(data['timestamp'])
-        if datetime.now() - timestamp > timedelta(seconds=SESSION_TIMEOUT):
-            # Data is too old, remove it
-            os.remove(filepath)
-            return None
-        
-        return data
+        return get_session_store().get(get_session_id())
     except Exception as e:
         st.error(f"Error loading session data: {e}")
         return None
 
-def cleanup_old_sessions():
-    """Remove old session files."""
-    try:
-        if not os.path.exists(TEMP_DIR):
-            return
-        
-        current_time = datetime.now()
-        for filename in os.listdir(TEMP_DIR):
-            if filename.startswith("session_") and filename.endswith(".json"):
-                filepath = os.path.join(TEMP_DIR, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                    timestamp = datetime.fromisoformat(data['timestamp'])
-                    if current_time - timestamp > timedelta(seconds=SESSION_TIMEOUT):
-                        os.remove(filepath)
-                except:
-                    # If we can't read the file, remove it
-                    os.remove(filepath)
-    except Exception as e:
-        pass  # Silently handle cleanup errors
-
 def get_url_params():
     """Get URL parameters for session restoration."""
     try:
@@ -254,56 +193,35 @@ def restore_session_state():
             return True
     return False
 
-@st.cache_data(show_spinner=False)
-def load_course_data():
-    """Loads the processed course data from a CSV file."""
-    # Check multiple possible locations for the CSV file
-    possible_paths = [
-        'processed_courses.csv',
-        'data/processed_courses.csv',
-        '../data/processed_courses.csv'
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            try:
-                return pd.read_csv(path)
-            except Exception as e:
-                st.error(f"Error loading CSV from {path}: {e}")
-                continue
-    
-    # If no file found, create an empty DataFrame with expected columns
-    st.error("processed_courses.csv not found in any expected location")
-    return pd.DataFrame(columns=['title', 'Instructor', 'Organization', 'Level', 'enrolled', 'rating', 'URL'])
-
 @st.cache_data(show_spinner=False)
 def get_course_data_cached(indices):
-    """Retrieves course data for given indices from the cached dataframe."""
+    """Retrieves course data for given indices from the shared course catalog."""
     try:
-        # Load course data once
-        course_data = load_course_data()
-        
-        if course_data.empty:
-            return []
-                
+        # memory-mapped once per process and shared with the recommender
+        course_data = get_catalog()
+
         # Filter out invalid indices
         valid_indices = [i for i in indices if 0 <= i < len(course_data)]
         if len(valid_indices) != len(indices):
             st.warning(f"Some course indices were out of range. Using {len(valid_indices)} valid recommendations.")
-                
-        return [course_data.iloc[i].to_dict() for i in valid_indices]
+
+        return course_data.rows(valid_indices)
+    except FileNotFoundError:
+        st.error("processed_courses.csv not found and no course catalog was built")
+        return []
     except Exception as e:
         st.error(f"Error retrieving course data: {e}")
         return []
 
 @st.cache_data(show_spinner="Fetching fresh recommendations...")
-def get_recommendations_cached(missing_skills):
-    """Gets course recommendations based on missing skills, with caching."""
+def get_recommendations_cached(missing_skill_lists, dedupe=False):
+    """Gets course recommendations for every role's missing skills in one pass, with caching."""
     try:
-        return get_course_recomend(missing_skills)
+        return [indices.tolist() for indices in
+                get_course_recomend_batch([list(skills) for skills in missing_skill_lists], dedupe=dedupe)]
     except Exception as e:
         st.error(f"Error getting course recommendations: {e}")
-        return []
+        return [[] for _ in missing_skill_lists]
 
 def clean_data_value(value, default='N/A'):
     """Clean data values, handling 'not found' strings and None values."""
@@ -362,9 +280,6 @@ def validate_url(url):
 
 # --- Main Application Logic ---
 def main():
-    # Clean up old sessions on app start
-    cleanup_old_sessions()
-    
     # Try to restore session state from saved data
     restored = restore_session_state()
     
@@ -404,12 +319,10 @@ def main():
         # Add session info for user
         with st.expander("ℹ️ Session Information"):
             st.info(f"Session ID: {session_id[:8]}...")
-            st.info("Your session data is temporarily saved. You can reload this page within 1 hour.")
+            st.info(f"Your session data is temporarily saved. You can reload this page within {config.SESSION_TIMEOUT / 3600:g} hour(s).")
             if st.button("Clear Session Data"):
                 try:
-                    filepath = os.path.join(TEMP_DIR, f"session_{session_id}.json")
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
+                    get_session_store().delete(session_id)
                     st.session_state.clear()
                     st.success("Session data cleared!")
                     st.rerun()
@@ -432,20 +345,18 @@ def main():
             st.success("🎉 Congratulations! You already have all the skills needed for the predicted job roles.")
             return
         
+        # Skip roles without missing skills
+        roles = [(role_data[0], role_data[1]) for role_data in missing
+                 if len(role_data) >= 2 and role_data[1]]
+
+        # Score every role against the catalog in one pass
+        with st.spinner("⌛ Curating recommendations for your predicted roles..."):
+            all_recommendations = get_recommendations_cached(
+                tuple(tuple(skill_list) for _, skill_list in roles), dedupe=config.COURSE_DEDUPE)
+
         # Display recommendations for each missing role
-        for role_data in missing:
-            if len(role_data) < 2:
-                continue
-                
-            label, missing_skill_list = role_data[0], role_data[1]
-            
-            # Skip if no missing skills
-            if not missing_skill_list:
-                continue
-            
-            with st.spinner(f"⌛ Curating recommendations for the **{label}** role..."):
-                recommendations = get_recommendations_cached(missing_skill_list)
-                course_cards_data = get_course_data_cached(recommendations)
+        for (label, missing_skill_list), recommendations in zip(roles, all_recommendations):
+            course_cards_data = get_course_data_cached(recommendations)
             
             # Display section header
             st.markdown("<br>", unsafe_allow_html=True)
@@ -1,16 +1,9 @@
 import pickle
 import os
-import re
-from nltk.tokenize import word_tokenize
-from nltk.stem.wordnet import WordNetLemmatizer
-from pypdf import PdfReader
-import  nltk
-
-nltk.download('stopwords')
-nltk.download('punkt')
-
-from nltk.corpus  import stopwords
-stop = stopwords.words('english')
+from utils import config
+from utils.registry import ModelRegistry
+from utils.pdf import extract_pages, read_file_bytes
+from utils.preprocess import cleantext, preprocess_corpus
 
 
 
@@ -18,8 +11,20 @@ stop = stopwords.words('english')
 MODEL_PATH = os.path.join("Artifacts", "model.pkl")
 PREPROCESSOR_PATH = os.path.join("Artifacts", "preprocessor.pkl")
 DECODEER_PATH = os.path.join("Artifacts", "decoder.pkl")
-
-lematizer = WordNetLemmatizer()
+# written by utils.train on publish; names the artifacts of the live version
+MANIFEST_PATH = os.path.join("Artifacts", "model_manifest.json")
+
+# artifacts are unpickled once per process and shared by every session
+if config.MODEL_FORMAT == 'compact':
+    # same interface, arrays memory-mapped and shared between worker processes
+    from utils.compact import COMPACT_PATHS, load_compact
+    registry = ModelRegistry(COMPACT_PATHS, loader=load_compact, manifest_path=MANIFEST_PATH, section='compact')
+else:
+    registry = ModelRegistry({
+        'preprocessor': PREPROCESSOR_PATH,
+        'model': MODEL_PATH,
+        'decoder': DECODEER_PATH,
+    }, manifest_path=MANIFEST_PATH)
 
 
 def save_file(file_path,obj):
@@ -27,31 +32,16 @@ def save_file(file_path,obj):
         pickle.dump(obj=obj,file=file)
 
 
-def cleantext(txt):
-    cleanText = re.sub('http\S+\s', ' ', txt)
-    cleanText = re.sub('RT|cc', ' ', cleanText)
-    cleanText = re.sub('#\S+\s', ' ', cleanText)
-    cleanText = re.sub('@\S+', '  ', cleanText)  
-    cleanText = re.sub('[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', cleanText)
-    cleanText = re.sub(r'[^\x00-\x7f]', ' ', cleanText) 
-    cleanText = re.sub('\s+', ' ', cleanText)
-    return cleanText
-
-def get_processed_corpus(inp):
-    corpus = []
-    for sentence in inp:
-        cleaned_sent = cleantext(sentence[0].lower())
-        filtered = [lematizer.lemmatize(word) for word in word_tokenize(cleaned_sent) if word.isalpha() and word not in stop]
-        filtered_sent = ' '.join(filtered)
-        corpus.append(filtered_sent)
-    return corpus
-
-def resume_data(file):
-    reader = PdfReader(file)
+def get_processed_corpus(inp, workers=0):
+    return preprocess_corpus([sentence[0] for sentence in inp], workers=workers)
+
+
+def resume_data(file, backend=None, workers=None, executor=None, page_timeout=None):
+    pages = extract_pages(read_file_bytes(file), backend=backend, workers=workers,
+                          executor=executor, page_timeout=page_timeout)
     data = []
     is_valid = True
-    for page  in reader.pages:
-        text = page.extract_text()
+    for text in pages:
         if text:
             data.append(text)
         else:
@@ -71,11 +61,16 @@ def load_obj(file):
 
 def output_predict(data):
     processed_data = get_processed_corpus(data)
-    tfidf = load_obj(PREPROCESSOR_PATH)
-    data_tfidf = tfidf.transform(processed_data)
+    return predict_processed(processed_data)
+
+
+def predict_processed(processed_data):
+    # one snapshot: the three artifacts always come from the same training
+    artifacts = registry.snapshot()
+    data_tfidf = artifacts.preprocessor.transform(processed_data)
 
-    model = load_obj(MODEL_PATH)
-    decoder = load_obj(DECODEER_PATH)
+    model = artifacts.model
+    decoder = artifacts.decoder
 
     probs = model.predict_proba(data_tfidf)[0]  # get probabilities for the first resume
     top_indices = probs.argsort()[-5:][::-1]  # top 3 indices sorted descending
@@ -0,0 +1,302 @@
+"""
+Headless batch scoring of stored resumes.
+
+    python -m utils.batch resumes/ -o results.jsonl --workers 4
+    python -m utils.batch UpdatedResumeDataSet.csv -o results.parquet --workers 8
+
+The input is a directory of PDFs (searched recursively) or a CSV with one
+resume text per row. Every document gets its role predictions, extracted
+skills, the missing skills of each predicted role and course picks for them.
+Records are appended to a JSONL file as they finish, and that file is the
+checkpoint: running the same command again skips the documents it already
+holds, and --retry-errors processes again the ones whose record has an
+error. A .parquet output is staged as <output>.partial.jsonl, which stays
+next to it as the checkpoint; the parquet file is rewritten from it at the
+end of every run.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+from utils import get_processed_corpus, predict_processed, resume_data
+from utils.parser import extract_skills, missingskills
+
+STAGES = ('extract', 'preprocess', 'classify', 'skills', 'gaps', 'courses')
+NESTED_COLUMNS = ('predictions', 'skills', 'gaps', 'courses', 'timings')
+RECORD_COLUMNS = ('id', 'valid') + NESTED_COLUMNS + ('error',)
+
+
+def iter_documents(path, text_column='Resume', id_column=None):
+    """
+    Lists the documents of a directory of PDFs or of a resume CSV.
+
+    Yields:
+        dict: 'id' and either 'path' (PDF) or 'text', plus 'category' when the CSV has one.
+    """
+    if os.path.isdir(path):
+        for root, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                if name.lower().endswith('.pdf'):
+                    full = os.path.join(root, name)
+                    yield {'id': os.path.relpath(full, path), 'path': full}
+        return
+
+    import pandas as pd
+    frame = pd.read_csv(path)
+    # columns are read by name, so headers that are not identifiers ("Resume Text") work
+    texts = frame[text_column].astype(str).tolist()
+    ids = frame[id_column].astype(str).tolist() if id_column else [str(i) for i in range(len(frame))]
+    categories = frame['Category'].tolist() if 'Category' in frame.columns else None
+    for row_number, (doc_id, text) in enumerate(zip(ids, texts)):
+        doc = {'id': doc_id, 'text': text}
+        if categories is not None:
+            doc['category'] = categories[row_number]
+        yield doc
+
+
+def _recommend_courses(gaps, k):
+    from utils.catalog import get_catalog
+    from utils.course import get_course_recomend_batch
+
+    roles = [role for role, missing in gaps.items() if missing]
+    picks = get_course_recomend_batch([gaps[role] for role in roles], k=k)
+    try:
+        catalog = get_catalog()
+        titles = [catalog.column('title', indices) for indices in picks]
+    except (FileNotFoundError, KeyError):
+        titles = [[None] * len(indices) for indices in picks]
+    return {role: [{'index': int(i), 'title': None if title is None else str(title)}
+                   for i, title in zip(indices, role_titles)]
+            for role, indices, role_titles in zip(roles, picks, titles)}
+
+
+def process_document(doc, courses=5):
+    """
+    Runs every stage on one document and returns its JSON-ready record.
+
+    Args:
+        doc (dict): an item of iter_documents.
+        courses (int): courses per role, 0 skips course recommendation.
+
+    Returns:
+        dict: the record; 'error' names the failed stage and the exception.
+    """
+    record = {key: value for key, value in doc.items() if key not in ('path', 'text')}
+    record.update({'valid': False, 'predictions': None, 'skills': None, 'gaps': None,
+                   'courses': None, 'timings': {}, 'error': None})
+
+    def run(stage, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            record['timings'][stage] = time.perf_counter() - start
+
+    stage = 'extract'
+    try:
+        if 'path' in doc:
+            text, record['valid'] = run(stage, resume_data, doc['path'])
+        else:
+            text, record['valid'] = run(stage, lambda t: (t, bool(t.strip())), doc['text'])
+        if not record['valid']:
+            return record
+
+        stage = 'preprocess'
+        processed = run(stage, get_processed_corpus, [[text]])
+        stage = 'classify'
+        predictions = run(stage, predict_processed, processed)
+        record['predictions'] = [{'role': str(role), 'score': float(score)} for role, score in predictions]
+        stage = 'skills'
+        record['skills'] = sorted(run(stage, extract_skills, text))
+        stage = 'gaps'
+        gaps = run(stage, missingskills, [p['role'] for p in record['predictions']], set(record['skills']))
+        record['gaps'] = {role: sorted(missing) for role, missing in gaps}
+        if courses:
+            stage = 'courses'
+            record['courses'] = run(stage, _recommend_courses, record['gaps'], courses)
+    except Exception as e:
+        record['error'] = f"{stage}: {type(e).__name__}: {e}"
+    return record
+
+
+def _process(args):
+    doc, courses = args
+    return process_document(doc, courses=courses)
+
+
+def load_checkpoint(jsonl_path, retry_errors=False):
+    """
+    Returns the ids already written to jsonl_path, dropping a torn last line left by a crash.
+
+    Args:
+        retry_errors (bool): also drop the records whose 'error' is set (rewriting
+            the file), so their documents are processed again.
+    """
+    done = set()
+    if not os.path.exists(jsonl_path):
+        return done
+    with open(jsonl_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+            data = data[:data.rfind(b'\n') + 1]
+    kept = []
+    for line in data.splitlines():
+        record = json.loads(line)
+        if retry_errors and record.get('error') is not None:
+            continue
+        done.add(record['id'])
+        kept.append(line)
+    if len(kept) < len(data.splitlines()):
+        with open(jsonl_path + '.tmp', 'wb') as f:
+            f.writelines(line + b'\n' for line in kept)
+        os.replace(jsonl_path + '.tmp', jsonl_path)
+    return done
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class BatchStats:
+    """Throughput and per-stage latency of a batch run."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.documents = 0
+        self.errors = 0
+        self.invalid = 0
+        self.stage_seconds = {stage: [] for stage in STAGES}
+
+    def add(self, record):
+        self.documents += 1
+        self.errors += record['error'] is not None
+        self.invalid += not record['valid']
+        for stage, seconds in record['timings'].items():
+            self.stage_seconds[stage].append(seconds)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.start
+        return {
+            'documents': self.documents,
+            'errors': self.errors,
+            'invalid': self.invalid,
+            'seconds': elapsed,
+            'docs_per_second': self.documents / elapsed if elapsed else 0.0,
+            'stages': {stage: {'p50_ms': 1000 * _percentile(seconds, 50),
+                               'p95_ms': 1000 * _percentile(seconds, 95),
+                               'count': len(seconds)}
+                       for stage, seconds in self.stage_seconds.items() if seconds},
+        }
+
+
+def _write_parquet(jsonl_path, output):
+    import pandas as pd
+
+    frame = pd.read_json(jsonl_path, lines=True, dtype=False)
+    if frame.empty:
+        # nothing processed yet: an empty file with the record columns
+        frame = pd.DataFrame({column: pd.Series(dtype='bool' if column == 'valid' else 'string')
+                              for column in RECORD_COLUMNS})
+    else:
+        # nested fields are kept as JSON strings so any parquet engine can write them
+        for column in NESTED_COLUMNS:
+            frame[column] = frame[column].map(json.dumps)
+    frame.to_parquet(output + '.tmp', index=False)
+    os.replace(output + '.tmp', output)
+
+
+def run_batch(documents, output, workers=0, executor='process', courses=5, chunksize=8, progress_every=500,
+              retry_errors=False):
+    """
+    Processes documents not yet in the output and appends their records.
+
+    Args:
+        documents (Iterable[dict]): items of iter_documents.
+        output (str): .jsonl or .parquet path.
+        workers (int): pool size, 0 processes in the calling thread.
+        executor (str): 'process' or 'thread'.
+        courses (int): courses per role, 0 skips course recommendation.
+        retry_errors (bool): process again the documents whose record has an error.
+
+    Returns:
+        dict: BatchStats summary of this run, plus 'skipped' for checkpointed documents.
+    """
+    parquet = output.endswith('.parquet')
+    jsonl_path = output + '.partial.jsonl' if parquet else output
+    done = load_checkpoint(jsonl_path, retry_errors=retry_errors)
+    pending = [doc for doc in documents if doc['id'] not in done]
+
+    stats = BatchStats()
+    tasks = ((doc, courses) for doc in pending)
+    pool = None
+    if workers:
+        pool = (Pool if executor == 'process' else ThreadPool)(workers)
+        records = pool.imap_unordered(_process, tasks, chunksize=chunksize)
+    else:
+        records = map(_process, tasks)
+
+    try:
+        with open(jsonl_path, 'a', encoding='utf-8') as out:
+            for record in records:
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                stats.add(record)
+                if progress_every and stats.documents % progress_every == 0:
+                    summary = stats.summary()
+                    print(f"{stats.documents}/{len(pending)} documents, "
+                          f"{summary['docs_per_second']:.1f} docs/s", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    if parquet:
+        # the JSONL file stays: it is the checkpoint of the next run
+        _write_parquet(jsonl_path, output)
+
+    summary = stats.summary()
+    summary['skipped'] = len(done)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="directory of PDFs or resume CSV")
+    parser.add_argument('-o', '--output', required=True, help=".jsonl or .parquet")
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--executor', choices=('process', 'thread'), default='process')
+    parser.add_argument('--chunksize', type=int, default=8)
+    parser.add_argument('--courses', type=int, default=5, help="courses per role, 0 to skip")
+    parser.add_argument('--text-column', default='Resume')
+    parser.add_argument('--id-column')
+    parser.add_argument('--retry-errors', action='store_true',
+                        help="process again the documents whose previous record has an error")
+    parser.add_argument('--stats', help="also write the run statistics to this JSON file")
+    args = parser.parse_args()
+
+    documents = iter_documents(args.input, text_column=args.text_column, id_column=args.id_column)
+    summary = run_batch(documents, args.output, workers=args.workers, executor=args.executor,
+                        courses=args.courses, chunksize=args.chunksize, retry_errors=args.retry_errors)
+
+    print(f"{summary['documents']} documents ({summary['skipped']} already done, "
+          f"{summary['errors']} errors, {summary['invalid']} invalid) in {summary['seconds']:.1f}s, "
+          f"{summary['docs_per_second']:.1f} docs/s")
+    for stage, latency in summary['stages'].items():
+        print(f"  {stage:<11} p50 {latency['p50_ms']:>8.2f} ms   p95 {latency['p95_ms']:>8.2f} ms")
+    if args.stats:
+        with open(args.stats, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
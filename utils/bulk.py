@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import config
+from utils.pipeline import analyze_resume
+
+# Bulk screening in the app: uploaded resumes are queued on a process-wide
+# worker pool and analyzed with the single-resume pipeline. The Streamlit
+# script only reads snapshots of a BulkJob, so reruns never wait on workers.
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_bulk_pool():
+    """Returns the worker pool shared by every session's bulk jobs."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=config.BULK_WORKERS, thread_name_prefix='bulk')
+        return _pool
+
+
+def analyze_row(name, data):
+    """
+    Analyzes one uploaded resume into a results-table row.
+
+    Returns:
+        dict: name, status ('done', 'invalid' or 'error'), role, confidence (%),
+            skill count, skills, predictions, seconds and error.
+    """
+    row = {'name': name, 'status': 'error', 'role': None, 'confidence': None, 'skill_count': 0,
+           'skills': [], 'predictions': [], 'seconds': None, 'error': None}
+    start = time.perf_counter()
+    try:
+        result = analyze_resume(data)
+        if not result.is_valid:
+            row['status'] = 'invalid'
+        else:
+            row['predictions'] = [(str(role), float(score)) for role, score in result.predictions]
+            row['role'], top_score = row['predictions'][0]
+            row['confidence'] = round(top_score * 100, 2)
+            row['skills'] = sorted(result.skills)
+            row['skill_count'] = len(row['skills'])
+            row['status'] = 'done'
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+
+class BulkJob:
+    """
+    Analysis of a batch of uploaded resumes, filled in as workers finish.
+
+    Args:
+        files (Iterable[Tuple[str, bytes]]): (name, PDF content) per resume.
+        pool (Executor): worker pool (default: get_bulk_pool()).
+    """
+
+    def __init__(self, files, pool=None):
+        self.rows = []
+        self.started = time.perf_counter()
+        self.finished = None
+        self._lock = threading.Lock()
+        self._futures = []
+        files = list(files)
+        self.total = len(files)
+        pool = pool or get_bulk_pool()
+        for name, data in files:
+            future = pool.submit(analyze_row, name, data)
+            future.add_done_callback(self._collect)
+            self._futures.append(future)
+        if not files:
+            self.finished = self.started
+
+    def _collect(self, future):
+        if future.cancelled():
+            return
+        with self._lock:
+            self.rows.append(future.result())
+            if len(self.rows) == self.total:
+                self.finished = time.perf_counter()
+
+    def snapshot(self):
+        """Returns a copy of the rows finished so far, in completion order."""
+        with self._lock:
+            return list(self.rows)
+
+    @property
+    def completed(self):
+        return len(self.rows)
+
+    @property
+    def done(self):
+        return self.finished is not None or all(future.done() for future in self._futures)
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def cancel(self):
+        """Drops the resumes not started yet; running ones finish in the background."""
+        for future in self._futures:
+            future.cancel()
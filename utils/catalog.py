@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+from utils.course_index import COURSES_PATH
+from utils.registry import file_digest, refresh_source_info, source_info, source_is_current
+
+# The course catalog is converted once from processed_courses.csv to an
+# uncompressed Arrow IPC file and memory-mapped on load: the columns are
+# read straight from the page cache, zero-copy, and every module of a
+# process (recommender, course page, batch scorer) shares the one table.
+
+CATALOG_PATH = os.path.join("Artifacts", "course_catalog.arrow")
+CATALOG_MANIFEST_PATH = os.path.join("Artifacts", "course_catalog.json")
+# row-number columns pandas wrote into the CSV
+DROP_COLUMNS = ('Unnamed: 0.1', 'Unnamed: 0')
+
+
+class CourseCatalog:
+    """
+    Course rows (title, organization, rating, URL, ...) in CSV order.
+
+    Args:
+        table (pyarrow.Table): the memory-mapped catalog.
+        manifest (dict): source hash and build metadata.
+    """
+
+    def __init__(self, table, manifest):
+        self.table = table
+        self.manifest = manifest
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def columns(self):
+        return self.table.column_names
+
+    def take(self, indices, columns=None):
+        """
+        Gathers rows by position in one vectorized call.
+
+        Args:
+            indices (Sequence[int]): row positions, e.g. a retriever's top-k.
+            columns (Sequence[str]): columns to keep (default: all).
+
+        Returns:
+            pyarrow.Table: the rows, in the order of indices.
+
+        Raises:
+            IndexError: an index is outside the catalog.
+        """
+        import pyarrow as pa
+
+        table = self.table if columns is None else self.table.select(list(columns))
+        try:
+            return table.take(pa.array(indices, type=pa.int64()))
+        except pa.ArrowIndexError as e:
+            raise IndexError(str(e)) from None
+
+    def rows(self, indices, columns=None):
+        """Same as take, as one dict per row; missing values are None."""
+        return self.take(indices, columns).to_pylist()
+
+    def column(self, name, indices=None):
+        """Returns a column (or the rows at indices of it) as a list."""
+        column = self.table.column(name) if indices is None else self.take(indices, [name]).column(0)
+        return column.to_pylist()
+
+
+def build_catalog(csv_path=COURSES_PATH, catalog_path=CATALOG_PATH, manifest_path=CATALOG_MANIFEST_PATH):
+    """
+    Converts the course CSV to the Arrow file and writes its manifest.
+
+    Returns:
+        CourseCatalog: the catalog, memory-mapped from the new file.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    start = time.perf_counter()
+    frame = pd.read_csv(csv_path)
+    frame = frame.drop(columns=[column for column in DROP_COLUMNS if column in frame.columns])
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    manifest = source_info(csv_path)
+    manifest.update({
+        'sha256': file_digest(csv_path),
+        'courses': table.num_rows,
+        'columns': table.column_names,
+        'build_seconds': round(time.perf_counter() - start, 3),
+    })
+
+    for path in (catalog_path, manifest_path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # a new inode: processes that still map the previous file keep reading it unchanged
+    with pa.OSFile(catalog_path + '.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(catalog_path + '.tmp', catalog_path)
+    # the manifest goes last so a half-written catalog is never picked up
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return CourseCatalog(_map_table(catalog_path), manifest)
+
+
+def _map_table(catalog_path):
+    import pyarrow as pa
+
+    with pa.memory_map(catalog_path, 'r') as source:
+        # the table's buffers point into the map, which stays open as long as they are referenced
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_catalog(csv_path=COURSES_PATH, catalog_path=CATALOG_PATH,
+                 manifest_path=CATALOG_MANIFEST_PATH, rebuild=True):
+    """
+    Memory-maps the catalog, converting the CSV again when it changed.
+
+    Args:
+        rebuild (bool): when False a missing or stale catalog raises instead of being rebuilt.
+
+    Returns:
+        CourseCatalog: the loaded catalog.
+    """
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if not os.path.exists(csv_path) or source_is_current(manifest, csv_path):
+            return CourseCatalog(_map_table(catalog_path), manifest)
+        reason = f"{csv_path} changed since the catalog was built"
+    except FileNotFoundError as e:
+        reason = f"missing {e.filename}"
+
+    if not rebuild:
+        raise FileNotFoundError(f"course catalog is not usable ({reason}); run python -m utils.catalog")
+    return build_catalog(csv_path, catalog_path, manifest_path)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Returns the process-wide course catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts the course CSV to the memory-mapped Arrow catalog.")
+    parser.add_argument('--csv', default=COURSES_PATH)
+    parser.add_argument('--force', action='store_true', help="convert even if the CSV did not change")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.force:
+        catalog = build_catalog(args.csv)
+    else:
+        catalog = load_catalog(args.csv)
+        # a touched but unchanged CSV: record its mtime so loads stop hashing it
+        refresh_source_info(catalog.manifest, args.csv, CATALOG_MANIFEST_PATH)
+    manifest = catalog.manifest
+    print(f"{manifest['courses']} courses x {len(manifest['columns'])} columns "
+          f"({os.path.getsize(CATALOG_PATH) / 1e6:.2f} MB, sha256 {manifest['sha256'][:12]}) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
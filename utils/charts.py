@@ -0,0 +1,69 @@
+import io
+from functools import lru_cache
+
+# Prediction charts are pure functions of (labels, scores), so a rerun with
+# the same predictions reuses the rendered chart. Matplotlib figures are built
+# with matplotlib.figure.Figure rather than pyplot: they are not registered in
+# pyplot's global figure manager and are freed as soon as they go out of scope.
+
+COLORS = ['#2E86C1', '#5DADE2', '#85C1E9', '#AED6F1', '#D6EAF8']
+CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def prediction_chart_png(labels, scores, dpi=100):
+    """
+    Renders the horizontal confidence bar chart of the predicted roles.
+
+    Args:
+        labels (Tuple[str]): roles, best first.
+        scores (Tuple[float]): confidence in percent, same order.
+        dpi (int): resolution of the PNG.
+
+    Returns:
+        bytes: PNG image.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    bars = ax.barh(labels[::-1], scores[::-1], color=COLORS)
+    ax.set_xlabel("Confidence (%)")
+    ax.set_xlim(0, 100)
+    ax.set_title("Job Role Predictions", fontsize=16, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    for bar, score in zip(bars, scores[::-1]):
+        ax.text(score + 1, bar.get_y() + bar.get_height() / 2,
+                f"{score}%", va='center', fontsize=10, fontweight='bold')
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    fig.clear()
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def prediction_chart_plotly(labels, scores):
+    """
+    Builds the same chart as a Plotly figure, drawn by the browser.
+
+    Returns:
+        plotly.graph_objects.Figure: treat as read-only, it is shared between reruns.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        x=scores[::-1], y=labels[::-1], orientation='h',
+        marker_color=[COLORS[i % len(COLORS)] for i in range(len(labels))],
+        text=[f"{score}%" for score in scores[::-1]], textposition='outside'))
+    fig.update_layout(title="Job Role Predictions", xaxis_title="Confidence (%)",
+                      xaxis_range=[0, 100], height=450, margin=dict(l=10, r=10, t=50, b=40))
+    return fig
+
+
+def cache_info():
+    return {'png': prediction_chart_png.cache_info(), 'plotly': prediction_chart_plotly.cache_info()}
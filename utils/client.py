@@ -0,0 +1,64 @@
+import json
+import urllib.error
+import urllib.request
+
+
+class ServiceError(RuntimeError):
+    """Raised when the inference service answers with an error status."""
+
+
+class ServiceClient:
+    """
+    Minimal client of the utils.service HTTP API, standard library only.
+
+    Args:
+        base_url (str): e.g. http://127.0.0.1:8000
+        timeout (float): seconds per request.
+    """
+
+    def __init__(self, base_url, timeout=30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, body=None, content_type='application/json'):
+        request = urllib.request.Request(self.base_url + path, data=body,
+                                         headers={'Content-Type': content_type} if body is not None else {})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise ServiceError(f"{path} returned {e.code}: {e.read().decode('utf-8', 'replace')}") from e
+
+    def score_text(self, text):
+        return self._request('/score', json.dumps({'text': text}).encode('utf-8'))
+
+    def score_texts(self, texts):
+        return self._request('/score', json.dumps({'texts': list(texts)}).encode('utf-8'))['results']
+
+    def score_pdf(self, data):
+        return self._request('/score', bytes(data), content_type='application/pdf')
+
+    def predict(self, text):
+        """Returns [(role, score), ...] like predict_processed, or None for an empty text."""
+        predictions = self.score_text(text)['predictions']
+        return None if predictions is None else [(p['role'], p['score']) for p in predictions]
+
+    def analyze(self, text):
+        """
+        Scores a text once and returns what the app shows: (predictions, skills).
+
+        predictions is [(role, score), ...] like predict_processed and skills the
+        service's matches; both are None for an empty text.
+        """
+        result = self.score_text(text)
+        predictions = result['predictions']
+        return (None if predictions is None else [(p['role'], p['score']) for p in predictions]), result['skills']
+
+    def health(self):
+        return self._request('/healthz')
+
+    def ready(self):
+        try:
+            return self._request('/readyz')['ready']
+        except (ServiceError, OSError):
+            return False
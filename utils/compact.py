@@ -0,0 +1,449 @@
+"""
+Exports the fitted vectorizer, classifier and label encoder to a compact,
+memory-mappable format, and loads them back as drop-in replacements.
+
+    python -m utils.compact export                  # live version -> <version>/compact/
+    python -m utils.compact check --csv UpdatedResumeDataSet.csv
+
+The live version is the one Artifacts/model_manifest.json points at: its
+compact artifacts go to its directory and are added to the manifest, which
+is replaced in one step. Without a manifest, Artifacts/*.pkl are exported
+to Artifacts/compact/.
+
+Each artifact is a small JSON header next to the .npy arrays it references:
+
+    preprocessor.json   vocabulary.npy (sorted fixed-width UTF-8 terms), idf.npy for TF-IDF
+    model.json          coef_t.npy (n_features x n_classes), intercept.npy
+    decoder.json        classes.npy
+
+The arrays are opened with np.load(mmap_mode='r'), so every worker process
+maps the same page-cache pages instead of unpickling its own copy of a dict
+with one Python string per n-gram. Terms are looked up with a vectorized
+binary search (np.searchsorted) over the sorted vocabulary. The loaded
+objects reproduce CountVectorizer/TfidfVectorizer.transform,
+LogisticRegression.predict_proba and LabelEncoder.inverse_transform with
+the same floating point operations in the same order, so predictions are
+bit-for-bit those of the pickles; `check` verifies that on a dataset.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+
+import numpy as np
+
+from utils.registry import file_digest
+
+FORMAT_VERSION = 1
+COMPACT_DIR = os.path.join('Artifacts', 'compact')
+COMPACT_PATHS = {name: os.path.join(COMPACT_DIR, f"{name}.json") for name in ('preprocessor', 'model', 'decoder')}
+
+
+def _strip_accents_ascii(s):
+    nkfd_form = unicodedata.normalize('NFKD', s)
+    return nkfd_form.encode('ASCII', 'ignore').decode('ASCII')
+
+
+def _strip_accents_unicode(s):
+    try:
+        s.encode('ASCII', errors='strict')
+        return s
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize('NFKD', s)
+        return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+
+_ACCENTS = {None: None, 'ascii': _strip_accents_ascii, 'unicode': _strip_accents_unicode}
+
+
+class CompactVectorizer:
+    """
+    Word n-gram counts (optionally TF-IDF weighted) over a memory-mapped, sorted vocabulary.
+
+    Args:
+        params (dict): analyzer settings from the JSON header.
+        vocabulary (np.ndarray): sorted fixed-width bytes array of UTF-8 encoded terms.
+        columns (np.ndarray): feature column of each vocabulary entry, None when it is its position.
+        idf (np.ndarray): per-feature idf weights for TF-IDF, None for raw counts.
+    """
+
+    def __init__(self, params, vocabulary, columns=None, idf=None):
+        self.params = params
+        self.vocabulary = vocabulary
+        self.columns = columns
+        self.idf_ = idf
+        self.dtype = np.dtype(params['dtype'])
+        self.ngram_range = tuple(params['ngram_range'])
+        self.stop_words = frozenset(params['stop_words']) if params['stop_words'] is not None else None
+        self._width = vocabulary.dtype.itemsize
+        self._token_pattern = re.compile(params['token_pattern'])
+        if self._token_pattern.groups > 1:
+            raise ValueError("More than 1 capturing group in token pattern. Only a single group should be captured.")
+        self._accents = _ACCENTS[params['strip_accents']]
+
+    @property
+    def n_features(self):
+        return len(self.vocabulary)
+
+    def _word_ngrams(self, tokens):
+        if self.stop_words is not None:
+            tokens = [w for w in tokens if w not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        if max_n != 1:
+            original_tokens = tokens
+            if min_n == 1:
+                tokens = list(original_tokens)
+                min_n += 1
+            else:
+                tokens = []
+            n_original_tokens = len(original_tokens)
+            for n in range(min_n, min(max_n + 1, n_original_tokens + 1)):
+                for i in range(n_original_tokens - n + 1):
+                    tokens.append(' '.join(original_tokens[i: i + n]))
+        return tokens
+
+    def analyze(self, doc):
+        """Splits one document into the terms CountVectorizer.build_analyzer() would produce."""
+        if isinstance(doc, bytes):
+            doc = doc.decode(self.params['encoding'], self.params['decode_error'])
+        if self.params['lowercase']:
+            doc = doc.lower()
+        if self._accents is not None:
+            doc = self._accents(doc)
+        return self._word_ngrams(self._token_pattern.findall(doc))
+
+    def _lookup(self, terms):
+        """Feature columns of the terms found in the vocabulary, in order."""
+        encoded = [term.encode('utf-8') for term in terms]
+        # longer than every vocabulary entry: cannot match, and would be truncated by the cast
+        encoded = np.array([term for term in encoded if len(term) <= self._width], dtype=self.vocabulary.dtype)
+        if not len(encoded):
+            return np.empty(0, dtype=np.intp)
+        positions = np.searchsorted(self.vocabulary, encoded)
+        found = positions < len(self.vocabulary)
+        found[found] = self.vocabulary[positions[found]] == encoded[found]
+        positions = positions[found]
+        return positions if self.columns is None else self.columns[positions]
+
+    def transform(self, raw_documents):
+        """
+        Args:
+            raw_documents (Iterable[str]): preprocessed resume texts.
+
+        Returns:
+            scipy.sparse.csr_matrix: (n_documents, n_features), the vectorizer's dtype.
+        """
+        import scipy.sparse as sp
+
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+
+        indices, values, indptr = [], [], [0]
+        for doc in raw_documents:
+            columns, counts = np.unique(self._lookup(self.analyze(doc)), return_counts=True)
+            indices.append(columns)
+            values.append(counts)
+            indptr.append(indptr[-1] + len(columns))
+
+        indices = np.concatenate(indices).astype(np.int32) if indices else np.empty(0, dtype=np.int32)
+        values = np.concatenate(values) if values else np.empty(0, dtype=np.intp)
+        if self.params['binary']:
+            values = np.ones_like(values)
+        X = sp.csr_matrix((values.astype(self.dtype), indices, np.asarray(indptr, dtype=np.int32)),
+                          shape=(len(indptr) - 1, self.n_features))
+        if self.params['tfidf']:
+            X = self._tfidf(X)
+        return X
+
+    def _tfidf(self, X):
+        X = X.astype(np.float64)
+        if self.params['sublinear_tf']:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.idf_ is not None:
+            X.data *= self.idf_[X.indices]
+        norm = self.params['norm']
+        if norm is not None:
+            from sklearn.preprocessing import normalize
+            X = normalize(X, norm=norm, copy=False)
+        return X
+
+
+class CompactLinearModel:
+    """
+    Class probabilities of a linear classifier from its coefficient matrix.
+
+    Args:
+        coef_t (np.ndarray): (n_features, n_classes) transposed coefficients, C-contiguous so
+            the sparse product reads the memory map directly.
+        intercept (np.ndarray): (n_classes,) or (1,) for a binary model.
+        link (str): 'softmax' (multinomial) or 'logistic' (binary, one column of coefficients).
+    """
+
+    def __init__(self, coef_t, intercept, link):
+        if link not in ('softmax', 'logistic'):
+            raise ValueError(f"Unknown link {link!r}")
+        self.coef_t = coef_t
+        self.intercept_ = intercept
+        self.link = link
+        self.classes_ = np.arange(2 if link == 'logistic' else coef_t.shape[1])
+
+    def decision_function(self, X):
+        scores = X @ self.coef_t + self.intercept_
+        return scores.reshape(-1) if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, X):
+        scores = self.decision_function(X)
+        if self.link == 'logistic':
+            from scipy.special import expit
+            prob = expit(scores)
+            return np.stack([1 - prob, prob], axis=1)
+        # same steps as sklearn.utils.extmath.softmax
+        scores -= np.max(scores, axis=1).reshape((-1, 1))
+        np.exp(scores, out=scores)
+        scores /= np.sum(scores, axis=1).reshape((-1, 1))
+        return scores
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class CompactLabels:
+    """The LabelEncoder's classes_ array with inverse_transform and transform."""
+
+    def __init__(self, classes):
+        self.classes_ = classes
+        self._index = {label: i for i, label in enumerate(classes.tolist())}
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y)]
+
+    def transform(self, labels):
+        return np.array([self._index[label] for label in labels], dtype=np.intp)
+
+
+def _vectorizer_header(vec):
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+    if not isinstance(vec, CountVectorizer):
+        raise ValueError(f"Cannot export {type(vec).__name__}: expected a CountVectorizer or TfidfVectorizer")
+    if vec.analyzer != 'word' or vec.tokenizer is not None or vec.preprocessor is not None:
+        raise ValueError("Only the built-in word analyzer can be exported (no custom analyzer, tokenizer or preprocessor)")
+    if vec.input != 'content':
+        raise ValueError(f"Only input='content' can be exported, not {vec.input!r}")
+    if vec.strip_accents not in _ACCENTS:
+        raise ValueError(f"Only strip_accents None, 'ascii' or 'unicode' can be exported, not {vec.strip_accents!r}")
+
+    stop_words = vec.get_stop_words()
+    header = {
+        'lowercase': vec.lowercase, 'token_pattern': vec.token_pattern, 'ngram_range': list(vec.ngram_range),
+        'strip_accents': vec.strip_accents, 'stop_words': sorted(stop_words) if stop_words is not None else None,
+        'binary': vec.binary, 'dtype': np.dtype(vec.dtype).name,
+        'encoding': vec.encoding, 'decode_error': vec.decode_error,
+        'tfidf': isinstance(vec, TfidfVectorizer),
+    }
+    if header['tfidf']:
+        header.update(norm=vec.norm, use_idf=vec.use_idf, sublinear_tf=vec.sublinear_tf)
+    return header
+
+
+def _model_arrays(model):
+    from sklearn.linear_model import LogisticRegression
+
+    if not isinstance(model, LogisticRegression):
+        raise ValueError(f"Cannot export {type(model).__name__}: only LogisticRegression has a compact form "
+                         "(its probabilities are a function of the coefficient matrix alone)")
+    coef, intercept = np.asarray(model.coef_, dtype=np.float64), np.asarray(model.intercept_, dtype=np.float64)
+    link = 'logistic' if len(model.classes_) <= 2 else 'softmax'
+    return np.ascontiguousarray(coef.T), intercept, link
+
+
+def _save_array(directory, name, array):
+    path = os.path.join(directory, f"{name}.npy")
+    # a new inode: processes that still map the previous file keep reading it unchanged
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(path + '.tmp', path)
+    return {'file': f"{name}.npy", 'sha256': file_digest(path)}
+
+
+def _save_header(path, header):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(header, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def export_compact(vectorizer, model, decoder, directory=COMPACT_DIR, sources=None):
+    """
+    Writes the compact form of the three artifacts to directory.
+
+    Args:
+        vectorizer: fitted CountVectorizer or TfidfVectorizer.
+        model: fitted LogisticRegression.
+        decoder: fitted LabelEncoder.
+        directory (str): output directory, created if needed.
+        sources (dict): artifact name -> sha256 of the pickle it came from, recorded in the headers.
+
+    Returns:
+        dict: artifact name -> path of its JSON header.
+
+    Raises:
+        ValueError: an artifact has no compact form (e.g. a KNN or random forest model).
+    """
+    params = _vectorizer_header(vectorizer)
+    coef_t, intercept, link = _model_arrays(model)
+    if coef_t.shape[0] != len(vectorizer.vocabulary_):
+        raise ValueError(f"Model expects {coef_t.shape[0]} features, vectorizer has {len(vectorizer.vocabulary_)}")
+
+    os.makedirs(directory, exist_ok=True)
+    sources = sources or {}
+
+    terms = sorted(vectorizer.vocabulary_, key=lambda term: term.encode('utf-8'))
+    encoded = [term.encode('utf-8') for term in terms]
+    columns = np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int32)
+    arrays = {'vocabulary': _save_array(directory, 'vocabulary',
+                                        np.array(encoded, dtype=f"S{max(map(len, encoded), default=1)}"))}
+    # sklearn numbers features in sorted order, so the column array is usually the identity
+    if not np.array_equal(columns, np.arange(len(columns))):
+        arrays['columns'] = _save_array(directory, 'columns', columns)
+    if params['tfidf'] and vectorizer.use_idf:
+        arrays['idf'] = _save_array(directory, 'idf', np.asarray(vectorizer.idf_, dtype=np.float64))
+
+    headers = {
+        'preprocessor': {'kind': 'vectorizer', 'params': params, 'arrays': arrays},
+        'model': {'kind': 'linear', 'link': link, 'arrays': {
+            'coef_t': _save_array(directory, 'coef_t', coef_t),
+            'intercept': _save_array(directory, 'intercept', intercept)}},
+        'decoder': {'kind': 'labels', 'arrays': {
+            'classes': _save_array(directory, 'classes', np.asarray(decoder.classes_).astype(str))}},
+    }
+    paths = {}
+    # headers last: the registry reloads an artifact when its header changes
+    for name, header in headers.items():
+        paths[name] = os.path.join(directory, f"{name}.json")
+        _save_header(paths[name], {'format': FORMAT_VERSION, **header, 'source_sha256': sources.get(name)})
+    return paths
+
+
+def _load_array(directory, entry, verify):
+    path = os.path.join(directory, entry['file'])
+    if verify and file_digest(path) != entry['sha256']:
+        raise ValueError(f"{path} does not match its header; export again")
+    return np.load(path, mmap_mode='r', allow_pickle=False)
+
+
+def load_compact(path, verify=True):
+    """
+    Loads one artifact from its JSON header; usable as a ModelRegistry loader.
+
+    Args:
+        path (str): preprocessor.json, model.json or decoder.json.
+        verify (bool): check the sha256 of every array file against the header.
+
+    Returns:
+        CompactVectorizer, CompactLinearModel or CompactLabels.
+    """
+    with open(path) as f:
+        header = json.load(f)
+    if header.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported compact format {header.get('format')!r}")
+    directory = os.path.dirname(path)
+    arrays = {name: _load_array(directory, entry, verify) for name, entry in header['arrays'].items()}
+
+    if header['kind'] == 'vectorizer':
+        return CompactVectorizer(header['params'], arrays['vocabulary'], arrays.get('columns'), arrays.get('idf'))
+    if header['kind'] == 'linear':
+        return CompactLinearModel(arrays['coef_t'], arrays['intercept'], header['link'])
+    if header['kind'] == 'labels':
+        # a few dozen labels: an object array in memory, so labels come out as plain str like the pickle's
+        return CompactLabels(np.array(arrays['classes'].tolist(), dtype=object))
+    raise ValueError(f"{path}: unknown artifact kind {header['kind']!r}")
+
+
+def check_parity(texts, pickled, compact):
+    """
+    Compares the pickled and compact artifacts on texts.
+
+    Args:
+        texts (List[str]): preprocessed resume texts.
+        pickled, compact (dict): 'preprocessor', 'model', 'decoder' -> loaded artifact.
+
+    Returns:
+        dict: rows compared, and per output whether it is identical bit for bit.
+    """
+    X_pickled = pickled['preprocessor'].transform(texts)
+    X_compact = compact['preprocessor'].transform(texts)
+    same_features = (X_pickled.shape == X_compact.shape and X_pickled.dtype == X_compact.dtype
+                     and np.array_equal(X_pickled.indptr, X_compact.indptr)
+                     and np.array_equal(X_pickled.indices, X_compact.indices)
+                     and X_pickled.data.tobytes() == X_compact.data.tobytes())
+
+    probs_pickled = pickled['model'].predict_proba(X_pickled)
+    probs_compact = compact['model'].predict_proba(X_compact)
+    same_probs = probs_pickled.dtype == probs_compact.dtype and probs_pickled.tobytes() == probs_compact.tobytes()
+
+    order = np.argsort(probs_pickled, axis=1)[:, ::-1]
+    labels_pickled = pickled['decoder'].inverse_transform(order.ravel())
+    labels_compact = compact['decoder'].inverse_transform(order.ravel())
+    return {
+        'rows': len(texts),
+        'features': same_features,
+        'probabilities': same_probs,
+        'max_abs_difference': float(np.max(np.abs(probs_pickled - probs_compact))) if len(texts) else 0.0,
+        'labels': list(labels_pickled) == list(labels_compact),
+    }
+
+
+def main():
+    from utils import DECODEER_PATH, MANIFEST_PATH, MODEL_PATH, PREPROCESSOR_PATH, load_obj
+    from utils.registry import manifest_paths
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('export', 'check'))
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv', help="resumes to compare predictions on (check)")
+    args = parser.parse_args()
+
+    if os.path.exists(MANIFEST_PATH):
+        manifest, pickle_paths = manifest_paths(MANIFEST_PATH)
+        version_dir = os.path.dirname(pickle_paths['model'])
+    else:
+        manifest, version_dir = None, None
+        pickle_paths = {'preprocessor': PREPROCESSOR_PATH, 'model': MODEL_PATH, 'decoder': DECODEER_PATH}
+
+    pickled = {name: load_obj(path) for name, path in pickle_paths.items()}
+    if args.command == 'export':
+        try:
+            if manifest is None:
+                sources = {name: file_digest(path) for name, path in pickle_paths.items()}
+                paths = export_compact(pickled['preprocessor'], pickled['model'], pickled['decoder'],
+                                       COMPACT_DIR, sources)
+            else:
+                from utils.train import publish, write_compact
+                with open(os.path.join(version_dir, 'manifest.json')) as f:
+                    version = json.load(f)
+                write_compact(pickled['preprocessor'], pickled['model'], pickled['decoder'], version, version_dir)
+                publish(version_dir)
+                _, paths = manifest_paths(MANIFEST_PATH, 'compact')
+        except ValueError as e:
+            sys.exit(f"export failed: {e}")
+        for name, path in paths.items():
+            with open(path) as f:
+                files = [entry['file'] for entry in json.load(f)['arrays'].values()]
+            size = sum(os.path.getsize(os.path.join(os.path.dirname(path), file)) for file in files)
+            print(f"{name:<13} {path}  ({size / 1e6:.2f} MB of arrays, pickle {os.path.getsize(pickle_paths[name]) / 1e6:.2f} MB)")
+        return
+
+    from utils.train import load_corpus
+    texts, _, _ = load_corpus(args.csv)
+    paths = COMPACT_PATHS if manifest is None else manifest_paths(MANIFEST_PATH, 'compact')[1]
+    compact = {name: load_compact(paths[name]) for name in pickle_paths}
+    result = check_parity(texts, pickled, compact)
+    print(json.dumps(result, indent=2))
+    if not (result['features'] and result['probabilities'] and result['labels']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
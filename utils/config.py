@@ -0,0 +1,80 @@
+import os
+
+# Runtime settings, overridable through environment variables.
+
+
+def _int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value not in (None, '') else default
+
+
+def _bool(name, default):
+    value = os.environ.get(name)
+    return value.lower() in ('1', 'true', 'yes', 'on') if value not in (None, '') else default
+
+
+# PDF text extraction: 'auto', 'pymupdf', 'pypdf' or 'text'
+PDF_BACKEND = os.environ.get('RESUME_PDF_BACKEND', 'auto')
+# 0 extracts pages in the calling thread
+PDF_WORKERS = _int('RESUME_PDF_WORKERS', 0)
+# 'thread' or 'process'; pymupdf is not thread-safe and always uses 'process'
+PDF_EXECUTOR = os.environ.get('RESUME_PDF_EXECUTOR', 'thread')
+# seconds per page (and for opening the file), None disables the timeout
+PDF_PAGE_TIMEOUT = _float('RESUME_PDF_PAGE_TIMEOUT', None)
+
+# skill extraction: 'spacy' (PhraseMatcher) or 'compiled' (dependency-free Aho-Corasick)
+SKILL_MATCHER = os.environ.get('RESUME_SKILL_MATCHER', 'spacy')
+
+# course page: recommend each course under one predicted role only
+COURSE_DEDUPE = _bool('RESUME_COURSE_DEDUPE', False)
+# course retrieval: 'exact' (sparse cosine over every course) or 'ann' (inverted-file index over
+# SVD-reduced vectors, built with python -m utils.course_index --ann)
+COURSE_RETRIEVAL = os.environ.get('RESUME_COURSE_RETRIEVAL', 'exact')
+COURSE_ANN_DIM = _int('RESUME_COURSE_ANN_DIM', 256)
+# 0 picks about 4 * sqrt(courses)
+COURSE_ANN_LISTS = _int('RESUME_COURSE_ANN_LISTS', 0)
+# lists scanned per query, and candidates scored exactly as a multiple of k (0: every probed course)
+COURSE_ANN_NPROBE = _int('RESUME_COURSE_ANN_NPROBE', 64)
+COURSE_ANN_REFINE = _int('RESUME_COURSE_ANN_REFINE', 0)
+
+# inference service (python -m utils.service)
+SERVICE_MAX_BATCH = _int('RESUME_SERVICE_MAX_BATCH', 32)
+SERVICE_MAX_WAIT_MS = _float('RESUME_SERVICE_MAX_WAIT_MS', 5.0)
+SERVICE_MAX_BODY = _int('RESUME_SERVICE_MAX_BODY', 20 * 1024 * 1024)
+# when set, the Streamlit pipeline classifies through this service instead of in-process
+SERVICE_URL = os.environ.get('RESUME_SERVICE_URL') or None
+
+# analysis pipeline: skill matching runs alongside preprocess -> classify
+PIPELINE_THREADS = _int('RESUME_PIPELINE_THREADS', 4)
+# where NLTK preprocessing runs: 'thread', 'process' or 'auto' (process pool on multi-core hosts)
+PIPELINE_NLP_EXECUTOR = os.environ.get('RESUME_PIPELINE_NLP_EXECUTOR', 'auto')
+PIPELINE_PROCESSES = _int('RESUME_PIPELINE_PROCESSES', 2)
+
+# course page session persistence: 'sqlite', 'memory' or 'redis'
+SESSION_STORE = os.environ.get('RESUME_SESSION_STORE', 'sqlite')
+SESSION_TIMEOUT = _float('SESSION_TIMEOUT', 3600)
+TEMP_DIR = os.environ.get('TEMP_DIR', 'temp_data')
+# seconds between background purges of expired sessions
+SESSION_SWEEP_INTERVAL = _float('RESUME_SESSION_SWEEP_INTERVAL', 300)
+SESSION_REDIS_URL = os.environ.get('RESUME_SESSION_REDIS_URL', 'redis://localhost:6379/0')
+
+# bulk screening in the app: resumes analyzed at once, across all sessions
+BULK_WORKERS = _int('RESUME_BULK_WORKERS', 4)
+BULK_MAX_FILES = _int('RESUME_BULK_MAX_FILES', 500)
+
+# prediction chart: 'matplotlib' (cached PNG) or 'plotly' (drawn in the browser)
+CHART_BACKEND = os.environ.get('RESUME_CHART_BACKEND', 'matplotlib')
+
+# skill taxonomy file (.json or .yaml): roles, their skills and skill aliases
+SKILL_TAXONOMY = os.environ.get('RESUME_SKILL_TAXONOMY', os.path.join('Artifacts', 'skills_taxonomy.json'))
+# seconds between checks of the taxonomy file for changes, 0 disables reloading
+TAXONOMY_POLL_SECONDS = _float('RESUME_TAXONOMY_POLL_SECONDS', 5.0)
+
+# classifier artifacts: 'pickle' (Artifacts/*.pkl) or 'compact' (memory-mapped arrays in
+# Artifacts/compact/, written by python -m utils.compact export)
+MODEL_FORMAT = os.environ.get('RESUME_MODEL_FORMAT', 'pickle')
@@ -1,60 +1,77 @@
-import pandas as pd
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-
-import nltk
-nltk.download('stopwords')
-nltk.download('punkt')
-
-from nltk.corpus import stopwords
-stop = stopwords.words('english')
-from nltk.tokenize import word_tokenize
-from nltk.stem.wordnet import WordNetLemmatizer
-lematizer = WordNetLemmatizer()
-
 
+import threading
 
-data = pd.read_csv('processed_courses.csv')
-df = data['Description']
-df = np.array(df)
+import numpy as np
 
-corpus = []
-for sent in df:
-    sentance = sent.lower()
-    lemmas = [lematizer.lemmatize(word) for word  in word_tokenize(sentance) if word.isalpha() and word not in stop]
-    filtered = ' '.join(lemmas)
-    corpus.append(filtered)
+from utils.course_index import get_index
 
-desc_tfidf = TfidfVectorizer(ngram_range=(1,2))
-desc_vectors = desc_tfidf.fit_transform(corpus)
+# the description TF-IDF is fitted offline (python -m utils.course_index) and
+# loaded from Artifacts on first use instead of being refitted on import
 
+_retriever = None
+_retriever_lock = threading.Lock()
 
 
+def get_retriever():
+    """Returns the process-wide course retriever, built on first use."""
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                from utils import config
+                if config.COURSE_RETRIEVAL == 'ann':
+                    from utils.course_index import load_ann
+                    _retriever = load_ann(get_index())
+                else:
+                    from utils.retrieval import CourseRetriever
+                    _retriever = CourseRetriever(get_index().vectors)
+    return _retriever
 
 
 def vectors(inp):
-    return desc_tfidf.transform(inp)
+    return get_index().transform(inp)
 
-def get_course_recomend(missing_skills):
+def get_course_recomend(missing_skills, k=5, min_score=None):
     missing_skills  = [', '.join(missing_skills)]
     text_vect = vectors(missing_skills)
-    similar = cosine_similarity(desc_vectors,text_vect).flatten()
-    top5 = similar.argsort()[::-1][:5]
-    return top5
-
-## will return indices corresponding to courses from the dataframe:
-
-course_data = pd.read_csv('processed_courses.csv')
-course_data = course_data.drop(columns=['Unnamed: 0.1','Unnamed: 0'],axis=1)   
+    top_k, _ = get_retriever().search(text_vect, k=k, min_score=min_score)[0]
+    return top_k
+
+def get_course_recomend_batch(missing_skill_lists, k=5, min_score=None, dedupe=False):
+    """
+    Recommends courses for several roles with one transform and one sparse product.
+
+    Args:
+        missing_skill_lists (List[List[str]]): missing skills of each role.
+        k (int): courses per role.
+        min_score (float): minimum cosine score, None keeps k courses per role.
+        dedupe (bool): when True a course is only recommended to the first role
+            (in input order) that ranks it, and later roles get their next best.
+
+    Returns:
+        List[np.ndarray]: course indices per role, best first.
+    """
+    if not missing_skill_lists:
+        return []
+    text_vect = vectors([', '.join(skills) for skills in missing_skill_lists])
+    depth = k * len(missing_skill_lists) if dedupe else k
+    results = get_retriever().search(text_vect, k=depth, min_score=min_score)
+    if not dedupe:
+        return [indices for indices, _ in results]
+
+    seen = set()
+    recommendations = []
+    for indices, _ in results:
+        kept = [i for i in indices.tolist() if i not in seen][:k]
+        seen.update(kept)
+        recommendations.append(np.asarray(kept, dtype=indices.dtype))
+    return recommendations
+
+## will return indices corresponding to courses from the catalog:
 
 def get_course_data(indices):
-    details= []
-    for i in range(len(indices)):
-        data = course_data.iloc[indices[i],:].to_dict()
-        details.append(data)
-    return details
+    """Returns one dict per course index, gathered from the shared memory-mapped catalog."""
+    from utils.catalog import get_catalog
+    return get_catalog().rows(indices)
 
 ## will return a list of dictionaries
-
-    
\ No newline at end of file
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+
+from utils.registry import file_digest, refresh_source_info, source_info, source_is_current
+from utils.resources import ensure_nltk_data
+
+COURSES_PATH = 'processed_courses.csv'
+VECTORIZER_PATH = os.path.join("Artifacts", "vec.pkl")
+VECTORS_PATH = os.path.join("Artifacts", "course_vectors.npz")
+MANIFEST_PATH = os.path.join("Artifacts", "course_index.json")
+ANN_PATH = os.path.join("Artifacts", "course_ann.npz")
+
+
+class CourseIndex:
+    """
+    Fitted description vectorizer plus the L2-normalized course matrix.
+
+    Args:
+        vectorizer (TfidfVectorizer): fitted on the processed course descriptions.
+        vectors (scipy.sparse.csc_matrix): one normalized row per course, in CSV order;
+            CSC so CourseRetriever searches the same arrays without a transposed copy.
+        manifest (dict): source hash and build metadata.
+    """
+
+    def __init__(self, vectorizer, vectors, manifest):
+        self.vectorizer = vectorizer
+        self.vectors = vectors
+        self.manifest = manifest
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+
+def preprocess_descriptions(descriptions):
+    """Lowercases, tokenizes, drops stopwords and lemmatizes, as the course notebook does."""
+    ensure_nltk_data(('stopwords', 'wordnet', 'punkt_tab'))
+    from nltk.corpus import stopwords
+    from nltk.tokenize import word_tokenize
+    from nltk.stem.wordnet import WordNetLemmatizer
+
+    stop = set(stopwords.words('english'))
+    lematizer = WordNetLemmatizer()
+    corpus = []
+    for sent in descriptions:
+        sentance = sent.lower()
+        lemmas = [lematizer.lemmatize(word) for word in word_tokenize(sentance) if word.isalpha() and word not in stop]
+        corpus.append(' '.join(lemmas))
+    return corpus
+
+
+def build_index(csv_path=COURSES_PATH, vectorizer_path=VECTORIZER_PATH,
+                vectors_path=VECTORS_PATH, manifest_path=MANIFEST_PATH):
+    """
+    Fits the description TF-IDF and writes the vectorizer, matrix and manifest.
+
+    Returns:
+        CourseIndex: the freshly built index.
+    """
+    import numpy as np
+    import pandas as pd
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    start = time.perf_counter()
+    descriptions = np.array(pd.read_csv(csv_path)['Description'])
+    corpus = preprocess_descriptions(descriptions)
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    vectors = normalize(vectorizer.fit_transform(corpus), norm='l2', copy=False).tocsc()
+
+    manifest = source_info(csv_path)
+    manifest.update({
+        'sha256': file_digest(csv_path),
+        'courses': vectors.shape[0],
+        'features': vectors.shape[1],
+        'build_seconds': round(time.perf_counter() - start, 3),
+    })
+
+    for path in (vectorizer_path, vectors_path, manifest_path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # each file is replaced whole, so a crash never leaves a truncated one; the
+    # manifest goes last so a half-written index is never picked up
+    with open(vectorizer_path + '.tmp', 'wb') as f:
+        pickle.dump(vectorizer, f)
+    os.replace(vectorizer_path + '.tmp', vectorizer_path)
+    with open(vectors_path + '.tmp', 'wb') as f:
+        sp.save_npz(f, vectors, compressed=False)
+    os.replace(vectors_path + '.tmp', vectors_path)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return CourseIndex(vectorizer, vectors, manifest)
+
+
+def load_index(csv_path=COURSES_PATH, vectorizer_path=VECTORIZER_PATH,
+               vectors_path=VECTORS_PATH, manifest_path=MANIFEST_PATH, rebuild=True):
+    """
+    Loads the persisted course index, rebuilding it when the CSV changed.
+
+    Args:
+        rebuild (bool): when False a missing or stale index raises instead of being rebuilt.
+
+    Returns:
+        CourseIndex: the loaded index.
+    """
+    import scipy.sparse as sp
+
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if not os.path.exists(csv_path) or source_is_current(manifest, csv_path):
+            with open(vectorizer_path, 'rb') as f:
+                vectorizer = pickle.load(f)
+            # indexes written as CSR by earlier versions are converted once here
+            return CourseIndex(vectorizer, sp.load_npz(vectors_path).tocsc(), manifest)
+        reason = f"{csv_path} changed since the index was built"
+    except FileNotFoundError as e:
+        reason = f"missing {e.filename}"
+
+    if not rebuild:
+        raise FileNotFoundError(f"course index is not usable ({reason}); run python -m utils.course_index")
+    return build_index(csv_path, vectorizer_path, vectors_path, manifest_path)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Returns the process-wide course index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_index()
+    return _index
+
+
+def build_ann(index, ann_path=ANN_PATH, dim=None, n_lists=None, seed=0):
+    """
+    Fits the approximate (IVF) course index over index.vectors and saves it.
+
+    Args:
+        index (CourseIndex): the exact index it approximates.
+        dim (int): reduced dimensions (default: config.COURSE_ANN_DIM).
+        n_lists (int): inverted lists (default: config.COURSE_ANN_LISTS, 0 picks about 4 * sqrt(courses)).
+
+    Returns:
+        IVFRetriever: the fitted index, with the configured nprobe and refine.
+    """
+    import numpy as np
+    from utils import config
+    from utils.retrieval import CourseRetriever, IVFRetriever
+
+    retriever = IVFRetriever.build(CourseRetriever(index.vectors), dim=dim or config.COURSE_ANN_DIM,
+                                   n_lists=n_lists or config.COURSE_ANN_LISTS or None, seed=seed,
+                                   nprobe=config.COURSE_ANN_NPROBE, refine=config.COURSE_ANN_REFINE)
+    os.makedirs(os.path.dirname(ann_path) or '.', exist_ok=True)
+    with open(ann_path + '.tmp', 'wb') as f:
+        np.savez(f, source_sha256=np.array(index.manifest['sha256']), **retriever.arrays())
+    os.replace(ann_path + '.tmp', ann_path)
+    return retriever
+
+
+def load_ann(index, ann_path=ANN_PATH, rebuild=True):
+    """
+    Loads the approximate course index built from the same CSV as index, rebuilding it otherwise.
+
+    Args:
+        rebuild (bool): when False a missing or stale ANN index raises instead of being rebuilt.
+
+    Returns:
+        IVFRetriever: with the configured nprobe and refine.
+    """
+    import numpy as np
+    from utils import config
+    from utils.retrieval import CourseRetriever, IVFRetriever
+
+    try:
+        with np.load(ann_path) as data:
+            if str(data['source_sha256']) == index.manifest['sha256']:
+                return IVFRetriever(CourseRetriever(index.vectors), *(data[name] for name in IVFRetriever.ARRAYS),
+                                    nprobe=config.COURSE_ANN_NPROBE, refine=config.COURSE_ANN_REFINE)
+        reason = f"{ann_path} was built from a different course CSV"
+    except FileNotFoundError as e:
+        reason = f"missing {e.filename}"
+
+    if not rebuild:
+        raise FileNotFoundError(f"ANN course index is not usable ({reason}); run python -m utils.course_index --ann")
+    return build_ann(index, ann_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the course TF-IDF index.")
+    parser.add_argument('--csv', default=COURSES_PATH)
+    parser.add_argument('--force', action='store_true', help="rebuild even if the CSV did not change")
+    parser.add_argument('--ann', action='store_true', help="also build the approximate index (RESUME_COURSE_RETRIEVAL=ann)")
+    parser.add_argument('--ann-dim', type=int, help="reduced dimensions of the approximate index")
+    parser.add_argument('--ann-lists', type=int, help="inverted lists of the approximate index")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.force:
+        index = build_index(args.csv)
+    else:
+        index = load_index(args.csv)
+        # a touched but unchanged CSV: record its mtime so loads stop hashing it
+        refresh_source_info(index.manifest, args.csv, MANIFEST_PATH)
+    manifest = index.manifest
+    print(f"{manifest['courses']} courses x {manifest['features']} features "
+          f"(sha256 {manifest['sha256'][:12]}) in {time.perf_counter() - start:.2f}s")
+
+    if args.ann:
+        start = time.perf_counter()
+        retriever = build_ann(index, dim=args.ann_dim, n_lists=args.ann_lists)
+        print(f"ANN index: {retriever.dense.shape[1]} dimensions, {len(retriever.centroids)} lists "
+              f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
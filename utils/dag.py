@@ -0,0 +1,118 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# Stages run on an executor kind: 'thread' for work that releases the GIL
+# (I/O, NumPy/SciPy, C extensions), 'process' for pure-Python work that does
+# not, 'inline' for cheap steps run directly in the calling thread.
+EXECUTORS = ('inline', 'thread', 'process')
+
+
+def _timed(func, args):
+    # module level so process pools can pickle it; the time excludes queueing
+    start = time.perf_counter()
+    output = func(*args)
+    return output, time.perf_counter() - start
+
+
+class Stage:
+    """
+    One node of a Dag.
+
+    Args:
+        name (str): key of the stage output.
+        func (callable): called with the outputs of deps, in order. Must be
+            picklable (module level) when executor is 'process'.
+        deps (Sequence[str]): stages or run inputs this stage consumes.
+        executor (str): one of EXECUTORS.
+    """
+
+    def __init__(self, name, func, deps=(), executor='thread'):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}, expected one of {EXECUTORS}")
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.executor = executor
+
+
+class Dag:
+    """
+    Runs stages as soon as their dependencies are done, independent stages concurrently.
+
+    Example:
+        dag = Dag()
+        dag.add('processed', preprocess, deps=['text'], executor='process')
+        dag.add('predictions', classify, deps=['processed'])
+        dag.add('skills', extract_skills, deps=['text'])
+        outputs, timings = dag.run({'text': text}, executors={'thread': pool, 'process': procs})
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, func, deps=(), executor='thread'):
+        """Adds a stage; returns the Dag so calls can be chained."""
+        if name in self.stages:
+            raise ValueError(f"Stage {name!r} already defined")
+        self.stages[name] = Stage(name, func, deps, executor)
+        return self
+
+    def run(self, inputs=None, executors=None, on_stage=None):
+        """
+        Runs every stage once.
+
+        Args:
+            inputs (dict): values stages can depend on by name.
+            executors (dict): 'thread' / 'process' -> concurrent.futures executor,
+                needed for each kind a stage uses.
+            on_stage (callable): called as on_stage(name, seconds) in the calling
+                thread when a stage completes.
+
+        Returns:
+            Tuple[dict, dict]: outputs by name (inputs included) and seconds per stage.
+
+        Raises:
+            ValueError: unknown dependency, missing executor or a cycle.
+            Exception: the first exception a stage raised; stages not started yet are cancelled.
+        """
+        outputs = dict(inputs or {})
+        executors = executors or {}
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.deps if dep not in self.stages and dep not in outputs]
+            if unknown:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown {', '.join(unknown)}")
+            if stage.executor != 'inline' and stage.executor not in executors:
+                raise ValueError(f"Stage {stage.name!r} needs a {stage.executor!r} executor")
+
+        timings = {}
+        pending = dict(self.stages)
+        running = {}
+
+        def finish(stage, output, seconds):
+            outputs[stage.name] = output
+            timings[stage.name] = seconds
+            if on_stage is not None:
+                on_stage(stage.name, seconds)
+
+        try:
+            while pending or running:
+                ready = [stage for stage in pending.values() if all(dep in outputs for dep in stage.deps)]
+                for stage in ready:
+                    del pending[stage.name]
+                    args = [outputs[dep] for dep in stage.deps]
+                    if stage.executor == 'inline':
+                        finish(stage, *_timed(stage.func, args))
+                    else:
+                        running[executors[stage.executor].submit(_timed, stage.func, args)] = stage
+                if ready and any(stage.executor == 'inline' for stage in ready):
+                    continue  # inline outputs may have unblocked more stages
+                if not running:
+                    raise ValueError(f"Cycle between stages {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), *future.result())
+        finally:
+            for future in running:
+                future.cancel()
+        return outputs, timings
@@ -0,0 +1,94 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+from utils import resume_data
+from utils.pdf import get_backend, read_file_bytes
+
+MAX_ENTRIES = 256
+MAX_CHARS = 32 * 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Thread-safe LRU of extracted resume text keyed by backend and the sha256 of the file content.
+
+    Args:
+        max_entries (int): maximum number of documents kept.
+        max_chars (int): maximum total characters of cached text.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_chars=MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._items = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = len(value[0])
+        if size > self.max_chars:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._chars -= len(old[0])
+            self._items[key] = value
+            self._chars += size
+            while len(self._items) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._items.popitem(last=False)
+                self._chars -= len(evicted[0])
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._chars = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._items), 'chars': self._chars,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+extraction_cache = ExtractionCache()
+
+
+def cached_resume_data(file, backend=None, workers=None, executor=None, page_timeout=None,
+                       cache=extraction_cache):
+    """
+    Same contract as resume_data, but every distinct file content is parsed only once per backend.
+
+    Only complete extractions are stored: a result with an empty or timed-out
+    page, or no text at all, is returned but extracted again next time.
+    workers, executor and page_timeout change how pages are scheduled, not
+    the text of a complete extraction, so they are not part of the key.
+
+    Returns:
+        List: [text, is_valid]
+    """
+    data = read_file_bytes(file)
+    # 'auto' and the backend it resolves to share entries
+    backend_name = get_backend(backend).name
+    key = (backend_name, hashlib.sha256(data).hexdigest())
+    cached = cache.get(key)
+    if cached is not None:
+        return list(cached)
+
+    text, is_valid = resume_data(io.BytesIO(data), backend=backend_name, workers=workers,
+                                 executor=executor, page_timeout=page_timeout)
+    if is_valid and text.strip():
+        cache.put(key, (text, is_valid))
+    return [text, is_valid]
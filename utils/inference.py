@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from itertools import islice
+
+import numpy as np
+
+from utils import get_processed_corpus, registry
+
+
+def top_k_indices(probs, k=5):
+    """
+    Selects the k highest scores of every row with a single argpartition.
+
+    Args:
+        probs (np.ndarray): (n_rows, n_classes) score matrix.
+        k (int): number of classes to keep per row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n_rows, k) class indices and scores, best first.
+
+    Raises:
+        ValueError: k is below 1.
+    """
+    if k < 1:
+        # k=0 would slice [:, -0:] and return every class
+        raise ValueError("k must be a positive integer")
+    k = min(k, probs.shape[1])
+    part = np.argpartition(probs, -k, axis=1)[:, -k:]
+    part_scores = np.take_along_axis(probs, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    indices = np.take_along_axis(part, order, axis=1)
+    return indices, np.take_along_axis(probs, indices, axis=1)
+
+
+def predict_proba_batch(texts, artifacts=None):
+    """
+    Vectorizes all texts in one transform and scores them in one predict_proba call.
+
+    Args:
+        texts (List[str]): raw resume texts.
+        artifacts (ModelSnapshot): registry snapshot to score with (default: the current one).
+    """
+    artifacts = artifacts or registry.snapshot()
+    processed = get_processed_corpus([[text] for text in texts])
+    data_tfidf = artifacts.preprocessor.transform(processed)
+    return artifacts.model.predict_proba(data_tfidf)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_predict_batch(texts, top_k=5, chunk_size=1000):
+    """
+    Scores resumes chunk by chunk.
+
+    Args:
+        texts (Iterable[str]): raw resume texts, may be a generator.
+        top_k (int): number of roles to return per resume.
+        chunk_size (int): resumes vectorized and scored per call.
+
+    Yields:
+        List[List[Tuple[str, float]]]: per resume, the top_k (label, score) pairs of the chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    if top_k < 1:
+        raise ValueError("top_k must be a positive integer")
+
+    for chunk in _chunks(texts, chunk_size):
+        # labels and scores of a chunk come from the same snapshot, even across a reload
+        artifacts = registry.snapshot()
+        probs = predict_proba_batch(chunk, artifacts)
+        indices, scores = top_k_indices(probs, top_k)
+        labels = artifacts.decoder.classes_[indices]
+        yield [list(zip(row_labels, row_scores)) for row_labels, row_scores in zip(labels, scores)]
+
+
+def predict_batch(texts, top_k=5, chunk_size=1000):
+    """Same as iter_predict_batch but returns one flat list, one entry per resume."""
+    results = []
+    for chunk in iter_predict_batch(texts, top_k=top_k, chunk_size=chunk_size):
+        results.extend(chunk)
+    return results
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-resume predictions into one transform + predict_proba.
+
+    A background thread takes the first waiting request, keeps collecting
+    until max_batch_size requests are queued or max_wait seconds have passed,
+    then scores them together. Each caller gets the same top-k (label, score)
+    list predict_processed returns for its text.
+
+    Args:
+        max_batch_size (int): most texts scored in one call.
+        max_wait (float): seconds the first request of a batch waits for company.
+        top_k (int): roles returned per text.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait=0.005, top_k=5):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        if top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.top_k = top_k
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, processed_text):
+        """Queues one preprocessed text; returns a Future of its (label, score) list."""
+        future = Future()
+        self._queue.put((processed_text, future))
+        return future
+
+    def predict(self, processed_text, timeout=None):
+        return self.submit(processed_text).result(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        return {'batches': self.batches, 'items': self.items,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0}
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            closing = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            self._score(batch)
+            if closing:
+                return
+
+    def _score(self, batch):
+        live = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        texts = [text for text, _ in live]
+        futures = [future for _, future in live]
+        try:
+            artifacts = registry.snapshot()
+            data_tfidf = artifacts.preprocessor.transform(texts)
+            probs = artifacts.model.predict_proba(data_tfidf)
+            indices, scores = top_k_indices(probs, self.top_k)
+            labels = artifacts.decoder.classes_[indices]
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(texts)
+        for future, row_labels, row_scores in zip(futures, labels, scores):
+            future.set_result(list(zip(row_labels, row_scores)))
@@ -1,74 +1,173 @@
-import spacy
-from spacy.matcher import PhraseMatcher
-from utils import resume_data
-
-
-nlp = spacy.load("en_core_web_sm")
-
-job_title_skills = {
-    "Java Developer": ["Java", "Spring Boot", "Hibernate", "Maven", "REST APIs", "Git", "JUnit", "SQL"],
-    "Testing": ["Manual Testing", "Automation Testing", "Selenium", "JUnit", "TestNG", "Bugzilla", "LoadRunner"],
-    "DevOps Engineer": ["Docker", "Kubernetes", "Jenkins", "Ansible", "Terraform", "AWS", "Git", "CI/CD", "Linux"],
-    "Python Developer": ["Python", "Flask", "Django", "Pandas", "NumPy", "REST APIs", "Git", "SQL", "FastAPI"],
-    "Web Designing": ["HTML", "CSS", "JavaScript", "Bootstrap", "Figma", "Adobe XD", "UX/UI", "Photoshop"],
-    "HR": ["MS Excel", "HRIS", "ATS", "Workday", "Zoho Recruit", "Payroll Software", "Google Workspace"],
-    "Hadoop": ["Hadoop", "MapReduce", "Hive", "Pig", "Sqoop", "HDFS", "Spark", "Oozie"],
-    "Blockchain": ["Solidity", "Ethereum", "Web3.js", "Hyperledger", "Smart Contracts", "Truffle", "Metamask"],
-    "ETL Developer": ["Informatica", "Talend", "SSIS", "SQL", "Python", "Data Warehousing", "DataStage"],
-    "Operations Manager": ["MS Excel", "SAP ERP", "CRM Tools", "Tableau", "Project Management Software"],
-    "Data Science": ["Python", "R", "Scikit-learn", "Pandas", "NumPy", "Matplotlib", "SQL", "Jupyter", "Machine Learning", "Deep Learning"],
-    "Sales": ["Salesforce", "CRM", "MS Excel", "Google Sheets", "Data Analysis", "HubSpot"],
-    "Mechanical Engineer": ["AutoCAD", "SolidWorks", "CATIA", "Ansys", "MATLAB", "GD&T", "Creo"],
-    "Arts": ["Adobe Photoshop", "Illustrator", "InDesign", "CorelDRAW", "Blender", "Premiere Pro"],
-    "Database": ["SQL", "MySQL", "PostgreSQL", "MongoDB", "Oracle DB", "PL/SQL", "DBMS"],
-    "Electrical Engineering": ["MATLAB", "Simulink", "PCB Design", "PSpice", "Multisim", "AutoCAD Electrical"],
-    "Health and fitness": ["BMI Calculator Tools", "Nutrition Apps", "Fitness Trackers", "Excel for diet planning"],
-    "PMO": ["MS Project", "JIRA", "Confluence", "Trello", "Gantt Charts", "Excel", "Risk Analysis"],
-    "Business Analyst": ["Excel", "Power BI", "SQL", "Tableau", "JIRA", "BRD", "Wireframing Tools"],
-    "DotNet Developer": ["C#", "ASP.NET", ".NET Core", "MVC", "SQL Server", "LINQ", "Visual Studio"],
-    "Automation Testing": ["Selenium", "TestNG", "JUnit", "Jenkins", "Appium", "Cucumber", "Postman"],
-    "Network Security Engineer": ["Wireshark", "Kali Linux", "Firewalls", "IDS/IPS", "Cisco ASA", "Nmap", "VPN", "OpenSSL"],
-    "SAP Developer": ["SAP ABAP", "SAP Fiori", "SAP HANA", "BAPI", "SAP UI5", "ALV Reports"],
-    "Civil Engineer": ["AutoCAD", "STAAD Pro", "Revit", "MS Project", "ETABS", "Primavera"],
-    "Advocate": ["Manupatra", "SCC Online", "MS Word", "Legal Drafting", "Case Management Software"]
-}
-
-all_skills = list(set(skill.lower() for skills in job_title_skills.values() for skill in skills))
-
-matcher = PhraseMatcher(nlp.vocab)
-patterns = [nlp.make_doc(skill) for skill in all_skills]
-matcher.add("SKILLS", patterns)
+import threading
 
-def extract_skills_from_text(file):
+from utils import config
+from utils.extract_cache import cached_resume_data
+
+SPACY_MODEL = "en_core_web_sm"
+# skill matching only needs tokens, every trained component is left out
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+# Roles, skills and aliases come from the taxonomy file (config.SKILL_TAXONOMY),
+# reloaded while the app runs; see utils.taxonomy.
+
+_nlp = None
+_nlp_lock = threading.Lock()
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_nlp():
+    """Loads the tokenizer-only spaCy pipeline on first use."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return _nlp
+
+
+class SpacySkillMatcher:
+    """
+    PhraseMatcher with one key per skill, so a match on an alias is reported as its skill.
+
+    Args:
+        nlp (Language): pipeline whose tokenizer splits the text (default: get_nlp()).
+    """
+
+    def __init__(self, nlp=None):
+        from spacy.matcher import PhraseMatcher
+
+        self.nlp = nlp or get_nlp()
+        self.matcher = PhraseMatcher(self.nlp.vocab)
+
+    def add(self, skill, forms=None):
+        if skill in self.matcher:
+            self.matcher.remove(skill)
+        self.matcher.add(skill, [self.nlp.make_doc(form) for form in sorted(forms or (skill,))])
+
+    def remove(self, skill):
+        if skill in self.matcher:
+            self.matcher.remove(skill)
+
+    def _skills(self, doc):
+        strings = self.nlp.vocab.strings
+        return list({strings[match_id] for match_id, _, _ in self.matcher(doc)})
+
+    def match(self, text):
+        return self._skills(self.nlp.make_doc(text.lower()))
+
+    def match_many(self, texts, n_process=1, batch_size=64):
+        docs = self.nlp.pipe((text.lower() for text in texts), n_process=n_process, batch_size=batch_size)
+        return [self._skills(doc) for doc in docs]
+
+
+def _make_matcher():
+    if config.SKILL_MATCHER == 'compiled':
+        from utils.skill_matcher import SkillMatcher
+        return SkillMatcher()
+    return SpacySkillMatcher()
+
+
+def get_skill_registry():
+    """
+    Loads the skill taxonomy and its SkillIndex on first use, then watches the
+    taxonomy file for changes. The matchers are built on the first match.
+
+    Returns:
+        SkillRegistry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from utils.taxonomy import SkillRegistry
+                _registry = SkillRegistry(_make_matcher).start_watching()
+    return _registry
+
+
+def __getattr__(name):
+    # job_title_skills and all_skills follow the taxonomy file
+    if name == 'job_title_skills':
+        return get_skill_registry().taxonomy.roles
+    if name == 'all_skills':
+        return get_skill_registry().taxonomy.skills
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def extract_skills(text):
     """
     Extracts known hard skills from the given resume text.
 
     Args:
         text (str): The resume or job description text.
 
+    Returns:
+        List[str]: A list of matched skills (in lowercase), aliases reported as their skill.
+    """
+    with get_skill_registry().matcher() as matcher:
+        return matcher.match(text)
+
+
+def extract_skills_bulk(texts, n_process=1, batch_size=64):
+    """
+    Extracts skills from many texts, with nlp.pipe on the spaCy path.
+
+    Args:
+        texts (Iterable[str]): resume texts.
+        n_process (int): tokenizer processes, see spacy.Language.pipe.
+        batch_size (int): texts per batch.
+
+    Returns:
+        List[List[str]]: matched skills per text, in input order.
+    """
+    with get_skill_registry().matcher() as matcher:
+        return matcher.match_many(texts, n_process=n_process, batch_size=batch_size)
+
+
+def extract_skills_from_text(file):
+    """
+    Extracts known hard skills from an uploaded resume file.
+
+    The PDF text comes from the shared extraction cache, so a file that was
+    already parsed for prediction is not parsed again.
+
+    Args:
+        file: The uploaded PDF (path or file-like object).
+
     Returns:
         List[str]: A list of matched skills (in lowercase).
     """
 
-    text , _ = resume_data(file)
-    doc = nlp(text.lower())
-    matches = matcher(doc)
+    text , _ = cached_resume_data(file)
+    return extract_skills(text)
 
-    found_skills = set()
-    for match_id, start, end in matches:
-        span = doc[start:end]
-        found_skills.add(span.text)
 
-    return list(found_skills)
+def get_skill_index():
+    """Returns the SkillIndex of the current taxonomy."""
+    return get_skill_registry().index
 
 
-def missingskills(labels , skills):
-    missingskills = []
-    for label in labels:
-        required_skills = [sk.lower() for sk in job_title_skills[label]]
-        missing = set(required_skills) - set(skills)
-        missingskills.append([label,missing])
-    return missingskills
+def skill_gaps(labels, skills):
+    """
+    Missing and matched skills plus the coverage ratio of each predicted role.
+
+    Args:
+        labels (Iterable[str]): job roles.
+        skills (Iterable[str]): the resume's skills, lowercase.
+
+    Returns:
+        List[SkillGap]: (role, missing, matched, coverage) per label, in order.
+    """
+    return get_skill_index().gaps(skills, roles=list(labels))
+
 
+def rank_roles_by_coverage(skills, k=None):
+    """Ranks every job role by the share of its required skills found in skills, best first."""
+    return get_skill_index().rank_roles(skills, k=k)
 
 
+def missingskills(labels, skills):
+    """Returns [label, set of missing lowercase skills] for each label."""
+    labels = list(labels)
+    return [[label, missing] for label, missing in zip(labels, get_skill_index().missing(skills, roles=labels))]
@@ -0,0 +1,291 @@
+import hashlib
+import importlib.util
+import io
+import multiprocessing
+import re
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from utils import config
+
+
+class PdfBackend:
+    """Text extraction backend. Subclasses open a document from bytes and extract one page at a time."""
+
+    name = None
+    # False when documents must not be used from several threads (the thread executor then uses processes)
+    thread_safe = True
+
+    def available(self):
+        raise NotImplementedError
+
+    def open(self, data):
+        raise NotImplementedError
+
+    def page_count(self, doc):
+        raise NotImplementedError
+
+    def page_text(self, doc, index):
+        raise NotImplementedError
+
+
+class PyMuPDFBackend(PdfBackend):
+    name = 'pymupdf'
+    thread_safe = False
+
+    def available(self):
+        return (importlib.util.find_spec('pymupdf') is not None
+                or importlib.util.find_spec('fitz') is not None)
+
+    def open(self, data):
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        return pymupdf.open(stream=data, filetype='pdf')
+
+    def page_count(self, doc):
+        return doc.page_count
+
+    def page_text(self, doc, index):
+        return doc.load_page(index).get_text()
+
+
+class PypdfBackend(PdfBackend):
+    name = 'pypdf'
+
+    def available(self):
+        return importlib.util.find_spec('pypdf') is not None
+
+    def open(self, data):
+        from pypdf import PdfReader
+        return PdfReader(io.BytesIO(data))
+
+    def page_count(self, doc):
+        return len(doc.pages)
+
+    def page_text(self, doc, index):
+        return doc.pages[index].extract_text()
+
+
+_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+_TEXT_BLOCK = re.compile(rb'BT(.*?)ET', re.S)
+_SHOW_TEXT = re.compile(rb"\[((?:\\.|[^\]\\])*)\]\s*TJ|\(((?:\\.|[^)\\])*)\)\s*(?:Tj|'|\")", re.S)
+_LITERAL = re.compile(rb'\(((?:\\.|[^)\\])*)\)', re.S)
+_ESCAPE = re.compile(rb'\\([nrtbf()\\]|[0-7]{1,3})')
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+            b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def _unescape(literal):
+    def replace(match):
+        token = match.group(1)
+        return _ESCAPES.get(token) or bytes([int(token, 8) & 0xFF])
+    return _ESCAPE.sub(replace, literal)
+
+
+class PlainTextBackend(PdfBackend):
+    """
+    Dependency-free fallback. Reads literal strings shown by Tj/TJ operators in
+    (optionally Flate-compressed) content streams; the whole file is one page.
+    Non-PDF input is decoded as UTF-8 text.
+    """
+
+    name = 'text'
+
+    def available(self):
+        return True
+
+    def open(self, data):
+        if not data.lstrip().startswith(b'%PDF'):
+            return [data.decode('utf-8', errors='ignore')]
+
+        lines = []
+        for raw in _STREAM.findall(data):
+            try:
+                raw = zlib.decompress(raw)
+            except zlib.error:
+                pass
+            for block in _TEXT_BLOCK.findall(raw):
+                parts = []
+                for array, literal in _SHOW_TEXT.findall(block):
+                    if array:
+                        parts.extend(_unescape(s) for s in _LITERAL.findall(array))
+                    else:
+                        parts.append(_unescape(literal))
+                if parts:
+                    lines.append(b''.join(parts).decode('latin-1'))
+        return ['\n'.join(lines)]
+
+    def page_count(self, doc):
+        return len(doc)
+
+    def page_text(self, doc, index):
+        return doc[index]
+
+
+BACKENDS = {backend.name: backend for backend in (PyMuPDFBackend(), PypdfBackend(), PlainTextBackend())}
+# pypdf first: it is what the app has always extracted with, so 'auto' keeps its text
+AUTO_ORDER = ('pypdf', 'pymupdf', 'text')
+
+
+def get_backend(name=None):
+    """Returns the named backend, or the first available one for 'auto'."""
+    name = name or config.PDF_BACKEND
+    if name == 'auto':
+        for candidate in AUTO_ORDER:
+            if BACKENDS[candidate].available():
+                return BACKENDS[candidate]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {name!r}, expected one of {sorted(BACKENDS)} or 'auto'")
+    backend = BACKENDS[name]
+    if not backend.available():
+        raise ImportError(f"PDF backend {name!r} is not installed")
+    return backend
+
+
+def read_file_bytes(file):
+    """Returns the raw bytes of a path, bytes object or file-like upload (Streamlit UploadedFile)."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            return f.read()
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+# Every worker thread keeps the last document it opened, so pages of the
+# same file handed to the same thread don't re-parse the xref table.
+_local = threading.local()
+
+
+def _open_cached(backend, key, data):
+    if getattr(_local, 'key', None) != (backend.name, key):
+        _local.doc = backend.open(data)
+        _local.key = (backend.name, key)
+    return _local.doc
+
+
+def _count_task(backend_name, key, data):
+    backend = BACKENDS[backend_name]
+    return backend.page_count(_open_cached(backend, key, data))
+
+
+def _page_task(backend_name, key, data, index):
+    backend = BACKENDS[backend_name]
+    return backend.page_text(_open_cached(backend, key, data), index)
+
+
+# State of a process-pool worker: the pool's initializer receives the file
+# once per worker, the first task opens it (so a failure reaches the caller),
+# and page tasks only carry the page index.
+_worker = {}
+
+
+def _init_page_worker(backend_name, data):
+    _worker.clear()
+    _worker['backend'] = BACKENDS[backend_name]
+    _worker['data'] = data
+
+
+def _worker_doc():
+    if 'doc' not in _worker:
+        _worker['doc'] = _worker['backend'].open(_worker['data'])
+    return _worker['doc']
+
+
+def _worker_page_count():
+    return _worker['backend'].page_count(_worker_doc())
+
+
+def _worker_page(index):
+    return _worker['backend'].page_text(_worker_doc(), index)
+
+
+def extract_pages(data, backend=None, workers=None, executor=None, page_timeout=None):
+    """
+    Extracts the text of every page of a PDF.
+
+    Args:
+        data (bytes): PDF file content.
+        backend (str): backend name or 'auto' (default: config.PDF_BACKEND).
+        workers (int): pages extracted in parallel, 0 for the calling thread (default: config.PDF_WORKERS).
+        executor (str): 'thread' or 'process' (default: config.PDF_EXECUTOR); backends
+            that are not thread-safe (pymupdf) always use 'process'.
+        page_timeout (float): seconds to wait for a page before giving up on it (default: config.PDF_PAGE_TIMEOUT).
+            Opening the document is timed the same way.
+
+    Returns:
+        List[Optional[str]]: text per page, None for pages that timed out; empty when
+        the document did not open within page_timeout.
+    """
+    backend = get_backend(backend)
+    workers = config.PDF_WORKERS if workers is None else workers
+    executor = executor or config.PDF_EXECUTOR
+    page_timeout = config.PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
+
+    if executor == 'thread' and not backend.thread_safe:
+        executor = 'process'
+
+    count = None
+    if page_timeout is None:
+        # nothing to time out: open here, and skip the pool when there is nothing to spread
+        doc = backend.open(data)
+        count = backend.page_count(doc)
+        if workers <= 0 or count <= 1:
+            return [backend.page_text(doc, i) for i in range(count)]
+        workers = min(workers, count)
+    workers = max(workers, 1)
+
+    if executor == 'process':
+        # a pool per call: a stuck page is killed with this call's workers only
+        pool = multiprocessing.Pool(workers, initializer=_init_page_worker, initargs=(backend.name, data))
+        try:
+            if count is None:
+                try:
+                    count = pool.apply_async(_worker_page_count).get(timeout=page_timeout)
+                except multiprocessing.TimeoutError:
+                    return []
+            pending = [pool.apply_async(_worker_page, (i,)) for i in range(count)]
+            pages = []
+            for result in pending:
+                try:
+                    pages.append(result.get(timeout=page_timeout))
+                except multiprocessing.TimeoutError:
+                    pages.append(None)
+            return pages
+        finally:
+            pool.terminate()
+
+    if executor != 'thread':
+        raise ValueError(f"Unknown executor {executor!r}, expected 'thread' or 'process'")
+
+    key = hashlib.sha1(data).hexdigest()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        if count is None:
+            future = pool.submit(_count_task, backend.name, key, data)
+            try:
+                count = future.result(timeout=page_timeout)
+            except FutureTimeout:
+                # the thread cannot be killed; it finishes in the background
+                return []
+        args = [(backend.name, key, data, i) for i in range(count)]
+        futures = [pool.submit(_page_task, *arg) for arg in args]
+        pages = []
+        for future in futures:
+            try:
+                pages.append(future.result(timeout=page_timeout))
+            except FutureTimeout:
+                # the thread cannot be killed; it finishes in the background
+                future.cancel()
+                pages.append(None)
+        return pages
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
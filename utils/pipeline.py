@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import config, get_processed_corpus, predict_processed
+from utils.dag import Dag
+from utils.extract_cache import cached_resume_data
+from utils.parser import extract_skills
+
+STAGES = ('extract', 'preprocess', 'classify', 'skills')
+
+STAGE_LABELS = {
+    'extract': "Extracting text from the uploaded document",
+    'preprocess': "Preprocessing the content for analysis",
+    'classify': "Running model inference to determine job role",
+    'skills': "Matching skills",
+}
+
+
+class AnalysisResult:
+    """Output of analyze_resume. Fields after a failed stage stay None."""
+
+    def __init__(self):
+        self.text = None
+        self.is_valid = False
+        self.processed = None
+        self.predictions = None
+        self.skills = None
+        self.timings = {}
+        self.elapsed = None
+
+    @property
+    def total_seconds(self):
+        """Wall-clock time of the analysis; below the sum of timings when stages overlapped."""
+        return self.elapsed if self.elapsed is not None else sum(self.timings.values())
+
+
+_service_client = None
+
+
+def get_service_client():
+    global _service_client
+    if _service_client is None:
+        from utils.client import ServiceClient
+        _service_client = ServiceClient(config.SERVICE_URL)
+    return _service_client
+
+
+def nlp_executor():
+    """Returns where preprocessing runs: config.PIPELINE_NLP_EXECUTOR with 'auto' resolved."""
+    if config.PIPELINE_NLP_EXECUTOR == 'auto':
+        return 'process' if (os.cpu_count() or 1) > 1 else 'thread'
+    return config.PIPELINE_NLP_EXECUTOR
+
+
+def _init_nlp_worker():
+    from utils.preprocess import load_nltk
+    load_nltk()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(kind):
+    """Returns the process-wide 'thread' or 'process' executor of the pipeline, created on first use."""
+    with _pools_lock:
+        pool = _pools.get(kind)
+        if pool is None:
+            if kind == 'thread':
+                pool = ThreadPoolExecutor(max_workers=config.PIPELINE_THREADS, thread_name_prefix='pipeline')
+            elif kind == 'process':
+                # forkserver: workers do not inherit the threads of a running Streamlit server
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                pool = ProcessPoolExecutor(max_workers=config.PIPELINE_PROCESSES,
+                                           mp_context=multiprocessing.get_context(method),
+                                           initializer=_init_nlp_worker)
+            else:
+                raise ValueError(f"Unknown executor {kind!r}, expected 'thread' or 'process'")
+            _pools[kind] = pool
+        return pool
+
+
+def discard_pool(kind, pool):
+    """
+    Drops a broken executor from the cache so the next get_pool(kind) creates a new one.
+
+    Only `pool` is dropped: when another thread already replaced it, the new one stays.
+    """
+    with _pools_lock:
+        if _pools.get(kind) is pool:
+            del _pools[kind]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_pools():
+    """Starts the pipeline executors so the first analysis does not pay for worker startup."""
+    get_pool('thread')
+    if nlp_executor() == 'process':
+        # one task per worker, so each worker has loaded NLTK
+        pool = get_pool('process')
+        for future in [pool.submit(get_processed_corpus, [['']]) for _ in range(config.PIPELINE_PROCESSES)]:
+            future.result()
+
+
+def build_dag(service=False, nlp=None):
+    """
+    Returns the analysis stages after extraction: preprocess -> classify, and
+    skills alongside them, all fed from the 'text' input.
+
+    Args:
+        service (bool): one 'classify' stage calls the inference service, which
+            preprocesses, classifies and extracts skills; it outputs (predictions, skills).
+        nlp (str): executor of the preprocess stage (default: nlp_executor()).
+    """
+    dag = Dag()
+    if service:
+        dag.add('classify', get_service_client().analyze, deps=['text'])
+        return dag
+    dag.add('preprocess', get_processed_corpus, deps=['corpus'], executor=nlp or nlp_executor())
+    dag.add('classify', predict_processed, deps=['preprocess'])
+    dag.add('skills', extract_skills, deps=['text'])
+    return dag
+
+
+def analyze_resume(file, on_stage=None):
+    """
+    Runs extract, then preprocess -> classify concurrently with skills, on one resume.
+
+    With RESUME_SERVICE_URL set, preprocess, classify and skills happen in
+    one request to the inference service and only the 'classify' stage is reported.
+
+    Args:
+        file: PDF path, bytes or uploaded file.
+        on_stage (callable): called as on_stage(stage, seconds) in the calling thread
+            after each stage completes; after a broken process pool the stages run
+            again and are reported again.
+
+    Returns:
+        AnalysisResult: stops after 'extract' when the PDF text is not valid.
+    """
+    result = AnalysisResult()
+    start = time.perf_counter()
+
+    result.text, result.is_valid = cached_resume_data(file)
+    result.timings['extract'] = time.perf_counter() - start
+    if on_stage is not None:
+        on_stage('extract', result.timings['extract'])
+    if not result.is_valid:
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    service = bool(config.SERVICE_URL)
+    dag = build_dag(service=service)
+    kinds = {stage.executor for stage in dag.stages.values()} - {'inline'}
+    inputs = {'text': result.text, 'corpus': [[result.text]]}
+    executors = {kind: get_pool(kind) for kind in kinds}
+    try:
+        outputs, timings = dag.run(inputs, executors=executors, on_stage=on_stage)
+    except BrokenProcessPool:
+        # a worker died (killed, out of memory): replace the pool and run once more
+        discard_pool('process', executors['process'])
+        executors = {kind: get_pool(kind) for kind in kinds}
+        outputs, timings = dag.run(inputs, executors=executors, on_stage=on_stage)
+    # stages finish in any order; keep the display order of STAGES
+    result.timings.update((stage, timings[stage]) for stage in STAGES if stage in timings)
+    result.processed = outputs.get('preprocess')
+    if service:
+        # the skills the service matched; they are not extracted again here
+        result.predictions, result.skills = outputs['classify']
+    else:
+        result.predictions = outputs['classify']
+        result.skills = outputs['skills']
+    result.elapsed = time.perf_counter() - start
+    return result
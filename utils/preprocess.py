@@ -0,0 +1,114 @@
+import multiprocessing
+import re
+import threading
+from functools import lru_cache
+
+LEMMA_CACHE_SIZE = 200000
+
+
+_URL = re.compile(r'http\S+\s')
+_RT_CC = re.compile('RT|cc')
+_HASHTAG = re.compile(r'#\S+\s')
+_MENTION = re.compile(r'@\S+')
+# punctuation and non-ASCII are both replaced by one space, so one pass does both
+_PUNCT_NON_ASCII = re.compile('[%s]|[^\x00-\x7f]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"""))
+_SPACES = re.compile(r'\s+')
+
+_CONTRACTION_HINT = re.compile(r"can|gim|gon|got|lem|wan|'t", re.IGNORECASE)
+
+
+class NltkTools:
+    """Stopwords, lemmatizer and contraction rules, loaded together on first use."""
+
+    def __init__(self):
+        from nltk.corpus import stopwords
+        from nltk.stem.wordnet import WordNetLemmatizer
+        from nltk.tokenize.destructive import NLTKWordTokenizer
+
+        self.stopwords = frozenset(stopwords.words('english'))
+        self.lemmatize = WordNetLemmatizer().lemmatize
+        # cleaned text has no punctuation left, so word_tokenize only splits on
+        # whitespace and NLTK's contraction rules ("cannot" -> "can not")
+        self.contractions = NLTKWordTokenizer.CONTRACTIONS2 + NLTKWordTokenizer.CONTRACTIONS3
+
+
+# importing nltk takes over a second, so it waits for the first preprocessing call
+_tools = None
+_tools_lock = threading.Lock()
+
+
+def load_nltk():
+    """Checks the NLTK data is installed and loads the tools once per process."""
+    global _tools
+    if _tools is None:
+        with _tools_lock:
+            if _tools is None:
+                from utils.resources import ensure_nltk_data
+                ensure_nltk_data()
+                _tools = NltkTools()
+    return _tools
+
+
+def get_stopwords():
+    return load_nltk().stopwords
+
+
+def cleantext(txt):
+    """Removes urls, hashtags, mentions, punctuation and non-ASCII characters."""
+    cleanText = _URL.sub(' ', txt)
+    cleanText = _RT_CC.sub(' ', cleanText)
+    cleanText = _HASHTAG.sub(' ', cleanText)
+    cleanText = _MENTION.sub('  ', cleanText)
+    cleanText = _PUNCT_NON_ASCII.sub(' ', cleanText)
+    cleanText = _SPACES.sub(' ', cleanText)
+    return cleanText
+
+
+def _tokenize(cleaned):
+    if _CONTRACTION_HINT.search(cleaned):
+        cleaned = ' ' + cleaned + ' '
+        for regexp in load_nltk().contractions:
+            cleaned = regexp.sub(r' \1 \2 ', cleaned)
+    return cleaned.split()
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def _kept_lemma(word):
+    # None drops the token, like the isalpha/stopword filter
+    tools = load_nltk()
+    if word.isalpha() and word not in tools.stopwords:
+        return tools.lemmatize(word)
+    return None
+
+
+def preprocess_text(text):
+    """
+    Lowercases, cleans, tokenizes, drops stopwords and lemmatizes one resume.
+
+    Returns:
+        str: space-joined lemmas, identical to the original per-sentence loop.
+    """
+    lemmas = [_kept_lemma(word) for word in _tokenize(cleantext(text.lower()))]
+    return ' '.join(lemma for lemma in lemmas if lemma is not None)
+
+
+def preprocess_corpus(texts, workers=0, chunksize=32):
+    """
+    Preprocesses many texts, optionally across a process pool.
+
+    Args:
+        texts (Iterable[str]): raw texts.
+        workers (int): processes to use, 0 runs in the calling process.
+        chunksize (int): texts sent to a worker at a time.
+
+    Returns:
+        List[str]: processed texts, in input order.
+    """
+    if workers and workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            return pool.map(preprocess_text, texts, chunksize=chunksize)
+    return [preprocess_text(text) for text in texts]
+
+
+def lemma_cache_info():
+    return _kept_lemma.cache_info()
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+
+def resident_bytes():
+    """Returns the resident set size of this process, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Returns the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_info(path):
+    """Returns the size and mtime of a source file, as stored in a build manifest."""
+    stat = os.stat(path)
+    return {'source': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def source_is_current(manifest, path):
+    """
+    Tells whether a source file still has the content a manifest was built from.
+
+    Same size and mtime is trusted; otherwise the file is hashed, so a touched
+    or copied file with the same content is still current. Nothing is written:
+    the build step records the new mtime (refresh_source_info).
+    """
+    info = source_info(path)
+    if manifest.get('size') == info['size'] and manifest.get('mtime_ns') == info['mtime_ns']:
+        return True
+    return manifest.get('size') == info['size'] and manifest.get('sha256') == file_digest(path)
+
+
+def refresh_source_info(manifest, path, manifest_path):
+    """
+    Records the current mtime of an unchanged source in its manifest, replaced atomically.
+
+    Returns:
+        bool: whether the manifest was rewritten.
+    """
+    if not os.path.exists(path):
+        return False
+    info = source_info(path)
+    if manifest.get('mtime_ns') == info['mtime_ns']:
+        return False
+    manifest['mtime_ns'] = info['mtime_ns']
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return True
+
+
+def manifest_paths(manifest_path, section='artifacts'):
+    """
+    Reads a publish manifest and resolves the files of one of its sections.
+
+    Args:
+        manifest_path (str): the manifest, e.g. Artifacts/model_manifest.json.
+        section (str): 'artifacts' for the pickles, 'compact' for the compact headers.
+
+    Returns:
+        Tuple[dict, dict]: the manifest, and artifact name -> path.
+
+    Raises:
+        ValueError: the manifest has no such section.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    entries = manifest.get(section)
+    if not entries:
+        raise ValueError(f"{manifest_path} has no '{section}' artifacts")
+    base = os.path.join(os.path.dirname(manifest_path), manifest.get('directory', ''))
+    return manifest, {name: os.path.join(base, entry['file']) for name, entry in entries.items()}
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of the prediction artifacts, loaded and swapped as one snapshot.
+
+    The live version is named by a publish manifest (written by utils.train):
+    a JSON file whose `section` maps every artifact name to a file and its
+    sha256, relative to the manifest's 'directory'. On access the manifest
+    is stat()ed; when it changed and lists other files, every artifact is
+    loaded and the snapshot is replaced in one assignment, so a caller never
+    sees a vectorizer from one training next to a model from another.
+    Without a manifest, the fallback paths are loaded and keyed on their
+    content hashes.
+
+    Args:
+        paths (dict): artifact name -> fallback path, used when there is no manifest.
+        loader (callable): function that turns a path into an object.
+        manifest_path (str): publish manifest; None always uses paths.
+        section (str): manifest key holding the artifact entries.
+    """
+
+    def __init__(self, paths, loader=None, manifest_path=None, section='artifacts'):
+        self.paths = dict(paths)
+        self.manifest_path = manifest_path
+        self.section = section
+        self._loader = loader or _load_pickle
+        self._snapshot_type = namedtuple('ModelSnapshot', [*self.paths, 'version'])
+        self._snapshot = None
+        self._signature = None
+        self._key = None
+        self._failed_signature = None
+        self._stats = {}
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def _current_signature(self):
+        if self.manifest_path and os.path.exists(self.manifest_path):
+            stat = os.stat(self.manifest_path)
+            return ('manifest', stat.st_mtime_ns, stat.st_size)
+        stats = [os.stat(path) for path in self.paths.values()]
+        return ('files',) + tuple((stat.st_mtime_ns, stat.st_size) for stat in stats)
+
+    def _resolve(self, signature):
+        """Returns (version, {name: path}, key) for the artifacts the signature points at."""
+        if signature[0] == 'files':
+            digests = tuple(file_digest(path) for path in self.paths.values())
+            return None, dict(self.paths), digests
+        manifest, paths = manifest_paths(self.manifest_path, self.section)
+        if set(paths) != set(self.paths):
+            raise ValueError(f"{self.manifest_path}: '{self.section}' must list {sorted(self.paths)}")
+        entries = manifest[self.section]
+        return manifest.get('version'), paths, tuple(entries[name]['sha256'] for name in self.paths)
+
+    def snapshot(self):
+        """
+        Returns the current artifacts as one namedtuple (one field per name, plus version).
+
+        Take a snapshot once per prediction and use its fields together. When the
+        manifest names a version that fails to load, the previous snapshot stays in
+        use and the failure is logged once.
+        """
+        signature = self._current_signature()
+        snapshot = self._snapshot
+        if snapshot is not None and signature in (self._signature, self._failed_signature):
+            return snapshot
+
+        with self._lock:
+            signature = self._current_signature()
+            if self._snapshot is not None and signature in (self._signature, self._failed_signature):
+                return self._snapshot
+            try:
+                version, paths, key = self._resolve(signature)
+                if self._snapshot is None or key != self._key:
+                    self._load(version, paths, key)
+            except Exception:
+                if self._snapshot is None:
+                    raise
+                self._failed_signature = signature
+                logger.exception("model artifacts not reloaded, keeping version %s", self._snapshot.version)
+                return self._snapshot
+            self._signature, self._failed_signature = signature, None
+            return self._snapshot
+
+    def get(self, name):
+        """One artifact of the current snapshot; use snapshot() when several must match."""
+        return getattr(self.snapshot(), name)
+
+    def _load(self, version, paths, key):
+        stats = {}
+        objects = {}
+        for name, path in paths.items():
+            rss = resident_bytes()
+            start = time.perf_counter()
+            objects[name] = self._loader(path)
+            seconds = time.perf_counter() - start
+            # growth of the whole process: approximate when other threads allocate meanwhile
+            rss_bytes = None if rss is None else resident_bytes() - rss
+            stats[name] = {'path': path, 'file_bytes': os.path.getsize(path), 'rss_bytes': rss_bytes,
+                           'load_seconds': seconds}
+        # one assignment: readers see the old or the new artifacts, never a mix
+        self._snapshot = self._snapshot_type(version=version, **objects)
+        self._key = key
+        self._stats = stats
+        self.loads += 1
+
+    def reload(self):
+        """Drops the cached snapshot so the next access reads from disk."""
+        with self._lock:
+            self._signature = self._failed_signature = self._key = None
+
+    def stats(self):
+        """
+        Returns load statistics of the current snapshot.
+
+        Returns:
+            dict: version, loads, and per artifact {path, file_bytes, rss_bytes, load_seconds};
+            rss_bytes is the resident memory the load added (None without /proc).
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            return {'version': None if snapshot is None else snapshot.version, 'loads': self.loads,
+                    'artifacts': {name: dict(stat) for name, stat in self._stats.items()}}
+
+
+def _load_pickle(path):
+    with open(path, 'rb') as obj:
+        return pickle.load(obj)
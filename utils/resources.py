@@ -0,0 +1,128 @@
+import argparse
+import os
+import subprocess
+import sys
+import threading
+
+# NLTK packages the app uses and where nltk.data looks for them
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'punkt_tab': 'tokenizers/punkt_tab',
+}
+# resume preprocessing needs these at request time; punkt_tab only for building the course index
+REQUIRED = ('stopwords', 'wordnet')
+
+HEAVY_MODULES = ('nltk', 'spacy', 'sklearn', 'matplotlib', 'pandas', 'streamlit')
+
+
+class MissingResourceError(LookupError):
+    """Raised when NLTK data the app needs is not installed locally."""
+
+
+_checked = set()
+_check_lock = threading.Lock()
+
+
+def _use_configured_path():
+    # nltk reads NLTK_DATA only when it is first imported
+    import nltk
+    configured = os.environ.get('NLTK_DATA')
+    for directory in reversed((configured or '').split(os.pathsep)):
+        if directory and directory not in nltk.data.path:
+            nltk.data.path.insert(0, directory)
+
+
+def _installed(name):
+    import nltk
+    path = NLTK_RESOURCES[name]
+    for candidate in (path, path + '.zip'):
+        try:
+            nltk.data.find(candidate)
+            return True
+        except LookupError:
+            pass
+    return False
+
+
+def missing_nltk_data(names=REQUIRED):
+    """Returns the NLTK packages in names that are not installed on any search path."""
+    _use_configured_path()
+    return [name for name in names if not _installed(name)]
+
+
+def ensure_nltk_data(names=REQUIRED):
+    """
+    Checks once per process that NLTK packages are installed, without touching the network.
+
+    Args:
+        names (Iterable[str]): keys of NLTK_RESOURCES.
+
+    Raises:
+        MissingResourceError: naming the missing packages, the searched paths and the
+            command that installs them.
+    """
+    names = tuple(name for name in names if name not in _checked)
+    if not names:
+        return
+    with _check_lock:
+        missing = missing_nltk_data(names)
+        if missing:
+            import nltk
+            raise MissingResourceError(
+                f"NLTK data not installed: {', '.join(missing)}. "
+                f"Searched: {os.pathsep.join(nltk.data.path)}. "
+                f"Install it with: python -m utils.resources --download"
+                f" (set NLTK_DATA to use another directory)")
+        _checked.update(names)
+
+
+def download_nltk_data(names=tuple(NLTK_RESOURCES), download_dir=None):
+    """Provisioning step: downloads the missing NLTK packages into download_dir or NLTK_DATA."""
+    import nltk
+    download_dir = download_dir or (os.environ.get('NLTK_DATA') or '').split(os.pathsep)[0] or None
+    for name in missing_nltk_data(names):
+        if not nltk.download(name, download_dir=download_dir, quiet=True, raise_on_error=True):
+            raise MissingResourceError(f"could not download NLTK package {name}")
+    return missing_nltk_data(names)
+
+
+def import_times(modules=HEAVY_MODULES):
+    """
+    Measures what importing each module adds to startup, each in a fresh interpreter.
+
+    Returns:
+        List[Tuple[str, float]]: (module, seconds); None when the module is not installed.
+    """
+    probe = ("import time, importlib; start = time.perf_counter(); importlib.import_module({!r}); "
+             "print(time.perf_counter() - start)")
+    times = []
+    for module in modules:
+        result = subprocess.run([sys.executable, '-c', probe.format(module)],
+                                capture_output=True, text=True)
+        times.append((module, float(result.stdout) if result.returncode == 0 else None))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks or installs the NLTK data the app needs.")
+    parser.add_argument('--download', action='store_true', help="download missing packages (needs network)")
+    parser.add_argument('--dir', help="download directory, defaults to NLTK_DATA")
+    parser.add_argument('--report', action='store_true', help="report the import time of heavy modules")
+    args = parser.parse_args()
+
+    if args.download:
+        download_nltk_data(download_dir=args.dir)
+    missing = missing_nltk_data(tuple(NLTK_RESOURCES))
+    for name in NLTK_RESOURCES:
+        print(f"{name:<10} {'missing' if name in missing else 'ok'}")
+
+    if args.report:
+        print(f"\n{'module':<12} {'import s':>9}")
+        for module, seconds in import_times():
+            print(f"{module:<12} {'not installed' if seconds is None else f'{seconds:>9.3f}'}")
+    sys.exit(1 if set(missing) & set(REQUIRED) else 0)
+
+
+if __name__ == '__main__':
+    main()
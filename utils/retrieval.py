@@ -0,0 +1,235 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+class CourseRetriever:
+    """
+    Cosine top-k search over L2-normalized sparse document vectors.
+
+    The documents are kept once, in CSC layout: its transpose is a CSR view
+    of the same arrays with one row of postings per term, so scoring a query
+    is a sparse product that only touches the postings of its terms, and the
+    top k come from an argpartition over the matching documents instead of a
+    full sort of the catalog.
+
+    Args:
+        vectors (scipy.sparse matrix): (n_docs, n_features) document vectors. A CSC
+            matrix with L2-normalized rows (CourseIndex.vectors) is used as is, without
+            a copy; other input is converted and normalized once.
+    """
+
+    def __init__(self, vectors):
+        docs = sp.csc_matrix(vectors)
+        docs.sort_indices()
+        norms = np.sqrt(np.bincount(docs.indices, weights=docs.data ** 2, minlength=docs.shape[0]))
+        if not np.allclose(norms[norms > 0], 1.0, rtol=0, atol=1e-9):
+            docs = docs.copy()  # may share its arrays with the caller's matrix
+            docs.data /= norms[docs.indices]
+        self.vectors = docs
+        self.n_docs = docs.shape[0]
+        # (n_features, n_docs) CSR view sharing the arrays of vectors
+        self._postings = docs.T
+
+    def scores(self, queries):
+        """Returns the (n_queries, n_docs) sparse cosine scores of vectorized queries."""
+        return (normalize(sp.csr_matrix(queries), norm='l2') @ self._postings).tocsr()
+
+    def rescore(self, query, docs):
+        """
+        Exact cosine scores of one query against a subset of the documents.
+
+        Each query term's postings are searched for docs, so the cost depends on the
+        number of terms and candidates, not on the length of the postings.
+
+        Args:
+            query (scipy.sparse.csr_matrix): (1, n_features) L2-normalized query.
+            docs (np.ndarray): sorted document indices.
+
+        Returns:
+            np.ndarray: score of every document in docs.
+        """
+        postings = self._postings
+        scores = np.zeros(len(docs))
+        for term, weight in zip(query.indices, query.data):
+            begin, end = postings.indptr[term], postings.indptr[term + 1]
+            positions = np.searchsorted(postings.indices[begin:end], docs)
+            found = positions < end - begin
+            found[found] = postings.indices[begin + positions[found]] == docs[found]
+            scores[found] += postings.data[begin + positions[found]] * weight
+        return scores
+
+    def search(self, queries, k=5, min_score=None):
+        """
+        Finds the k most similar documents for every query row.
+
+        Args:
+            queries (scipy.sparse matrix): (n_queries, n_features) vectorized queries.
+            k (int): number of documents per query.
+            min_score (float): keep only documents scoring at least this much. None
+                keeps k results even when fewer documents share a term with the query,
+                padding with zero-score documents like a full cosine sort does.
+
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: per query, document indices and
+            scores, best first; equal scores are ordered by document index.
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        k = min(k, self.n_docs)
+
+        scored = self.scores(queries)
+        results = []
+        for row in range(scored.shape[0]):
+            begin, end = scored.indptr[row], scored.indptr[row + 1]
+            results.append(_top_k(scored.indices[begin:end], scored.data[begin:end], k, min_score, self.n_docs))
+        return results
+
+
+def _top_k(indices, values, k, min_score, n_docs):
+    """Best k of the scored documents, ties by index; pads with zero-score documents when min_score is None."""
+    if min_score is not None:
+        keep = values >= min_score
+        indices, values = indices[keep], values[keep]
+    if len(values) > k:
+        # everything tied with the k-th score stays in, so ties resolve by index
+        kth = -np.partition(-values, k - 1)[k - 1]
+        keep = values >= kth
+        indices, values = indices[keep], values[keep]
+    order = np.lexsort((indices, -values))[:k]
+    indices, values = indices[order], values[order]
+
+    if min_score is None and len(indices) < k:
+        indices, values = _pad(indices, values, k, n_docs)
+    return indices, values
+
+
+def _pad(indices, values, k, n_docs):
+    taken = set(indices.tolist())
+    fill = []
+    for doc in range(n_docs):
+        if len(fill) + len(taken) == k:
+            break
+        if doc not in taken:
+            fill.append(doc)
+    return (np.concatenate([indices, np.asarray(fill, dtype=indices.dtype)]),
+            np.concatenate([values, np.zeros(len(fill), dtype=values.dtype)]))
+
+
+class IVFRetriever:
+    """
+    Approximate cosine top-k search with an inverted-file index over reduced document vectors.
+
+    The TF-IDF matrix is projected to a few hundred dense float32 dimensions
+    with a truncated SVD, and the documents are grouped into lists around
+    k-means centroids. A query is projected the same way and only the
+    documents of its nprobe closest lists are candidates; they are scored
+    with the exact sparse cosine (optionally only the best k * refine by
+    reduced-vector score), so the returned scores are exact and only recall
+    is approximate. The exact scores come from the matrix of a
+    CourseRetriever, which stays the ground truth; no second copy is kept.
+
+    Args:
+        exact (CourseRetriever): exact retriever over the same documents, for the re-scoring.
+        projection (np.ndarray): (n_features, dim) SVD components, transposed.
+        centroids (np.ndarray): (n_lists, dim) unit-norm list centroids.
+        offsets (np.ndarray): (n_lists + 1,) start of every list in ids and dense.
+        ids (np.ndarray): document index of every row of dense.
+        dense (np.ndarray): (n_docs, dim) unit-norm reduced document vectors, grouped by list.
+        nprobe (int): lists scanned per query.
+        refine (int): candidates scored exactly, as a multiple of k; 0 scores every probed document.
+    """
+
+    ARRAYS = ('projection', 'centroids', 'offsets', 'ids', 'dense')
+
+    def __init__(self, exact, projection, centroids, offsets, ids, dense, nprobe=64, refine=0):
+        self.exact = exact
+        self.n_docs = exact.n_docs
+        if len(ids) != self.n_docs:
+            raise ValueError(f"ANN index covers {len(ids)} documents, the matrix has {self.n_docs}")
+        self.projection = projection
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.dense = dense
+        self.nprobe = nprobe
+        self.refine = refine
+
+    @classmethod
+    def build(cls, exact, dim=256, n_lists=None, seed=0, nprobe=64, refine=0):
+        """
+        Fits the SVD projection and the k-means lists.
+
+        Args:
+            exact (CourseRetriever): exact retriever over the documents.
+            dim (int): reduced dimensions, capped by the matrix shape.
+            n_lists (int): number of lists (default: about 4 * sqrt(n_docs)).
+            seed (int): random state of the SVD and k-means.
+
+        Returns:
+            IVFRetriever
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        docs = exact.vectors
+        n_docs, n_features = docs.shape
+        dim = max(1, min(dim, n_features - 1, n_docs - 1))
+        svd = TruncatedSVD(n_components=dim, random_state=seed)
+        dense = normalize(svd.fit_transform(docs)).astype(np.float32)
+
+        n_lists = min(n_lists or max(1, int(round(4 * np.sqrt(n_docs)))), n_docs)
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, n_init=3, batch_size=4096).fit(dense)
+        order = np.argsort(kmeans.labels_, kind='stable')
+        offsets = np.searchsorted(kmeans.labels_[order], np.arange(n_lists + 1))
+        return cls(exact, np.ascontiguousarray(svd.components_.T, dtype=np.float32),
+                   normalize(kmeans.cluster_centers_).astype(np.float32), offsets, order, dense[order],
+                   nprobe=nprobe, refine=refine)
+
+    def arrays(self):
+        """The fitted arrays, by ARRAYS name, for persisting."""
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def _project(self, queries):
+        # float32 on both sides: a float64 query would make scipy upcast a copy of the projection
+        reduced = np.asarray(queries.astype(np.float32) @ self.projection)
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        return reduced / np.where(norms > 0, norms, 1)
+
+    def search(self, queries, k=5, min_score=None, nprobe=None, refine=None):
+        """
+        Same contract as CourseRetriever.search, with the query-time knobs.
+
+        Args:
+            nprobe (int): lists scanned per query (default: self.nprobe); more lists
+                are scanned when these hold fewer than k (or k * refine) documents.
+            refine (int): candidates scored exactly, as a multiple of k; 0 scores every
+                probed document (default: self.refine).
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        k = min(k, self.n_docs)
+        nprobe = self.nprobe if nprobe is None else nprobe
+        refine = self.refine if refine is None else refine
+        depth = min(k * refine, self.n_docs) if refine else None
+
+        queries = normalize(sp.csr_matrix(queries), norm='l2')
+        reduced = self._project(queries)
+        list_scores = reduced @ self.centroids.T
+        sizes = np.diff(self.offsets)
+        results = []
+        for row in range(queries.shape[0]):
+            lists = np.argsort(-list_scores[row], kind='stable')
+            enough = int(np.searchsorted(np.cumsum(sizes[lists]), depth or k)) + 1
+            rows = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1])
+                                   for i in lists[:max(nprobe, enough)]])
+            if depth and len(rows) > depth:
+                approximate = self.dense[rows] @ reduced[row]
+                rows = rows[np.argpartition(-approximate, depth - 1)[:depth]]
+
+            candidates = np.sort(self.ids[rows])
+            exact = self.exact.rescore(queries[row], candidates)
+            # like the sparse product, documents sharing no term with the query are not scored
+            matched = exact > 0
+            results.append(_top_k(candidates[matched].astype(np.int32), exact[matched], k, min_score, self.n_docs))
+        return results
@@ -0,0 +1,188 @@
+"""
+HTTP inference service for resume scoring.
+
+    python -m utils.service --port 8000 --max-batch 32 --max-wait-ms 5
+
+    POST /score    JSON {"text": "..."} or {"texts": [...]}, or a PDF body
+                   (Content-Type: application/pdf)
+    GET  /healthz  process is up, with micro-batching stats
+    GET  /readyz   200 once NLTK data, model artifacts and the skill matcher are loaded
+
+Every request thread preprocesses its own text; the transform and
+predict_proba calls of concurrent requests are coalesced by a MicroBatcher.
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from utils import config, get_processed_corpus
+from utils.inference import MicroBatcher
+from utils.parser import extract_skills, missingskills
+from utils.warmup import start_warmup
+
+READY_STEPS = ('nltk', 'models', 'skills')
+
+
+def score_texts(texts, batcher):
+    """
+    Scores resume texts: role probabilities, skills and per-role gaps.
+
+    All texts are queued on the batcher before waiting on any of them, so a
+    multi-resume request is classified in as few batches as possible; the
+    request thread matches skills while the batcher classifies.
+
+    Returns:
+        List[dict]: one JSON-ready result per text.
+    """
+    results = [None] * len(texts)
+    pending = []
+    for index, text in enumerate(texts):
+        if not text or not text.strip():
+            results[index] = {'valid': False, 'predictions': None, 'skills': None, 'gaps': None, 'timings': {}}
+            continue
+        start = time.perf_counter()
+        processed = get_processed_corpus([[text]])[0]
+        queued = time.perf_counter()
+        pending.append((index, text, batcher.submit(processed), {'preprocess': queued - start}, queued))
+
+    skills = {}
+    for index, text, _, timings, _ in pending:
+        start = time.perf_counter()
+        skills[index] = sorted(extract_skills(text))
+        timings['skills'] = time.perf_counter() - start
+
+    for index, text, future, timings, queued in pending:
+        predictions = future.result()
+        # queue to result, so it overlaps the skills time of the request
+        timings['classify'] = time.perf_counter() - queued
+        gaps = missingskills([role for role, _ in predictions], set(skills[index]))
+        results[index] = {
+            'valid': True,
+            'predictions': [{'role': str(role), 'score': float(score)} for role, score in predictions],
+            'skills': skills[index],
+            'gaps': {role: sorted(missing) for role, missing in gaps},
+            'timings': timings,
+        }
+    return results
+
+
+class ResumeService(ThreadingHTTPServer):
+    """Threaded HTTP server holding the shared batcher and warm-up."""
+
+    daemon_threads = True
+
+    def __init__(self, address, max_batch_size=None, max_wait=None, max_body=None):
+        super().__init__(address, ResumeHandler)
+        self.batcher = MicroBatcher(
+            max_batch_size=max_batch_size or config.SERVICE_MAX_BATCH,
+            max_wait=config.SERVICE_MAX_WAIT_MS / 1000 if max_wait is None else max_wait)
+        self.max_body = max_body or config.SERVICE_MAX_BODY
+        self.warmup = start_warmup(READY_STEPS)
+        self.started = time.time()
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+class ResumeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _pdf_text(self, body):
+        from utils.extract_cache import cached_resume_data
+        try:
+            text, is_valid = cached_resume_data(body)
+        except Exception as e:
+            raise ValueError(f"unreadable PDF ({type(e).__name__}: {e})")
+        # a PDF with unreadable pages scores as invalid, like in the app
+        return text if is_valid else ''
+
+    def _taxonomy(self):
+        if 'skills' not in self.server.warmup.timings:
+            return None  # loaded by the warm-up, not by a health check
+        from utils.parser import get_skill_registry
+        registry = get_skill_registry()
+        return {'version': registry.version, 'reloads': registry.reloads,
+                'error': None if registry.last_error is None else str(registry.last_error)}
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        server = self.server
+        if path == '/healthz':
+            self._send(200, {'status': 'ok', 'uptime': time.time() - server.started,
+                             'batching': server.batcher.stats(), 'taxonomy': self._taxonomy()})
+        elif path == '/readyz':
+            warmup = server.warmup
+            errors = {name: repr(error) for name, error in warmup.errors.items()}
+            ready = warmup.done and not errors
+            self._send(200 if ready else 503, {'ready': ready, 'loaded': sorted(warmup.timings), 'errors': errors})
+        else:
+            self._send(404, {'error': f"no route {path}"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path != '/score':
+            self._send(404, {'error': f"no route {path}"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.server.max_body:
+            self._send(413, {'error': f"body over {self.server.max_body} bytes"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            if self.headers.get('Content-Type', '').startswith('application/pdf'):
+                texts, single = [self._pdf_text(body)], True
+            else:
+                request = json.loads(body or b'{}')
+                if 'texts' in request:
+                    texts, single = request['texts'], False
+                else:
+                    texts, single = [request['text']], True
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError("texts must be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {'error': f"expected a PDF body or JSON with 'text' or 'texts': {e}"})
+            return
+
+        try:
+            results = score_texts(texts, self.server.batcher)
+        except Exception as e:
+            self._send(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, results[0] if single else {'results': results})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=config.SERVICE_MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=config.SERVICE_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    server = ResumeService((args.host, args.port), max_batch_size=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    print(f"serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
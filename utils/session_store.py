@@ -0,0 +1,257 @@
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from utils import config
+
+# Session payloads (predictions and skills) kept between page loads. Expiry
+# is part of every lookup, so reads never return stale data; deleting the
+# expired rows is left to purge_expired(), which a Sweeper calls in the
+# background instead of the request path.
+
+
+class SessionStore:
+    """
+    Interface of a session store: JSON-serializable values with a time to live.
+
+    Args:
+        ttl (float): seconds a value lives after its last set().
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = config.SESSION_TIMEOUT if ttl is None else ttl
+
+    def get(self, session_id):
+        """Returns the value of session_id, or None when it is missing or expired."""
+        raise NotImplementedError
+
+    def set(self, session_id, value, ttl=None):
+        """Stores value under session_id for ttl seconds (default: the store ttl)."""
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """Deletes expired values; returns how many were removed."""
+        return 0
+
+    def close(self):
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in one SQLite table with an index on the expiry time.
+
+    Args:
+        path (str): database file, created with its directory on first use.
+        ttl (float): seconds a session lives after its last save.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        super().__init__(ttl)
+        self.path = path or os.path.join(config.TEMP_DIR, 'sessions.db')
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS sessions "
+                       "(id TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+
+    def _connection(self):
+        # Streamlit runs every session in its own thread; sqlite3 connections are per thread
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def get(self, session_id):
+        row = self._connection().execute(
+            "SELECT value FROM sessions WHERE id = ? AND expires > ?", (session_id, time.time())).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, session_id, value, ttl=None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._connection() as db:
+            db.execute("INSERT OR REPLACE INTO sessions (id, value, expires) VALUES (?, ?, ?)",
+                       (session_id, json.dumps(value), expires))
+
+    def delete(self, session_id):
+        with self._connection() as db:
+            db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge_expired(self):
+        with self._connection() as db:
+            return db.execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),)).rowcount
+
+    def close(self):
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions in a process-local dict, for a single-node deployment.
+
+    Values are stored as JSON, like the other stores, so callers cannot
+    mutate them in place. A heap of expiry times lets purge_expired touch
+    only the expired entries. It holds one entry per session: set() on a
+    queued session only updates the dict, and purge_expired re-queues an
+    entry whose session was extended since, so pages that save on every
+    render do not grow the heap.
+    """
+
+    def __init__(self, ttl=None):
+        super().__init__(ttl)
+        self._items = {}
+        self._expiry = []
+        self._queued = set()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            item = self._items.get(session_id)
+        if item is None or item[1] <= time.time():
+            return None
+        return json.loads(item[0])
+
+    def set(self, session_id, value, ttl=None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(value)
+        with self._lock:
+            self._items[session_id] = (payload, expires)
+            if session_id not in self._queued:
+                heapq.heappush(self._expiry, (expires, session_id))
+                self._queued.add(session_id)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._items.pop(session_id, None)
+
+    def purge_expired(self):
+        now = time.time()
+        removed = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, session_id = heapq.heappop(self._expiry)
+                item = self._items.get(session_id)
+                if item is not None and item[1] > now:
+                    # extended by a later set(): queue it again at its current expiry
+                    heapq.heappush(self._expiry, (item[1], session_id))
+                    continue
+                self._queued.discard(session_id)
+                if item is not None:
+                    del self._items[session_id]
+                    removed += 1
+        return removed
+
+
+class KeyValueSessionStore(SessionStore):
+    """
+    Sessions in a Redis-like key-value server, which expires keys itself.
+
+    Args:
+        client: object with get(key), set(key, value, ex=seconds) and delete(key),
+            e.g. redis.Redis or a local stand-in implementing those three calls.
+        prefix (str): namespace of the session keys.
+    """
+
+    def __init__(self, client, prefix='resume:session:', ttl=None):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, session_id):
+        payload = self.client.get(self.prefix + session_id)
+        return None if payload is None else json.loads(payload)
+
+    def set(self, session_id, value, ttl=None):
+        self.client.set(self.prefix + session_id, json.dumps(value),
+                        ex=max(1, int(self.ttl if ttl is None else ttl)))
+
+    def delete(self, session_id):
+        self.client.delete(self.prefix + session_id)
+
+
+class Sweeper:
+    """
+    Calls store.purge_expired() every interval seconds in a daemon thread.
+
+    Args:
+        store (SessionStore): store to purge.
+        interval (float): seconds between sweeps.
+    """
+
+    def __init__(self, store, interval=None):
+        self.store = store
+        self.interval = config.SESSION_SWEEP_INTERVAL if interval is None else interval
+        self.removed = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='session-sweeper', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.removed += self.store.purge_expired()
+            except Exception:  # a locked or unavailable store is retried on the next sweep
+                self.errors += 1
+
+
+def create_store(kind=None, ttl=None):
+    """
+    Builds a session store.
+
+    Args:
+        kind (str): 'sqlite', 'memory' or 'redis' (default: config.SESSION_STORE).
+        ttl (float): seconds a session lives (default: config.SESSION_TIMEOUT).
+
+    Returns:
+        SessionStore: the new store.
+    """
+    kind = kind or config.SESSION_STORE
+    if kind == 'sqlite':
+        return SQLiteSessionStore(ttl=ttl)
+    if kind == 'memory':
+        return MemorySessionStore(ttl=ttl)
+    if kind == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("RESUME_SESSION_STORE=redis needs the redis package: pip install redis")
+        return KeyValueSessionStore(redis.Redis.from_url(config.SESSION_REDIS_URL), ttl=ttl)
+    raise ValueError(f"Unknown session store {kind!r}, expected 'sqlite', 'memory' or 'redis'")
+
+
+_store = None
+_sweeper = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Returns the process-wide session store, starting its background sweeper on first use."""
+    global _store, _sweeper
+    with _store_lock:
+        if _store is None:
+            _store = create_store()
+            if not isinstance(_store, KeyValueSessionStore):
+                _sweeper = Sweeper(_store).start()
+        return _store
@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+import numpy as np
+
+SkillGap = namedtuple('SkillGap', ['role', 'missing', 'matched', 'coverage'])
+
+
+class SkillIndex:
+    """
+    Role requirements as a boolean role x skill matrix over an integer-id vocabulary.
+
+    A resume's skills are encoded once as a boolean vector, and the coverage
+    of every role comes from one matrix operation. The missing and matched
+    skill sets come from per-role frozensets built once, not per call.
+
+    Args:
+        role_skills (Dict[str, Iterable[str]]): role -> required skills, any case.
+    """
+
+    def __init__(self, role_skills):
+        self.roles = list(role_skills)
+        self.role_ids = {role: i for i, role in enumerate(self.roles)}
+        self.vocab = sorted({skill.lower() for skills in role_skills.values() for skill in skills})
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocab)}
+
+        self.required = np.zeros((len(self.roles), len(self.vocab)), dtype=bool)
+        for role, skills in role_skills.items():
+            self.required[self.role_ids[role], [self.skill_ids[skill.lower()] for skill in skills]] = True
+        self.required_counts = self.required.sum(axis=1)
+        # set outputs are cheapest straight from the precomputed sets
+        self.role_sets = {role: frozenset(skill.lower() for skill in skills) for role, skills in role_skills.items()}
+
+    def encode(self, skills):
+        """Returns the boolean skill vector of skills (lowercase); skills outside the vocabulary are ignored."""
+        vector = np.zeros(len(self.vocab), dtype=bool)
+        ids = [self.skill_ids[skill] for skill in skills if skill in self.skill_ids]
+        vector[ids] = True
+        return vector
+
+    def _rows(self, roles):
+        if roles is None:
+            return np.arange(len(self.roles))
+        return np.array([self.role_ids[role] for role in roles], dtype=np.intp)
+
+    def coverage(self, skills, roles=None):
+        """
+        Fraction of each role's required skills found in skills.
+
+        Returns:
+            np.ndarray: float coverage per role of roles (default: every role, in index order).
+        """
+        rows = self._rows(roles)
+        matched = (self.required[rows] & self.encode(skills)).sum(axis=1)
+        return matched / np.maximum(self.required_counts[rows], 1)
+
+    def gaps(self, skills, roles=None):
+        """
+        Missing and matched skills of each role.
+
+        Args:
+            skills (Iterable[str]): the resume's skills, lowercase.
+            roles (Sequence[str]): roles to report (default: every role).
+
+        Returns:
+            List[SkillGap]: one per role, in the order of roles.
+        """
+        have = skills if isinstance(skills, (set, frozenset)) else set(skills)
+        gaps = []
+        for role in (self.roles if roles is None else roles):
+            required = self.role_sets[role]
+            matched = required & have
+            gaps.append(SkillGap(role, set(required - matched), set(matched), len(matched) / max(len(required), 1)))
+        return gaps
+
+    def missing(self, skills, roles=None):
+        """Returns only the missing skill set of each role, the part course recommendation needs."""
+        have = skills if isinstance(skills, (set, frozenset)) else set(skills)
+        return [set(self.role_sets[role] - have) for role in (self.roles if roles is None else roles)]
+
+    def rank_roles(self, skills, k=None):
+        """
+        Ranks every role by the coverage of its required skills.
+
+        Returns:
+            List[Tuple[str, float]]: (role, coverage), best first; ties keep index order.
+        """
+        coverage = self.coverage(skills)
+        order = np.argsort(-coverage, kind='stable')[:k]
+        return [(self.roles[i], float(coverage[i])) for i in order]
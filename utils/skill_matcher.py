@@ -0,0 +1,281 @@
+import re
+import threading
+from collections import deque
+
+# Dependency-free replacement for the spaCy PhraseMatcher used by utils.parser.
+#
+# PhraseMatcher compares token texts, so parity with it depends on splitting
+# text at the same places as spaCy's English tokenizer. The rules below are
+# the subset of that tokenizer (prefixes, suffixes, infixes, URL match and
+# special cases) that can change where a token boundary falls in lowercased
+# resume text.
+
+_LETTER = r'[^\W\d_]'
+_ALNUM = r'[^\W_]'
+_PUNCT = r'…,:;!?¿؟¡()\[\]{}<>_#*&。？！，、；：～·।،۔؛٪'
+_QUOTES = r'\'"”“`‘´’‚,„»«「」『』（）〔〕【】《》〈〉⟦⟧'
+_CURRENCY = r'$£€¥฿₽﷼₴₠-₿'
+# Unicode 'Symbol, other' characters (emoji, ©, ...), split off like punctuation
+_ICONS = (
+    r'[\u00A6\u00A9\u00AE\u00B0\u0482\u058D\u058E\u060E\u060F\u06DE\u06E9\u06FD\u06FE\u07F6\u09FA'
+    r'\u0B70\u0BF3-\u0BF8\u0BFA\u0C7F\u0D4F\u0D79\u0F01-\u0F03\u0F13\u0F15-\u0F17\u0F1A-\u0F1F\u0F34'
+    r'\u0F36\u0F38\u0FBE-\u0FC5\u0FC7-\u0FCC\u0FCE\u0FCF\u0FD5-\u0FD8\u109E\u109F\u1390-\u1399\u1940'
+    r'\u19DE-\u19FF\u1B61-\u1B6A\u1B74-\u1B7C\u2100\u2101\u2103-\u2106\u2108\u2109\u2114\u2116\u2117'
+    r'\u211E-\u2123\u2125\u2127\u2129\u212E\u213A\u213B\u214A\u214C\u214D\u214F\u218A\u218B\u2195-'
+    r'\u2199\u219C-\u219F\u21A1\u21A2\u21A4\u21A5\u21A7-\u21AD\u21AF-\u21CD\u21D0\u21D1\u21D3\u21D5-'
+    r'\u21F3\u2300-\u2307\u230C-\u231F\u2322-\u2328\u232B-\u237B\u237D-\u239A\u23B4-\u23DB\u23E2-'
+    r'\u2426\u2440-\u244A\u249C-\u24E9\u2500-\u25B6\u25B8-\u25C0\u25C2-\u25F7\u2600-\u266E\u2670-'
+    r'\u2767\u2794-\u27BF\u2800-\u28FF\u2B00-\u2B2F\u2B45\u2B46\u2B4D-\u2B73\u2B76-\u2B95\u2B98-\u2BC8'
+    r'\u2BCA-\u2BFE\u2CE5-\u2CEA\u2E80-\u2E99\u2E9B-\u2EF3\u2F00-\u2FD5\u2FF0-\u2FFB\u3004\u3012\u3013'
+    r'\u3020\u3036\u3037\u303E\u303F\u3190\u3191\u3196-\u319F\u31C0-\u31E3\u3200-\u321E\u322A-\u3247'
+    r'\u3250\u3260-\u327F\u328A-\u32B0\u32C0-\u32FE\u3300-\u33FF\u4DC0-\u4DFF\uA490-\uA4C6\uA828-'
+    r'\uA82B\uA836\uA837\uA839\uAA77-\uAA79\uFDFD\uFFE4\uFFE8\uFFED\uFFEE\uFFFC\uFFFD\U00010137-'
+    r'\U0001013F\U00010179-\U00010189\U0001018C-\U0001018E\U00010190-\U0001019B\U000101A0\U000101D0-'
+    r'\U000101FC\U00010877\U00010878\U00010AC8\U0001173F\U00016B3C-\U00016B3F\U00016B45\U0001BC9C'
+    r'\U0001D000-\U0001D0F5\U0001D100-\U0001D126\U0001D129-\U0001D164\U0001D16A-\U0001D16C\U0001D183'
+    r'\U0001D184\U0001D18C-\U0001D1A9\U0001D1AE-\U0001D1E8\U0001D200-\U0001D241\U0001D245\U0001D300-'
+    r'\U0001D356\U0001D800-\U0001D9FF\U0001DA37-\U0001DA3A\U0001DA6D-\U0001DA74\U0001DA76-\U0001DA83'
+    r'\U0001DA85\U0001DA86\U0001ECAC\U0001F000-\U0001F02B\U0001F030-\U0001F093\U0001F0A0-\U0001F0AE'
+    r'\U0001F0B1-\U0001F0BF\U0001F0C1-\U0001F0CF\U0001F0D1-\U0001F0F5\U0001F110-\U0001F16B\U0001F170-'
+    r'\U0001F1AC\U0001F1E6-\U0001F202\U0001F210-\U0001F23B\U0001F240-\U0001F248\U0001F250\U0001F251'
+    r'\U0001F260-\U0001F265\U0001F300-\U0001F3FA\U0001F400-\U0001F6D4\U0001F6E0-\U0001F6EC\U0001F6F0-'
+    r'\U0001F6F9\U0001F700-\U0001F773\U0001F780-\U0001F7D8\U0001F800-\U0001F80B\U0001F810-\U0001F847'
+    r'\U0001F850-\U0001F859\U0001F860-\U0001F887\U0001F890-\U0001F8AD\U0001F900-\U0001F90B\U0001F910-'
+    r'\U0001F93E\U0001F940-\U0001F970\U0001F973-\U0001F976\U0001F97A\U0001F97C-\U0001F9A2\U0001F9B0-'
+    r'\U0001F9B9\U0001F9C0-\U0001F9C2\U0001F9D0-\U0001F9FF\U0001FA60-\U0001FA6D]')
+_UNITS = ('km²|km³|km/h|kmh|km|m²|m³|m/s|mph|mbar|mb|mm²|mm³|mm|mg|m|dm²|dm³|dm|cm²|cm³|cm|'
+          'ha|µm|µg|nm|yd|in|ft|kg|g|t|lb|oz|kb|gb|tb')
+
+_PREFIX = re.compile(
+    rf'^(?:[§%=—–{_PUNCT}{_QUOTES}{_CURRENCY}]|\+(?![0-9])|\.\.+|{_ICONS})')
+_SUFFIX = re.compile(
+    rf"(?:[{_PUNCT}{_QUOTES}—–]|\.\.+|{_ICONS}|'s|’s|(?<=[0-9])\+|(?<=[0-9])[{_CURRENCY}]|(?<=[0-9])(?:{_UNITS}|%)"
+    rf"|(?<=[0-9{_PUNCT}{_QUOTES}]|{_ALNUM})\.)$")
+_INFIX = re.compile(
+    rf'\.\.+|…|{_ICONS}|(?<=[0-9])[+\-*^](?=[0-9-])|(?<={_LETTER}|[{_QUOTES}])\.(?=[{_QUOTES}])|(?<={_LETTER}),(?={_LETTER})'
+    rf'|(?<={_ALNUM})(?:---|--|——|-|–|—|~)(?={_LETTER})|(?<={_ALNUM})[:<>=/](?={_LETTER})')
+_URL = re.compile(
+    r'^(?:[\w+\-.]{2,}://)?(?:\S+(?::\S*)?@)?'
+    r'(?:(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))'
+    r'|(?:(?:[a-z0-9¡-￿][a-z0-9¡-￿_-]{0,62})?[a-z0-9¡-￿]\.)+' + _LETTER + r'{2,63})'
+    r'(?::\d{2,5})?(?:[/?#]\S*)?$')
+_WHITESPACE = re.compile(r'\s+')
+
+# tokenizer exceptions that keep a skill-like token glued to punctuation
+SPECIAL_CASES = frozenset([f'{c}.' for c in 'abcdefghijklmnopqrstuvwxyz'] + ['e.g.', 'i.e.', 'a.m.', 'p.m.', 'and/or'])
+
+
+def _split_chunk(chunk, start):
+    """Splits one whitespace-free chunk into (text, start, end) tokens."""
+    if chunk.isalpha() or chunk in SPECIAL_CASES:
+        return [(chunk, start, start + len(chunk))]
+
+    prefixes, suffixes = [], []
+    offset, string = start, chunk
+    last_size = -1
+    while string and len(string) != last_size:
+        if string in SPECIAL_CASES:
+            break
+        last_size = len(string)
+        pre = _PREFIX.search(string)
+        pre_len = pre.end() if pre else 0
+        if pre_len and string[pre_len:] in SPECIAL_CASES:
+            prefixes.append(string[:pre_len])
+            string = string[pre_len:]
+            break
+        suf = _SUFFIX.search(string[pre_len:])
+        suf_len = len(suf.group()) if suf else 0
+        if suf_len and string[:-suf_len] in SPECIAL_CASES:
+            suffixes.append(string[-suf_len:])
+            string = string[:-suf_len]
+            break
+        if pre_len and suf_len and pre_len + suf_len <= len(string):
+            prefixes.append(string[:pre_len])
+            suffixes.append(string[-suf_len:])
+            string = string[pre_len:-suf_len]
+        elif pre_len:
+            prefixes.append(string[:pre_len])
+            string = string[pre_len:]
+        elif suf_len:
+            suffixes.append(string[-suf_len:])
+            string = string[:-suf_len]
+
+    tokens = []
+    for piece in prefixes:
+        tokens.append((piece, offset, offset + len(piece)))
+        offset += len(piece)
+
+    if string:
+        if string in SPECIAL_CASES or _URL.match(string):
+            pieces = [string]
+        else:
+            pieces, position = [], 0
+            for match in _INFIX.finditer(string):
+                if match.start() == 0 and match.end() == 0:
+                    continue
+                if match.start() != position:
+                    pieces.append(string[position:match.start()])
+                if match.start() != match.end():
+                    pieces.append(match.group())
+                position = match.end()
+            pieces.append(string[position:])
+        for piece in pieces:
+            if piece:
+                tokens.append((piece, offset, offset + len(piece)))
+                offset += len(piece)
+
+    for piece in reversed(suffixes):
+        tokens.append((piece, offset, offset + len(piece)))
+        offset += len(piece)
+    return _merge_special_cases(tokens) if len(tokens) > 1 else tokens
+
+
+def _merge_special_cases(tokens):
+    # spaCy re-joins split pieces that spell a special case ("r" "." -> "r.")
+    merged = []
+    i = 0
+    while i < len(tokens):
+        for width in (4, 3, 2):
+            window = tokens[i:i + width]
+            if len(window) == width and ''.join(t[0] for t in window) in SPECIAL_CASES:
+                merged.append((''.join(t[0] for t in window), window[0][1], window[-1][2]))
+                i += width
+                break
+        else:
+            merged.append(tokens[i])
+            i += 1
+    return merged
+
+
+# chunk -> tokens at offset 0; resumes repeat most words, so spaCy caches these too
+_chunk_cache = {}
+_CHUNK_CACHE_SIZE = 100000
+
+
+def _chunk_tokens(chunk):
+    tokens = _chunk_cache.get(chunk)
+    if tokens is None:
+        if len(_chunk_cache) >= _CHUNK_CACHE_SIZE:
+            _chunk_cache.clear()
+        tokens = _chunk_cache[chunk] = tuple(_split_chunk(chunk, 0))
+    return tokens
+
+
+def tokenize(text):
+    """
+    Tokenizes text the way spaCy's English tokenizer does for skill matching.
+
+    Returns:
+        List[Tuple[str, int, int]]: (token, start, end). Whitespace other than a
+        single space is kept as its own token, like spaCy does.
+    """
+    tokens = []
+    position = 0
+    for match in _WHITESPACE.finditer(text):
+        start = match.start()
+        if start > position:
+            for token, begin, end in _chunk_tokens(text[position:start]):
+                tokens.append((token, position + begin, position + end))
+        if match.group() != ' ':
+            tokens.append((match.group(), start, match.end()))
+        position = match.end()
+    if position < len(text):
+        for token, begin, end in _chunk_tokens(text[position:]):
+            tokens.append((token, position + begin, position + end))
+    return tokens
+
+
+class AhoCorasick:
+    """
+    Aho–Corasick automaton over token sequences.
+
+    Args:
+        patterns (Iterable[Tuple[Sequence[str], Any]]): token sequence and the value reported for it.
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for tokens, value in patterns:
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + ((len(tokens), value),)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, tokens):
+        """Yields (start, end, value) for every pattern occurrence, overlapping ones included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, value in out[state]:
+                yield i - length + 1, i + 1, value
+
+
+class SkillMatcher:
+    """
+    Compiled multi-pattern skill matcher, a drop-in for the PhraseMatcher path.
+
+    Args:
+        skills (Iterable[str]): lowercase skill names, each matched by its own name.
+    """
+
+    def __init__(self, skills=()):
+        self._patterns = {}
+        self._automaton = None
+        self._lock = threading.Lock()
+        for skill in skills:
+            self.add(skill)
+
+    @property
+    def skills(self):
+        return sorted(self._patterns)
+
+    def add(self, skill, forms=None):
+        """Matches skill by each of forms (default: the skill name), replacing its earlier forms."""
+        self._patterns[skill] = [tuple(token for token, _, _ in tokenize(form)) for form in sorted(forms or (skill,))]
+        self._automaton = None
+
+    def remove(self, skill):
+        self._patterns.pop(skill, None)
+        self._automaton = None
+
+    def _compiled(self):
+        # the token sequences are kept per skill, only the automaton is rebuilt after a change
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = AhoCorasick((tokens, skill) for skill, patterns in self._patterns.items()
+                                                  for tokens in patterns if tokens)
+                automaton = self._automaton
+        return automaton
+
+    def match(self, text):
+        """Returns the skills found in the lowercased text, aliases reported under their skill."""
+        tokens = [token for token, _, _ in tokenize(text.lower())]
+        return list({skill for _, _, skill in self._compiled().iter_matches(tokens)})
+
+    def match_many(self, texts, **_):
+        return [self.match(text) for text in texts]
@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+from utils import config
+
+# The skill taxonomy (roles, their skills and skill aliases) lives in a
+# versioned JSON or YAML file. SkillRegistry polls that file, and a change
+# is applied to the matchers pattern by pattern: the standby copy of a
+# double-buffered matcher is updated, swapped in, and the old copy catches
+# up once the requests still using it are done.
+
+logger = logging.getLogger(__name__)
+
+
+class SkillTaxonomy:
+    """
+    Job roles, their required skills and the aliases of skills.
+
+    Args:
+        roles (Dict[str, List[str]]): role -> required skills, in display case.
+        aliases (Dict[str, List[str]]): skill -> other names it goes by, e.g. {"kubernetes": ["k8s"]}.
+        version: version field of the file, reported as is.
+
+    Raises:
+        ValueError: an alias that is also a skill name, or that points at two skills.
+    """
+
+    def __init__(self, roles, aliases=None, version=None):
+        self.version = version
+        self.roles = {role: list(skills) for role, skills in roles.items()}
+        self.aliases = {skill.lower(): sorted({alias.lower() for alias in names})
+                        for skill, names in (aliases or {}).items()}
+        self.skills = sorted({skill.lower() for skills in self.roles.values() for skill in skills}
+                             | set(self.aliases))
+
+        owner = {}
+        for skill, names in self.aliases.items():
+            for alias in names:
+                if alias in self.skills and alias != skill:
+                    raise ValueError(f"Alias {alias!r} of {skill!r} is itself a skill")
+                if owner.setdefault(alias, skill) != skill:
+                    raise ValueError(f"Alias {alias!r} points at both {owner[alias]!r} and {skill!r}")
+
+    def forms(self):
+        """Returns skill -> every surface form that matches it (the skill itself and its aliases)."""
+        return {skill: frozenset([skill, *self.aliases.get(skill, ())]) for skill in self.skills}
+
+
+def load_taxonomy(path=None):
+    """
+    Reads a taxonomy file: {"version": ..., "roles": {...}, "aliases": {...}}.
+
+    Args:
+        path (str): .json, .yaml or .yml file (default: config.SKILL_TAXONOMY).
+
+    Returns:
+        SkillTaxonomy
+    """
+    path = path or config.SKILL_TAXONOMY
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"{path}: {e}")
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get('roles'), dict):
+        raise ValueError(f"{path}: expected a mapping with a 'roles' mapping")
+    aliases = data.get('aliases') or {}
+    if not isinstance(aliases, dict):
+        raise ValueError(f"{path}: 'aliases' must be a mapping")
+    for section, entries in (('roles', data['roles']), ('aliases', aliases)):
+        for name, values in entries.items():
+            if not isinstance(name, str) or not isinstance(values, list) \
+                    or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"{path}: {section} entry {name!r} must map a string to a list of strings")
+    return SkillTaxonomy(data['roles'], aliases, data.get('version'))
+
+
+def diff_forms(old, new):
+    """
+    Compares two SkillTaxonomy.forms() results.
+
+    Returns:
+        Tuple[List[str], Dict[str, frozenset]]: skills to remove, and skills to
+            (re)add with their forms; a skill whose aliases changed is in both.
+    """
+    removed = [skill for skill, forms in old.items() if new.get(skill) != forms]
+    added = {skill: forms for skill, forms in new.items() if old.get(skill) != forms}
+    return removed, added
+
+
+class DoubleBuffer:
+    """
+    Two copies of an object that is updated in place.
+
+    Readers get the active copy. An update is applied to the standby copy,
+    which then becomes active; the previous copy receives the same update
+    once its last reader is done, and becomes the standby.
+
+    Args:
+        make (callable): builds one copy, called twice.
+    """
+
+    def __init__(self, make):
+        self._copies = [make(), make()]
+        self._active = 0
+        self._readers = [0, 0]
+        self._cond = threading.Condition()
+        self._update_lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        """Yields the active copy; it is not modified until the block exits."""
+        with self._cond:
+            index = self._active
+            self._readers[index] += 1
+        try:
+            yield self._copies[index]
+        finally:
+            with self._cond:
+                self._readers[index] -= 1
+                if not self._readers[index]:
+                    self._cond.notify_all()
+
+    def update(self, apply):
+        """Calls apply(copy) on both copies, never on one a reader holds."""
+        with self._update_lock:
+            standby = 1 - self._active
+            apply(self._copies[standby])
+            with self._cond:
+                self._active = standby
+                self._cond.wait_for(lambda: not self._readers[1 - standby])
+            apply(self._copies[1 - standby])
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SkillRegistry:
+    """
+    The current taxonomy, its SkillIndex and a double-buffered skill matcher.
+
+    Args:
+        make_matcher (callable): builds an empty matcher with add(skill, forms),
+            remove(skill) and match(text).
+        path (str): taxonomy file (default: config.SKILL_TAXONOMY).
+    """
+
+    def __init__(self, make_matcher, path=None):
+        self.path = path or config.SKILL_TAXONOMY
+        self.reloads = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self._failed_signature = None
+
+        self._make_matcher = make_matcher
+        self._matchers = None
+        self._signature = _signature(self.path)
+        self.taxonomy = load_taxonomy(self.path)
+        self.index = self._build_index(self.taxonomy)
+        self._forms = self.taxonomy.forms()
+
+    @staticmethod
+    def _build_index(taxonomy):
+        from utils.skill_index import SkillIndex
+        return SkillIndex(taxonomy.roles)
+
+    @property
+    def version(self):
+        return self.taxonomy.version
+
+    def matcher(self):
+        """
+        Context manager yielding the active matcher, stable for the duration of the block.
+        The matchers are built on the first call, so reading the taxonomy alone stays cheap.
+        """
+        matchers = self._matchers
+        if matchers is None:
+            with self._lock:
+                if self._matchers is None:
+                    def make():
+                        matcher = self._make_matcher()
+                        for skill, forms in self._forms.items():
+                            matcher.add(skill, forms)
+                        return matcher
+                    self._matchers = DoubleBuffer(make)
+                matchers = self._matchers
+        return matchers.acquire()
+
+    def reload(self, force=False):
+        """
+        Applies the taxonomy file if it changed since the last load.
+
+        Returns:
+            Tuple[int, int]: skills removed and added; (0, 0) when nothing changed.
+
+        Raises:
+            OSError, ValueError: the file is missing or invalid; the current taxonomy stays in use.
+        """
+        with self._lock:
+            signature = _signature(self.path)
+            if not force and signature == self._signature:
+                return 0, 0
+            taxonomy = load_taxonomy(self.path)
+            forms = taxonomy.forms()
+            removed, added = diff_forms(self._forms, forms)
+
+            def apply(matcher):
+                for skill in removed:
+                    matcher.remove(skill)
+                for skill, skill_forms in added.items():
+                    matcher.add(skill, skill_forms)
+
+            if self._matchers is not None and (removed or added):
+                self._matchers.update(apply)
+            # matcher first: a role never lists a skill the active matcher cannot find
+            self.index = self._build_index(taxonomy)
+            self.taxonomy, self._forms, self._signature = taxonomy, forms, signature
+            self.reloads += 1
+            self.last_error = None
+            logger.info("skill taxonomy %s loaded from %s: %d skills removed, %d added",
+                        taxonomy.version, self.path, len(removed), len(added))
+            return len(removed), len(added)
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                # e.g. a half-written file: retried when it changes again; the thread
+                # outlives any error, so a bad file never stops later reloads
+                try:
+                    signature = _signature(self.path) if os.path.exists(self.path) else None
+                except OSError:
+                    signature = None
+                if signature != self._failed_signature:
+                    self._failed_signature = signature
+                    self.last_error = e
+                    if isinstance(e, (OSError, ValueError)):
+                        logger.warning("skill taxonomy %s not reloaded: %s", self.path, e)
+                    else:
+                        logger.exception("skill taxonomy %s not reloaded", self.path)
+
+    def start_watching(self, interval=None):
+        """Polls the file every interval seconds in a daemon thread; the first call starts it."""
+        interval = config.TAXONOMY_POLL_SECONDS if interval is None else interval
+        with self._lock:
+            if self._watcher is None and interval > 0:
+                self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                                 name='skill-taxonomy', daemon=True)
+                self._watcher.start()
+        return self
+
+    def stop_watching(self):
+        self._stop.set()
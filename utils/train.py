@@ -0,0 +1,334 @@
+"""
+Trains the job role classifier and publishes its artifacts.
+
+    python -m utils.train --csv UpdatedResumeDataSet.csv
+    python -m utils.train --models logreg svc --vectorizers bow --folds 5 --jobs 4 --no-publish
+
+Every (vectorizer, model) candidate is cross-validated, one fold per joblib
+task, so candidates and folds run in parallel across cores. Identical
+resumes are kept in the same fold (the dataset holds many copies), so the
+scores are not inflated by copies of a test resume in the training folds.
+The best candidate is refit on every row and written with the label
+encoder and a manifest to Artifacts/models/<version>/. Publishing replaces
+Artifacts/model_manifest.json, which points at that directory, with one
+os.replace; the running app loads the new version's artifacts together on
+the next request. The preprocessed corpus is cached in Artifacts/cache/,
+keyed by the CSV content and the preprocessing code.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from utils import MANIFEST_PATH, config, save_file
+from utils.preprocess import preprocess_corpus
+from utils.registry import file_digest
+
+ARTIFACTS_DIR = 'Artifacts'
+CACHE_DIR = os.path.join(ARTIFACTS_DIR, 'cache')
+MODELS_DIR = os.path.join(ARTIFACTS_DIR, 'models')
+PREPROCESS_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preprocess.py')
+
+
+def _vectorizers():
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    return {
+        'bow': lambda: CountVectorizer(ngram_range=(2, 2)),
+        'tfidf': lambda: TfidfVectorizer(ngram_range=(2, 2)),
+    }
+
+
+def _models():
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+    return {
+        'logreg': lambda: LogisticRegression(max_iter=1000),
+        'svc': lambda: SVC(),
+        'knn': lambda: KNeighborsClassifier(),
+        'rf': lambda: RandomForestClassifier(),
+        'gb': lambda: GradientBoostingClassifier(),
+    }
+
+
+VECTORIZERS = ('bow', 'tfidf')
+MODELS = ('logreg', 'svc', 'knn', 'rf', 'gb')
+
+
+def build_candidate(vectorizer, model, seed=42):
+    """Returns an unfitted (vectorizer, estimator) pair, seeded where the estimator is random."""
+    estimator = _models()[model]()
+    if 'random_state' in estimator.get_params():
+        estimator.set_params(random_state=seed)
+    return _vectorizers()[vectorizer](), estimator
+
+
+def load_corpus(csv_path, text_column='Resume', label_column='Category', workers=0, cache_dir=CACHE_DIR):
+    """
+    Reads and preprocesses the resume CSV, or loads the cached result.
+
+    Returns:
+        Tuple[List[str], List[str], dict]: processed texts, labels and cache info
+            (key, path, hit, seconds).
+    """
+    import pandas as pd
+
+    with open(PREPROCESS_SOURCE, 'rb') as f:
+        code_hash = hashlib.sha256(f.read()).hexdigest()
+    key = hashlib.sha256(f"{file_digest(csv_path)}:{code_hash}:{text_column}:{label_column}".encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"corpus-{key}.json")
+    info = {'key': key, 'path': path, 'hit': os.path.exists(path)}
+
+    start = time.perf_counter()
+    if info['hit']:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+        texts, labels = cached['texts'], cached['labels']
+    else:
+        frame = pd.read_csv(csv_path)
+        texts = preprocess_corpus(frame[text_column].astype(str).tolist(), workers=workers)
+        labels = frame[label_column].astype(str).tolist()
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'texts': texts, 'labels': labels}, f)
+        os.replace(path + '.tmp', path)
+    info['seconds'] = time.perf_counter() - start
+    return texts, labels, info
+
+
+def _fit_fold(vectorizer, model, seed, texts, y, train, test):
+    from sklearn.metrics import accuracy_score
+
+    vec, estimator = build_candidate(vectorizer, model, seed)
+    start = time.perf_counter()
+    x_train = vec.fit_transform([texts[i] for i in train])
+    estimator.fit(x_train, y[train])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predicted = estimator.predict(vec.transform([texts[i] for i in test]))
+    predict_seconds = time.perf_counter() - start
+    return {
+        'vectorizer': vectorizer, 'model': model,
+        'accuracy': float(accuracy_score(y[test], predicted)),
+        'train_accuracy': float(accuracy_score(y[train], estimator.predict(x_train))),
+        'fit_seconds': fit_seconds, 'predict_seconds': predict_seconds, 'test_rows': len(test),
+    }
+
+
+def cross_validate_candidates(texts, y, vectorizers=VECTORIZERS, models=MODELS, folds=5, jobs=-1,
+                              seed=42, group_duplicates=True):
+    """
+    Cross-validates every (vectorizer, model) pair, one joblib task per fold.
+
+    Args:
+        texts (List[str]): preprocessed resumes.
+        y (np.ndarray): encoded labels.
+        jobs (int): joblib workers, -1 for every core.
+        group_duplicates (bool): keep identical texts in the same fold.
+
+    Returns:
+        List[dict]: per candidate the mean and std of test accuracy, mean train
+            accuracy, fit seconds per fold and predict milliseconds per resume,
+            best first.
+    """
+    import numpy as np
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold
+
+    if group_duplicates:
+        groups = np.unique(texts, return_inverse=True)[1]
+        splits = list(StratifiedGroupKFold(n_splits=folds, shuffle=True, random_state=seed).split(texts, y, groups))
+    else:
+        splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(texts, y))
+
+    tasks = [(vectorizer, model, train, test) for vectorizer in vectorizers for model in models
+             for train, test in splits]
+    runs = Parallel(n_jobs=jobs)(delayed(_fit_fold)(vectorizer, model, seed, texts, y, train, test)
+                                 for vectorizer, model, train, test in tasks)
+
+    results = []
+    for vectorizer in vectorizers:
+        for model in models:
+            fold_runs = [run for run in runs if run['vectorizer'] == vectorizer and run['model'] == model]
+            accuracy = np.array([run['accuracy'] for run in fold_runs])
+            results.append({
+                'vectorizer': vectorizer,
+                'model': model,
+                'accuracy': float(accuracy.mean()),
+                'accuracy_std': float(accuracy.std()),
+                'train_accuracy': float(np.mean([run['train_accuracy'] for run in fold_runs])),
+                'fit_seconds': float(np.mean([run['fit_seconds'] for run in fold_runs])),
+                'predict_ms_per_resume': float(1000 * sum(run['predict_seconds'] for run in fold_runs)
+                                               / sum(run['test_rows'] for run in fold_runs)),
+            })
+    # ties on accuracy go to the faster model
+    results.sort(key=lambda result: (-result['accuracy'], result['fit_seconds']))
+    return results
+
+
+def fit_final(texts, labels, vectorizer, model, seed=42):
+    """
+    Fits the chosen candidate and the label encoder on every row.
+
+    Returns:
+        Tuple[vectorizer, estimator, LabelEncoder, float]: fitted objects and fit seconds.
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    decoder = LabelEncoder().fit(labels)
+    vec, estimator = build_candidate(vectorizer, model, seed)
+    if 'probability' in estimator.get_params():
+        # the app ranks roles with predict_proba
+        estimator.set_params(probability=True)
+    start = time.perf_counter()
+    estimator.fit(vec.fit_transform(texts), decoder.transform(labels))
+    return vec, estimator, decoder, time.perf_counter() - start
+
+
+def _write_manifest(directory, manifest):
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def write_artifacts(vec, estimator, decoder, manifest, models_dir=MODELS_DIR):
+    """
+    Writes the pickles and manifest.json to <models_dir>/<version>/.
+
+    Returns:
+        str: the version directory.
+    """
+    directory = os.path.join(models_dir, manifest['version'])
+    os.makedirs(directory)
+    manifest['artifacts'] = {}
+    for name, obj in (('preprocessor', vec), ('model', estimator), ('decoder', decoder)):
+        path = os.path.join(directory, f"{name}.pkl")
+        save_file(file_path=path, obj=obj)
+        manifest['artifacts'][name] = {'file': f"{name}.pkl", 'sha256': file_digest(path)}
+    _write_manifest(directory, manifest)
+    return directory
+
+
+def write_compact(vec, estimator, decoder, manifest, directory):
+    """
+    Exports a version's compact artifacts to <directory>/compact/ and lists them in its manifest.
+
+    Raises:
+        ValueError: the model has no compact form.
+    """
+    from utils.compact import export_compact
+
+    sources = {name: artifact['sha256'] for name, artifact in manifest['artifacts'].items()}
+    paths = export_compact(vec, estimator, decoder, os.path.join(directory, 'compact'), sources)
+    manifest['compact'] = {name: {'file': os.path.relpath(path, directory), 'sha256': file_digest(path)}
+                           for name, path in paths.items()}
+    _write_manifest(directory, manifest)
+
+
+def publish(directory, manifest_path=MANIFEST_PATH):
+    """
+    Makes a version live by replacing the manifest the app reads with one os.replace.
+
+    The pointer is the version's manifest plus its directory, relative to the
+    pointer; the artifact files themselves are never overwritten, so a reader
+    sees either every file of the old version or every file of the new one.
+    """
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    manifest['directory'] = os.path.relpath(directory, os.path.dirname(manifest_path) or '.')
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def train(csv_path, vectorizers=VECTORIZERS, models=MODELS, folds=5, jobs=-1, seed=42, workers=0,
+          group_duplicates=True, models_dir=MODELS_DIR, do_publish=True, log=print):
+    """
+    Runs the whole pipeline: corpus, cross-validation, final fit, artifacts.
+
+    Returns:
+        dict: the manifest written next to the artifacts.
+    """
+    import numpy as np
+    import sklearn
+
+    timings = {}
+    texts, labels, cache = load_corpus(csv_path, workers=workers)
+    timings['corpus'] = cache['seconds']
+    log(f"corpus: {len(texts)} resumes, {'cached' if cache['hit'] else 'preprocessed'} in {cache['seconds']:.1f}s")
+
+    classes = sorted(set(labels))
+    y = np.array([classes.index(label) for label in labels])
+    start = time.perf_counter()
+    results = cross_validate_candidates(texts, y, vectorizers, models, folds=folds, jobs=jobs, seed=seed,
+                                        group_duplicates=group_duplicates)
+    timings['cross_validation'] = time.perf_counter() - start
+    log(f"cross-validation: {len(results)} candidates x {folds} folds in {timings['cross_validation']:.1f}s")
+    log(f"  {'vectorizer':<10} {'model':<8} {'accuracy':>14} {'train':>7} {'fit s':>8} {'predict ms':>11}")
+    for result in results:
+        log(f"  {result['vectorizer']:<10} {result['model']:<8} "
+            f"{result['accuracy']:>7.3f} ± {result['accuracy_std']:.3f} {result['train_accuracy']:>7.3f} "
+            f"{result['fit_seconds']:>8.2f} {result['predict_ms_per_resume']:>11.3f}")
+
+    best = results[0]
+    vec, estimator, decoder, timings['final_fit'] = fit_final(texts, labels, best['vectorizer'], best['model'], seed)
+    log(f"selected {best['vectorizer']} + {best['model']}, refit on every row in {timings['final_fit']:.1f}s")
+
+    created = datetime.now(timezone.utc)
+    manifest = {
+        'version': f"{created:%Y%m%d-%H%M%S}-{best['vectorizer']}-{best['model']}",
+        'created': created.isoformat(),
+        'data': {'path': csv_path, 'sha256': file_digest(csv_path), 'rows': len(texts),
+                 'unique_rows': len(set(texts)), 'classes': classes, 'corpus_cache': cache['key']},
+        'selection': {'folds': folds, 'seed': seed, 'group_duplicates': group_duplicates,
+                      'metric': 'accuracy', 'candidates': results},
+        'selected': {'vectorizer': best['vectorizer'], 'model': best['model'],
+                     'params': {key: repr(value) for key, value in estimator.get_params().items()}},
+        'timings': timings,
+        'environment': {'python': platform.python_version(), 'sklearn': sklearn.__version__,
+                        'numpy': np.__version__},
+    }
+    directory = write_artifacts(vec, estimator, decoder, manifest, models_dir)
+    log(f"artifacts written to {directory}")
+    if config.MODEL_FORMAT == 'compact':
+        try:
+            write_compact(vec, estimator, decoder, manifest, directory)
+            log("compact artifacts exported")
+        except ValueError as e:
+            # the app could not load this version, so it is not published
+            log(f"NOT published, the app keeps serving the previous model: {e}")
+            return manifest
+    if do_publish:
+        publish(directory)
+        log(f"published {manifest['version']} (manifest {MANIFEST_PATH})")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='UpdatedResumeDataSet.csv')
+    parser.add_argument('--vectorizers', nargs='+', choices=VECTORIZERS, default=list(VECTORIZERS))
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=-1, help="parallel candidate folds, -1 for every core")
+    parser.add_argument('--workers', type=int, default=0, help="preprocessing processes on a cache miss")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-group-duplicates', action='store_true',
+                        help="plain stratified folds; identical resumes may land in train and test")
+    parser.add_argument('--no-publish', action='store_true', help="only write Artifacts/models/<version>/")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    train(args.csv, vectorizers=args.vectorizers, models=args.models, folds=args.folds, jobs=args.jobs,
+          seed=args.seed, workers=args.workers, group_duplicates=not args.no_group_duplicates,
+          do_publish=not args.no_publish)
+    print(f"done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import threading
+import time
+
+# Entry points import only what renders the first page; the heavy libraries
+# and artifacts load here in a background thread once that page is painted,
+# so the first analysis does not pay for them.
+
+
+def _nltk():
+    from utils.preprocess import load_nltk
+    load_nltk()
+
+
+def _models():
+    from utils import registry
+    registry.snapshot()
+
+
+def _skills():
+    from utils.parser import get_skill_registry
+    with get_skill_registry().matcher():
+        pass
+
+
+def _courses():
+    from utils.catalog import get_catalog
+    from utils.course import get_retriever
+    get_retriever()
+    get_catalog()
+
+
+def _pipeline():
+    from utils.pipeline import warm_pools
+    warm_pools()
+
+
+def _pandas():
+    import pandas  # noqa: F401
+
+
+def _matplotlib():
+    from utils import config
+    if config.CHART_BACKEND == 'plotly':
+        import plotly.graph_objects  # noqa: F401
+    else:
+        import matplotlib.backends.backend_agg  # noqa: F401
+        import matplotlib.figure  # noqa: F401
+
+
+STEPS = {
+    'nltk': _nltk,
+    'models': _models,
+    'skills': _skills,
+    'courses': _courses,
+    'pipeline': _pipeline,
+    'pandas': _pandas,
+    'matplotlib': _matplotlib,
+}
+
+
+class Warmup:
+    """
+    Runs warm-up steps once in a daemon thread and records how each went.
+
+    Args:
+        steps (Dict[str, Callable]): name -> zero-argument loader, run in order.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.timings = {}
+        self.errors = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._finished = {name: threading.Event() for name in steps}
+
+    def start(self):
+        """Starts the thread on the first call; later calls do nothing."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        for name, step in self.steps.items():
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:  # a step that fails here fails again, visibly, on the request path
+                self.errors[name] = e
+            self.timings[name] = time.perf_counter() - start
+            self._finished[name].set()
+        self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def wait_for(self, name, timeout=None):
+        """Waits until step name has run (and recorded any error); False on timeout."""
+        return self._finished[name].wait(timeout)
+
+
+_warmups = {}
+_warmups_lock = threading.Lock()
+
+
+def get_warmup(names=tuple(STEPS)):
+    """Returns the process-wide warm-up of the given steps, without starting it."""
+    key = tuple(names)
+    with _warmups_lock:
+        warmup = _warmups.get(key)
+        if warmup is None:
+            warmup = _warmups[key] = Warmup({name: STEPS[name] for name in key})
+    return warmup
+
+
+def start_warmup(names=tuple(STEPS)):
+    """
+    Starts the process-wide warm-up of the given steps; only the first call starts a thread.
+
+    Returns:
+        Warmup: the running (or finished) warm-up.
+    """
+    return get_warmup(names).start()